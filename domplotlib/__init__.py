@@ -75,22 +75,68 @@ Dom's extensions to matplotlib.
 #
 
 # stdlib
-import itertools
-from io import StringIO
-from typing import IO, Iterable, Optional, Tuple, TypeVar, Union
-
-# 3rd party
-from domdf_python_tools.iterative import chunks
-from domdf_python_tools.pagesizes import PageSize
-from domdf_python_tools.paths import PathPlus, clean_writer
-from domdf_python_tools.typing import PathLike
-from matplotlib.artist import Artist  # type: ignore[import]
-from matplotlib.axes import Axes  # type: ignore[import]
-from matplotlib.figure import Figure  # type: ignore[import]
-from matplotlib.legend import Legend  # type: ignore[import]
-from typing_extensions import Literal
-
-__all__ = ["create_figure", "horizontal_legend", "save_svg", "transpose"]
+import gzip
+import os
+import sys
+import weakref
+from contextlib import ExitStack, contextmanager
+from typing import (
+		IO,
+		TYPE_CHECKING,
+		Any,
+		Hashable,
+		Iterable,
+		Iterator,
+		List,
+		Mapping,
+		Optional,
+		Sequence,
+		Tuple,
+		TypeVar,
+		Union
+		)
+
+# this package
+import domplotlib  # pylint: disable=import-self
+
+if TYPE_CHECKING:
+	# Imported only for type annotations, as matplotlib, numpy and domdf_python_tools
+	# make up most of the time taken to import domplotlib.
+	# Annotations name these types through this module (e.g. ``domplotlib.Figure``),
+	# so that typing.get_type_hints() imports them through __getattr__ when it needs them.
+
+	# 3rd party
+	from domdf_python_tools.pagesizes import PageSize
+	from domdf_python_tools.typing import PathLike
+	from matplotlib.artist import Artist  # type: ignore[import]
+	from matplotlib.axes import Axes  # type: ignore[import]
+	from matplotlib.figure import Figure  # type: ignore[import]
+	from matplotlib.legend import Legend  # type: ignore[import]
+	from matplotlib.transforms import Bbox  # type: ignore[import]
+	from numpy import ndarray
+	from typing_extensions import Literal
+
+	# this package
+	from domplotlib.aio import asave_many, asave_svg
+	from domplotlib.archive import SvgArchiveWriter
+	from domplotlib.batch import save_many
+	from domplotlib.cache import SvgCache
+	from domplotlib.pool import FigurePool
+	from domplotlib.report import Report
+
+__all__ = [
+		"FigurePool",
+		"Report",
+		"SvgArchiveWriter",
+		"asave_many",
+		"asave_svg",
+		"create_figure",
+		"horizontal_legend",
+		"save_formats",
+		"save_many",
+		"save_svg",
+		"transpose",
+		]
 
 __author__: str = "Dominic Davis-Foster"
 __copyright__: str = "2020 Dominic Davis-Foster"
@@ -102,16 +148,23 @@ _T = TypeVar("_T")
 
 
 def save_svg(
-		figure: Figure,
-		fname: Union[PathLike, IO],
+		figure: "domplotlib.Figure",
+		fname: "Union[domplotlib.PathLike, IO]",
 		*,
-		dpi: Union[float, Literal["figure"], None] = None,
-		facecolor: Union[str, Literal["auto"]] = 'w',
-		edgecolor: Union[str, Literal["auto"]] = 'w',
-		orientation: Literal["portrait", "landscape"] = "portrait",
+		dpi: "Union[float, domplotlib.Literal['figure'], None]" = None,
+		facecolor: "Union[str, domplotlib.Literal['auto']]" = 'w',
+		edgecolor: "Union[str, domplotlib.Literal['auto']]" = 'w',
+		orientation: "domplotlib.Literal['portrait', 'landscape']" = "portrait",
 		transparent: bool = False,
-		bbox_inches: Optional[str] = None,
+		bbox_inches: "Union[str, domplotlib.Bbox, None]" = None,
 		pad_inches: float = 0.1,
+		compact: bool = False,
+		precision: Optional[int] = None,
+		cache: "Optional[domplotlib.SvgCache]" = None,
+		compress: Union[bool, int, None] = None,
+		decimate: Union[bool, float] = False,
+		rasterize_threshold: Optional[int] = None,
+		deterministic: bool = False,
 		**kwargs,
 		) -> None:
 	r"""
@@ -140,14 +193,65 @@ def save_svg(
 
 	:param pad_inches: Amount of padding around the figure when bbox_inches is 'tight'.
 
+	:param compact: If :py:obj:`True`, write a smaller SVG using a :class:`~domplotlib.svg.CompactWriter`.
+		Coordinates are rounded, redundant whitespace and comments are removed,
+		repeated styles are replaced with CSS classes, and duplicate definitions are merged.
+	:param precision: The number of decimal places to round coordinates to when ``compact`` is :py:obj:`True`.
+		If :py:obj:`None` this is chosen so coordinates are accurate to within a twentieth
+		of a pixel at the saved ``dpi``.
+
+	:param cache: An optional cache of previously rendered figures.
+		If the figure has been saved with the same options before, the cached output is reused.
+
+	:param compress: Whether to compress the SVG with gzip as it is written.
+		May also be an integer from 0 to 9 giving the compression level (default 9).
+		If :py:obj:`None` the output is compressed if ``fname`` ends with ``.svgz``.
+
+	:param decimate: Whether to reduce the number of points in lines which have more points than can be displayed
+		at the saved ``dpi``, using :func:`~domplotlib.decimate.decimate_lines`.
+		May also be a number giving the maximum number of points per pixel (default 4).
+		The lines' data is restored after saving.
+
+	:param rasterize_threshold: If given, lines, patches and collections with more than this many
+		vertices or elements (such as scatter points) are drawn as an image at the saved ``dpi``,
+		using :func:`~domplotlib.rasterize.rasterize_heavy_artists`.
+		Text and the axes are still drawn as vectors.
+		Use :func:`~domplotlib.rasterize.rasterize_report` to see which artists are rasterized
+		and how much smaller the SVG is.
+
+	:param deterministic: If :py:obj:`True`, saving the same figure always gives the same bytes.
+		The ``Date`` is omitted from the metadata (unless given in ``metadata``),
+		the ids of clip paths, markers etc. are derived only from their content
+		(using ``'domplotlib'`` for the ``svg.hashsalt`` rcParam if it isn't already set),
+		and the gzip header of compressed output has no timestamp.
+
 	:param \*\*kwargs: Additional keyword arguments passed to :meth:`~.Figure.savefig`.
+
+	.. versionchanged:: 0.5.0
+
+		* The SVG is now streamed to ``fname`` as it is rendered, rather than being held in memory.
+		  ``fname`` may also be a binary file-like object.
+		* Added the ``compact``, ``precision``, ``cache``, ``compress``, ``decimate``,
+		  ``rasterize_threshold`` and ``deterministic`` keyword arguments.
 	"""
 
-	buf = StringIO()
+	# 3rd party
+	from matplotlib import rc_context, rcParams  # type: ignore[import]
+
+	# this package
+	from domplotlib.decimate import decimate_lines
+	from domplotlib.rasterize import rasterize_heavy_artists
+	from domplotlib.svg import default_precision
 
-	figure.savefig(
-			fname=buf,
-			format="svg",
+	if not compact:
+		precision = None
+	elif precision is None:
+		precision = default_precision(_resolve_dpi(figure, dpi))
+
+	if deterministic:
+		kwargs["metadata"] = {"Date": None, **(kwargs.get("metadata") or {})}
+
+	savefig_kwargs = dict(
 			dpi=dpi,
 			facecolor=facecolor,
 			edgecolor=edgecolor,
@@ -158,65 +262,583 @@ def save_svg(
 			**kwargs,
 			)
 
-	# need this if 'transparent=True' to reset colors
-	figure.canvas.draw_idle()
+	compresslevel = _resolve_compresslevel(fname, compress)
+	gzip_mtime = 0 if deterministic else None
+
+	def write(target: "Union[domplotlib.PathLike, IO]") -> None:
+		# The SVG is streamed through a CleanWriter (and compressed, if requested)
+		# rather than being rendered into memory first,
+		# so peak memory does not depend on the size of the document.
+		with ExitStack() as stack:
+			fp = _open_svg(stack, target, compresslevel, mtime=gzip_mtime)
+			_write_svg(figure, fp, precision=precision, **savefig_kwargs)
+
+		# need this if 'transparent=True' to reset colors
+		figure.canvas.draw_idle()
+
+	with ExitStack() as stack:
+		if deterministic and rcParams["svg.hashsalt"] is None:
+			stack.enter_context(rc_context({"svg.hashsalt": "domplotlib"}))
+
+		if decimate is not False:
+			max_points_per_pixel = 4 if decimate is True else decimate
+			stack.enter_context(decimate_lines(figure, max_points_per_pixel, dpi=_resolve_dpi(figure, dpi)))
+
+		if rasterize_threshold is not None:
+			stack.enter_context(rasterize_heavy_artists(figure, rasterize_threshold))
+
+		if cache is None:
+			write(fname)
+		else:
+			key = cache.fingerprint(figure, precision=precision, compresslevel=compresslevel, **savefig_kwargs)
+
+			if key is None:
+				# The figure can't be looked up in the cache, so it is always rendered.
+				cache.misses += 1
+				write(fname)
+			else:
+				cached_file = cache.get(key)
+				if cached_file is None:
+					cached_file = cache.put(key, write)
+				cache.export(cached_file, fname)
+
+
+#: Keyword arguments to :func:`~.save_svg` which are not accepted by :meth:`~.Figure.savefig`.
+_svg_only_kwargs = frozenset({
+		"compact",
+		"precision",
+		"cache",
+		"compress",
+		"decimate",
+		"rasterize_threshold",
+		"deterministic",
+		})
+
+#: Formats for which the figure is rasterized at the given dpi.
+_raster_formats = frozenset({"png", "jpg", "jpeg", "tif", "tiff", "webp", "raw", "rgba"})
+
+
+def save_formats(
+		figure: "domplotlib.Figure",
+		targets: "Mapping[str, Union[domplotlib.PathLike, IO]]",
+		*,
+		dpi: "Union[float, domplotlib.Literal['figure'], None]" = None,
+		facecolor: "Union[str, domplotlib.Literal['auto']]" = 'w',
+		edgecolor: "Union[str, domplotlib.Literal['auto']]" = 'w',
+		orientation: "domplotlib.Literal['portrait', 'landscape']" = "portrait",
+		transparent: bool = False,
+		bbox_inches: "Union[str, domplotlib.Bbox, None]" = None,
+		pad_inches: float = 0.1,
+		bbox_extra_artists: "Optional[Sequence[domplotlib.Artist]]" = None,
+		**kwargs,
+		) -> None:
+	r"""
+	Save the given figure in several formats, laying it out only once.
+
+	The figure's layout (from ``tight_layout`` or ``constrained_layout``)
+	and the tight bounding box are computed once and reused for every format,
+	rather than each call to :meth:`~.Figure.savefig` repeating them.
+	SVG files are saved with :func:`~.save_svg`.
+
+	The layout is computed with the Agg renderer, at ``dpi`` if any of the formats are raster formats
+	and otherwise at 72 dpi (as the vector backends do). The size of text measured by the vector backends
+	can differ very slightly, so elements positioned by the layout may move by a fraction of a point
+	compared to saving each format separately.
+
+	.. code-block:: python
+
+		save_formats(fig, {"svg": "plot.svg", "png": "plot.png", "pdf": "plot.pdf"}, bbox_inches="tight")
+
+	.. versionadded:: 0.5.0
+
+	:param figure:
+	:param targets: Mapping of formats (e.g. ``'svg'``, ``'png'``) to the file to save that format as.
+		``'svgz'`` saves a gzip-compressed SVG.
+	:param dpi: The resolution in dots per inch. If ``'figure'``, use the figure's dpi value.
+	:param facecolor: The facecolor of the figure. If ``'auto'``, use the current figure facecolor.
+	:param edgecolor: The edgecolor of the figure.  If ``'auto'``, use the current figure edgecolor.
+	:param orientation: Currently only supported by the postscript backend.
+	:param transparent: If :py:obj:`True`, the axes patches will all be transparent.
+	:param bbox_inches: Bounding box in inches: only the given portion of the figure is saved.
+		If 'tight', try to figure out the tight bbox of the figure.
+	:param pad_inches: Amount of padding around the figure when bbox_inches is 'tight'.
+	:param bbox_extra_artists: Extra artists which will be considered when calculating the tight bbox.
+	:param \*\*kwargs: Additional keyword arguments passed to :meth:`~.Figure.savefig`,
+		or to :func:`~.save_svg` for SVG files.
+	"""
 
-	if isinstance(fname, IO):
-		clean_writer(buf.getvalue(), fname)
+	# Vector backends lay out the figure at 72 dpi.
+	if _raster_formats.intersection(targets):
+		layout_dpi = _resolve_dpi(figure, dpi)
 	else:
-		PathPlus(fname).write_clean(buf.getvalue())
+		layout_dpi = 72
 
+	savefig_kwargs = dict(
+			dpi=dpi,
+			facecolor=facecolor,
+			edgecolor=edgecolor,
+			orientation=orientation,
+			transparent=transparent,
+			pad_inches=pad_inches,
+			)
 
-def transpose(iterable: Iterable[_T], ncol: int) -> Iterable[_T]:
+	with _layout_once(figure, layout_dpi, bbox_inches == "tight", bbox_extra_artists) as tight_bbox:
+		if tight_bbox is not None:
+			bbox_inches = tight_bbox.padded(pad_inches)
+
+		for format_, fname in targets.items():
+			if format_ == "svg":
+				save_svg(figure, fname, bbox_inches=bbox_inches, **savefig_kwargs, **kwargs)
+			elif format_ == "svgz":
+				save_svg(figure, fname, bbox_inches=bbox_inches, **savefig_kwargs, **{"compress": True, **kwargs})
+			else:
+				figure.savefig(
+						fname,
+						format=format_,
+						bbox_inches=bbox_inches,
+						**savefig_kwargs,
+						**{k: v for k, v in kwargs.items() if k not in _svg_only_kwargs},
+						)
+
+
+@contextmanager
+def _layout_once(
+		figure: "domplotlib.Figure",
+		dpi: float,
+		tight: bool,
+		bbox_extra_artists: "Optional[Sequence[domplotlib.Artist]]" = None,
+		) -> "Iterator[Optional[domplotlib.Bbox]]":
+	"""
+	Lay out the figure, and disable its layout engine until the context manager exits.
+
+	:param figure:
+	:param dpi: The resolution to lay out the figure at.
+	:param tight: Whether to calculate the tight bounding box of the figure.
+	:param bbox_extra_artists: Extra artists which will be considered when calculating the tight bbox.
+
+	:returns: The tight bounding box in inches, if ``tight`` is :py:obj:`True`.
+	"""
+
+	# 3rd party
+	from matplotlib.backends.backend_agg import RendererAgg  # type: ignore[import]
+
+	if hasattr(figure, "get_layout_engine"):
+		has_layout = figure.get_layout_engine() is not None
+	else:  # pragma: no cover
+		has_layout = figure.get_constrained_layout() or figure.get_tight_layout()
+
+	if not has_layout and not tight:
+		yield None
+		return
+
+	original_dpi = figure.dpi
+	figure.dpi = dpi
+
+	try:
+		renderer = RendererAgg(*figure.bbox.size, dpi)
+		with getattr(renderer, "_draw_disabled", ExitStack)():
+			figure.draw(renderer)
+
+		tight_bbox = figure.get_tightbbox(renderer, bbox_extra_artists=bbox_extra_artists) if tight else None
+	finally:
+		figure.dpi = original_dpi
+
+	if not has_layout:
+		yield tight_bbox
+		return
+
+	# Turn off the layout engine, so savefig doesn't lay out the figure again for every format.
+	if hasattr(figure, "get_layout_engine"):
+		# Figure.set_layout_engine("none") leaves a placeholder engine, which savefig still lays out for.
+		layout_engine = figure._layout_engine
+		figure._layout_engine = None
+		try:
+			yield tight_bbox
+		finally:
+			figure._layout_engine = layout_engine
+
+	else:  # pragma: no cover
+		constrained_layout, tight_layout = figure.get_constrained_layout(), figure.get_tight_layout()
+		figure.set_constrained_layout(False)
+		figure.set_tight_layout(False)
+		try:
+			yield tight_bbox
+		finally:
+			figure.set_constrained_layout(constrained_layout)
+			figure.set_tight_layout(tight_layout)
+
+
+def _resolve_dpi(figure: "domplotlib.Figure", dpi: "Union[float, domplotlib.Literal['figure'], None]") -> float:
+	"""
+	Returns the resolution :meth:`~.Figure.savefig` will use for the given ``dpi`` argument.
+
+	:param figure:
+	:param dpi:
+	"""
+
+	# 3rd party
+	from matplotlib import rcParams  # type: ignore[import]
+
+	if dpi is None:
+		dpi = rcParams["savefig.dpi"]
+	if dpi == "figure":
+		dpi = figure.dpi
+
+	return dpi
+
+
+def _write_svg(figure: "domplotlib.Figure", fp: IO[str], precision: Optional[int] = None, **kwargs) -> None:
+	r"""
+	Render ``figure`` as an SVG, streaming the output through a :class:`~.CleanWriter` into ``fp``.
+
+	:param figure:
+	:param fp:
+	:param precision: If not :py:obj:`None`, the output is compacted with a :class:`~.CompactWriter`
+		which rounds coordinates to this many decimal places.
+	:param \*\*kwargs: Keyword arguments passed to :meth:`~.Figure.savefig`.
+	"""
+
+	with ExitStack() as stack:
+		figure.savefig(fname=_svg_writer(stack, fp, precision), format="svg", **kwargs)
+
+
+def _svg_writer(stack: ExitStack, fp: IO[str], precision: Optional[int] = None) -> IO[str]:
+	"""
+	Returns a :class:`~.CleanWriter` (and :class:`~.CompactWriter`, if ``precision`` is given) for ``fp``.
+
+	The writers are closed, flushing their output to ``fp``, when ``stack`` is closed.
+
+	:param stack:
+	:param fp:
+	:param precision:
+	"""
+
+	# this package
+	from domplotlib.svg import CleanWriter, CompactWriter
+
+	writer: IO[str] = stack.enter_context(CleanWriter(fp))
+
+	if precision is not None:
+		writer = stack.enter_context(CompactWriter(writer, precision))
+
+	return writer
+
+
+def _resolve_compresslevel(fname: "Union[domplotlib.PathLike, IO]", compress: Union[bool, int, None]) -> Optional[int]:
+	"""
+	Returns the gzip compression level for the ``compress`` argument to :func:`~.save_svg`,
+	or :py:obj:`None` if the output should not be compressed.
+
+	:param fname:
+	:param compress:
+	"""  # noqa: D400
+
+	if compress is None:
+		compress = isinstance(fname, (str, os.PathLike)) and os.fspath(fname).endswith(".svgz")
+
+	if compress is False:
+		return None
+	elif compress is True:
+		return 9
+	else:
+		return compress
+
+
+def _open_svg(
+		stack: ExitStack,
+		target: "Union[domplotlib.PathLike, IO]",
+		compresslevel: Optional[int] = None,
+		mtime: Optional[float] = None,
+		) -> IO[str]:
+	"""
+	Returns a text stream which writes to ``target``, compressing the output if ``compresslevel`` is given.
+
+	Any files opened are closed when ``stack`` is closed.
+
+	:param stack:
+	:param target: A filename, or a text or binary file-like object.
+	:param compresslevel:
+	:param mtime: The modification time to record in the gzip header. If :py:obj:`None` the current time is used.
+	"""
+
+	# 3rd party
+	from domdf_python_tools.paths import PathPlus
+
+	# this package
+	from domplotlib.svg import text_stream
+
+	if isinstance(target, (str, os.PathLike)):
+		target = stack.enter_context(PathPlus(target).open('w' if compresslevel is None else "wb"))
+
+	if compresslevel is not None:
+		# An empty filename keeps the name of the file out of the gzip header.
+		target = stack.enter_context(
+				gzip.GzipFile(filename='', mode="wb", fileobj=target, compresslevel=compresslevel, mtime=mtime)
+				)
+
+	return text_stream(target)
+
+
+def _is_array(value: object) -> bool:
+	"""
+	Returns whether ``value`` is a :class:`numpy.ndarray`, without importing :mod:`numpy` if it hasn't been already.
+
+	:param value:
+	"""
+
+	# If numpy hasn't been imported there can't be any arrays.
+	numpy = sys.modules.get("numpy")
+	return numpy is not None and isinstance(value, numpy.ndarray)
+
+
+def _transpose_indices(length: int, ncol: int) -> "domplotlib.ndarray":
+	"""
+	Returns the indices which :func:`~.transpose` a sequence of the given length.
+
+	:param length:
+	:param ncol:
 	"""
+
+	# 3rd party
+	import numpy
+
+	nrow = -(-length // ncol)
+
+	# Indices past the end of the (ragged) last row are dropped rather than padded.
+	indices = numpy.arange(nrow * ncol).reshape(nrow, ncol).T.ravel()
+	return indices[indices < length]
+
+
+def _iter_transpose(sequence: Sequence[_T], ncol: int) -> Iterator[_T]:
+	length = len(sequence)
+
+	for column in range(ncol):
+		for idx in range(column, length, ncol):
+			yield sequence[idx]
+
+
+def transpose(iterable: Iterable[_T], ncol: int) -> Iterable[_T]:
+	r"""
 	Transposes the contents of ``iterable`` so they are ordered right to left rather than top to bottom.
 
+	The elements are treated as rows of ``ncol`` elements, and are returned column by column.
+	If the last row is incomplete the columns it doesn't reach are one element shorter.
+
+	Sequences (such as lists) are transposed lazily, without being copied.
+	For :class:`numpy.ndarray`\s a new array is returned.
+
 	:param iterable:
 	:param ncol:
 
 	:returns: An :class:`~typing.Iterable` contaning elements of the same type as ``iterable``.
+
+	.. versionchanged:: 0.5.0
+
+		The output is no longer padded with :py:obj:`None` when the last row is incomplete.
+	"""
+
+	if ncol < 1:
+		raise ValueError("'ncol' must be at least 1")
+
+	if _is_array(iterable):
+		return iterable[_transpose_indices(len(iterable), ncol)]
+
+	if not isinstance(iterable, Sequence):
+		iterable = tuple(iterable)
+
+	return _iter_transpose(iterable, ncol)
+
+
+#: Methods of legend handles which give the properties used to decide whether two handles look the same.
+_style_getters = (
+		"get_color",
+		"get_facecolor",
+		"get_edgecolor",
+		"get_linestyle",
+		"get_linewidth",
+		"get_marker",
+		"get_markersize",
+		"get_markerfacecolor",
+		"get_markeredgecolor",
+		"get_hatch",
+		"get_alpha",
+		)
+
+_LegendKey = Tuple[Tuple[int, ...], Tuple[str, ...], Optional[Tuple[Hashable, ...]], int, Optional[int]]
+
+_LegendOrder = Tuple[_LegendKey, List[int], int]
+
+#: The order of the last legend placed on each figure by :func:`~.horizontal_legend`.
+_legend_orders: "weakref.WeakKeyDictionary[domplotlib.Figure, _LegendOrder]" = weakref.WeakKeyDictionary()
+
+
+def _hashable(value: object) -> Hashable:
+	if _is_array(value):
+		return value.shape, value.tobytes()
+	if isinstance(value, (list, tuple)):
+		return tuple(map(_hashable, value))
+	if isinstance(value, Hashable):
+		return value
+
+	return id(value)
+
+
+def _legend_style(handle: object) -> Hashable:
 	"""
+	Returns a key which is the same for legend handles which look the same.
+
+	:param handle: An artist, or a :class:`~matplotlib.container.Container` of artists.
+	"""
+
+	# 3rd party
+	from matplotlib.container import Container  # type: ignore[import]
+
+	if isinstance(handle, Container):
+		children = [child for child in handle if child is not None]
+		return type(handle), (_legend_style(children[0]) if children else None)
+
+	style: List[Hashable] = [type(handle)]
+
+	for getter in _style_getters:
+		if hasattr(handle, getter):
+			style.append(_hashable(getattr(handle, getter)()))
+
+	return tuple(style)
+
+
+def _legend_order(
+		handles: "Sequence[domplotlib.Artist]",
+		labels: Sequence[str],
+		ncol: int,
+		styles: Optional[Sequence[Hashable]],
+		max_entries: Optional[int],
+		) -> Tuple[List[int], int]:
+	"""
+	Returns the indices of the legend entries in the order :func:`~.horizontal_legend` places them,
+	and the number of entries omitted by ``max_entries``.
+
+	The index ``-1`` marks where the entry for the omitted entries goes.
+
+	:param handles:
+	:param labels:
+	:param ncol:
+	:param styles: The :func:`~._legend_style` of each handle, used to remove duplicate entries.
+		If :py:obj:`None` duplicate entries are kept.
+	:param max_entries:
+	"""  # noqa: D400
+
+	entries: Iterable[int] = range(min(len(handles), len(labels)))
 
-	return itertools.chain.from_iterable(itertools.zip_longest(*chunks(tuple(iterable), ncol)))
+	if styles is not None:
+		seen = set()
+		unique = []
+
+		for idx in entries:
+			key = (labels[idx], styles[idx])
+			if key not in seen:
+				seen.add(key)
+				unique.append(idx)
+
+		entries = unique
+
+	entries = list(entries)
+	omitted = 0
+
+	if max_entries is not None and len(entries) > max_entries:
+		omitted = len(entries) - max_entries
+		entries = entries[:max_entries] + [-1]
+
+	# Rearrange legend items to read right to left rather than top to bottom.
+	return list(transpose(entries, ncol)), omitted
 
 
 def horizontal_legend(
-		fig: Figure,
-		handles: Optional[Iterable[Artist]] = None,
+		fig: "domplotlib.Figure",
+		handles: "Optional[Iterable[domplotlib.Artist]]" = None,
 		labels: Optional[Iterable[str]] = None,
 		*,
 		ncol: int = 1,
+		deduplicate: bool = True,
+		max_entries: Optional[int] = None,
+		overflow_label: str = "{} more",
 		**kwargs,
-		) -> Legend:
+		) -> "domplotlib.Legend":
 	"""
 	Place a legend on the figure, with the items arranged to read right to left rather than top to bottom.
 
+	The order of the items is remembered, so placing the same legend on the figure again is cheap
+	provided none of the handles have been restyled.
+
 	:param fig: The figure to plot the legend on.
 	:param handles:
 	:param labels:
 	:param ncol: The number of columns in the legend.
+	:param deduplicate: Show only the first of any items with the same label whose handles look the same.
+	:param max_entries: The maximum number of items to show.
+		Further items are replaced by a single item labelled with ``overflow_label``.
+	:param overflow_label: The label of the item which replaces those beyond ``max_entries``.
+		``{}`` is replaced by the number of items omitted.
 	:param kwargs: Addition keyword arguments passed to :meth:`matplotlib.figure.Figure.legend`.
+
+	.. versionchanged:: 0.5.0
+
+		* If ``handles`` and ``labels`` are not given they are collected from every axes in the figure,
+		  rather than only the first.
+		* Added the ``deduplicate``, ``max_entries`` and ``overflow_label`` keyword arguments.
 	"""
 
+	# 3rd party
+	from matplotlib.patches import Patch  # type: ignore[import]
+
 	if handles is None and labels is None:
-		handles, labels = fig.axes[0].get_legend_handles_labels()
+		handles, labels = [], []
 
-	# Rearrange legend items to read right to left rather than top to bottom.
-	if handles:
-		handles = list(filter(None, transpose(handles, ncol)))
-	if labels:
-		labels = list(filter(None, transpose(labels, ncol)))
+		for ax in fig.axes:
+			ax_handles, ax_labels = ax.get_legend_handles_labels()
+			handles.extend(ax_handles)
+			labels.extend(ax_labels)
+
+	if handles is None or labels is None:
+		# Rearrange legend items to read right to left rather than top to bottom.
+		if handles:
+			handles = list(transpose(handles, ncol))
+		if labels:
+			labels = list(transpose(labels, ncol))
 
-	return fig.legend(handles, labels, ncol=ncol, **kwargs)
+		return fig.legend(handles, labels, ncol=ncol, **kwargs)
+
+	handles = list(handles)
+	labels = list(labels)
+
+	# Restyling a handle can make it a duplicate of another, or stop it being one.
+	styles = tuple(map(_legend_style, handles)) if deduplicate else None
+	key: _LegendKey = (tuple(map(id, handles)), tuple(labels), styles, ncol, max_entries)
+
+	if fig in _legend_orders and _legend_orders[fig][0] == key:
+		_, order, omitted = _legend_orders[fig]
+	else:
+		order, omitted = _legend_order(handles, labels, ncol, styles, max_entries)
+		_legend_orders[fig] = (key, order, omitted)
+
+	overflow_handle = Patch(visible=False)
+
+	return fig.legend(
+			[handles[idx] if idx >= 0 else overflow_handle for idx in order],
+			[labels[idx] if idx >= 0 else overflow_label.format(omitted) for idx in order],
+			ncol=ncol,
+			**kwargs,
+			)
 
 
 def create_figure(
-		pagesize: PageSize,
+		pagesize: "domplotlib.PageSize",
 		left: float = 0.2,
 		bottom: float = 0.14,
 		right: float = 0.025,
 		top: float = 0.13,
-		) -> Tuple[Figure, Axes]:
+		*,
+		headless: bool = False,
+		) -> "Tuple[domplotlib.Figure, domplotlib.Axes]":
 	"""
 	Creates a figure with the given margins,
 	and returns a tuple of the figure and its axes.
@@ -226,16 +848,112 @@ def create_figure(
 	:param bottom: Bottom margin
 	:param right: Right margin
 	:param top: Top margin
+	:param headless: Attach the figure directly to an ``Agg`` canvas
+		rather than creating it with :func:`matplotlib.pyplot.figure`.
+		The figure is not registered with :mod:`matplotlib.pyplot`, which is not imported,
+		so independent figures can be created and saved from several threads at once.
+		The figure can't be shown, and does not need to be closed.
+
+	.. seealso:: :class:`~domplotlib.FigurePool`, to reuse figures rather than creating a new one for each plot.
+
+	.. versionchanged:: 0.5.0  Added the ``headless`` keyword argument.
 	"""  # noqa: D400
 
-	# 3rd party
-	from matplotlib import pyplot  # type: ignore[import]
+	if headless:
+		fig = _agg_figure(pagesize)
 
-	# Import here to avoid clobbering theme and backend choices.
+	else:
+		# 3rd party
+		from matplotlib import pyplot  # type: ignore[import]
+
+		# Import here to avoid clobbering theme and backend choices.
 
-	fig = pyplot.figure(figsize=pagesize)
+		fig = pyplot.figure(figsize=pagesize)
 
 	# [left, bottom, width, height]
 	ax = fig.add_axes([left, bottom, 1 - left - right, 1 - top - bottom])
 
 	return fig, ax
+
+
+def _agg_figure(figsize: Tuple[float, float]) -> "domplotlib.Figure":
+	"""
+	Returns a new figure attached to an ``Agg`` canvas, without going through :mod:`matplotlib.pyplot`.
+	"""
+
+	# 3rd party
+	from matplotlib.backends.backend_agg import FigureCanvasAgg  # type: ignore[import]
+	from matplotlib.figure import Figure  # type: ignore[import]
+
+	fig = Figure(figsize=figsize)
+	FigureCanvasAgg(fig)
+	return fig
+
+
+#: The submodule each of the names in ``__all__`` which are defined outside of this module is imported from.
+_lazy_imports = {
+		"FigurePool": "domplotlib.pool",
+		"Report": "domplotlib.report",
+		"SvgArchiveWriter": "domplotlib.archive",
+		"asave_many": "domplotlib.aio",
+		"asave_svg": "domplotlib.aio",
+		"save_many": "domplotlib.batch",
+		}
+
+#: The module each of the types named in annotations is imported from.
+_annotation_imports = {
+		"Artist": "matplotlib.artist",
+		"Axes": "matplotlib.axes",
+		"Bbox": "matplotlib.transforms",
+		"Figure": "matplotlib.figure",
+		"Legend": "matplotlib.legend",
+		"Literal": "typing_extensions",
+		"PageSize": "domdf_python_tools.pagesizes",
+		"PathLike": "domdf_python_tools.typing",
+		"SvgCache": "domplotlib.cache",
+		"ndarray": "numpy",
+		}
+
+
+def __getattr__(name: str) -> Any:
+	# The submodules are imported on first use, as they import much of matplotlib.
+	# So are the types named in annotations, which are only needed by typing.get_type_hints().
+
+	module = _lazy_imports.get(name) or _annotation_imports.get(name)
+
+	if module is not None:
+		# stdlib
+		import importlib
+
+		value = getattr(importlib.import_module(module), name)
+		globals()[name] = value
+		return value
+
+	raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+	return sorted({*globals(), *_lazy_imports})
+
+
+if sys.version_info < (3, 7):  # pragma: no cover (py37+)
+	# Module-level __getattr__ was added in Python 3.7.
+
+	# 3rd party
+	from domdf_python_tools.pagesizes import PageSize  # noqa: E402,F401
+	from domdf_python_tools.typing import PathLike  # noqa: E402,F401
+	from matplotlib.artist import Artist  # type: ignore[import]  # noqa: E402,F401
+	from matplotlib.axes import Axes  # type: ignore[import]  # noqa: E402,F401
+	from matplotlib.figure import Figure  # type: ignore[import]  # noqa: E402,F401
+	from matplotlib.legend import Legend  # type: ignore[import]  # noqa: E402,F401
+	from matplotlib.transforms import Bbox  # type: ignore[import]  # noqa: E402,F401
+	from numpy import ndarray  # noqa: E402,F401
+	from typing_extensions import Literal  # noqa: E402,F401
+
+	# this package
+	from domplotlib.aio import asave_many, asave_svg  # noqa: E402
+	from domplotlib.archive import SvgArchiveWriter  # noqa: E402
+	from domplotlib.batch import save_many  # noqa: E402
+	from domplotlib.cache import SvgCache  # noqa: E402,F401
+	from domplotlib.pool import FigurePool  # noqa: E402,F401
+	from domplotlib.report import Report  # noqa: E402
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+#
+#  aio.py
+"""
+:mod:`asyncio` interface for exporting figures.
+
+The figures are rendered in an :class:`~concurrent.futures.Executor`,
+so the event loop is free to handle other work while they are drawn and written.
+
+.. versionadded:: 0.5.0
+"""
+#
+#  Copyright © 2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import asyncio
+import threading
+import weakref
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import IO, Any, Callable, Iterable, List, Optional, Tuple, TypeVar, Union
+
+# 3rd party
+from domdf_python_tools.typing import PathLike
+from matplotlib.figure import Figure  # type: ignore[import]
+
+# this package
+from domplotlib import save_svg
+from domplotlib.batch import SaveResult
+
+__all__ = ["asave_many", "asave_svg", "figure_lock"]
+
+_T = TypeVar("_T")
+
+_figure_locks: "weakref.WeakKeyDictionary[Figure, threading.Lock]" = weakref.WeakKeyDictionary()
+_figure_locks_lock = threading.Lock()
+
+
+def figure_lock(figure: Figure) -> threading.Lock:
+	"""
+	Returns the lock which is held while ``figure`` is being rendered by :func:`~.asave_svg`.
+
+	:param figure:
+	"""
+
+	with _figure_locks_lock:
+		if figure not in _figure_locks:
+			_figure_locks[figure] = threading.Lock()
+		return _figure_locks[figure]
+
+
+def _check_executor(executor: Optional[Executor]) -> None:
+	"""
+	Raise a :exc:`TypeError` if ``executor`` runs its work in other processes.
+
+	The figures, and the locks which stop them being rendered concurrently, can't be shared between processes.
+
+	:param executor:
+	"""
+
+	if isinstance(executor, ProcessPoolExecutor):
+		raise TypeError(
+				"Figures can only be rendered in a thread pool, not a process pool. "
+				"Use domplotlib.save_many to render figures in other processes."
+				)
+
+
+async def _run_in_executor(executor: Optional[Executor], func: Callable[[], _T]) -> _T:
+	"""
+	Run ``func`` in ``executor``.
+
+	If the calling task is cancelled before ``func`` starts it will not be run.
+	Once ``func`` has started it cannot be interrupted, so cancellation waits for it to finish.
+
+	:param executor: If :py:obj:`None` the event loop's default executor is used.
+	:param func:
+	"""
+
+	loop = asyncio.get_event_loop()
+	started = threading.Event()
+	cancelled = threading.Event()
+
+	def job() -> Optional[_T]:
+		started.set()
+		if cancelled.is_set():
+			return None
+		return func()
+
+	future = loop.run_in_executor(executor, job)
+
+	try:
+		return await asyncio.shield(future)
+	except asyncio.CancelledError:
+		cancelled.set()
+		if started.is_set():
+			await asyncio.wait({future})
+		else:
+			future.cancel()
+		raise
+
+
+def _locked_save_svg(figure: Figure, fname: Union[PathLike, IO], **kwargs) -> None:
+	with figure_lock(figure):
+		save_svg(figure, fname, **kwargs)
+
+
+async def asave_svg(
+		figure: Figure,
+		fname: Union[PathLike, IO],
+		*,
+		executor: Optional[ThreadPoolExecutor] = None,
+		**kwargs,
+		) -> None:
+	r"""
+	Save the given figure as an SVG without blocking the event loop.
+
+	The figure is rendered with :func:`~domplotlib.save_svg` in ``executor``.
+	A figure is only rendered by one call at a time; concurrent calls for the same figure wait for each other.
+
+	If the task is cancelled before the figure starts rendering it will not be saved.
+	Rendering cannot be interrupted once it has started, so cancellation then waits for it to finish.
+
+	.. note::
+
+		Figures rendered from other threads should not be attached to an interactive (GUI) canvas.
+
+	:param figure:
+	:param fname: The file to save the SVG as.
+	:param executor: The thread pool to render the figure in.
+		If :py:obj:`None` the event loop's default executor is used.
+		Process pools can't be used, as the figure is shared with the calling thread.
+	:param \*\*kwargs: Keyword arguments passed to :func:`~domplotlib.save_svg`.
+
+	:raises TypeError: If ``executor`` is a :class:`~concurrent.futures.ProcessPoolExecutor`.
+	"""
+
+	_check_executor(executor)
+	await _run_in_executor(executor, partial(_locked_save_svg, figure, fname, **kwargs))
+
+
+async def asave_many(
+		figures: Iterable[Tuple[Figure, Union[PathLike, IO]]],
+		*,
+		max_concurrency: int = 4,
+		executor: Optional[ThreadPoolExecutor] = None,
+		**kwargs,
+		) -> List[SaveResult]:
+	r"""
+	Save many figures as SVGs without blocking the event loop.
+
+	At most ``max_concurrency`` figures are rendered at once.
+	Exceptions raised while saving a figure do not stop the others from being saved;
+	instead they are returned in the corresponding :class:`~domplotlib.batch.SaveResult`.
+	Cancelling the task cancels any figures which have not started rendering.
+
+	:param figures: Pairs of figures and the file to save each one as.
+	:param max_concurrency: The maximum number of figures to render at once.
+	:param executor: The thread pool to render the figures in.
+		If :py:obj:`None` the event loop's default executor is used.
+		Process pools can't be used, as the figures are shared with the calling thread.
+	:param \*\*kwargs: Keyword arguments passed to :func:`~domplotlib.save_svg` for every figure.
+
+	:returns: A :class:`~domplotlib.batch.SaveResult` for each figure, in the same order as ``figures``.
+
+	:raises TypeError: If ``executor`` is a :class:`~concurrent.futures.ProcessPoolExecutor`.
+	"""
+
+	_check_executor(executor)
+
+	semaphore = asyncio.Semaphore(max_concurrency)
+
+	async def save(figure: Figure, fname: Any) -> SaveResult:
+		async with semaphore:
+			try:
+				await asave_svg(figure, fname, executor=executor, **kwargs)
+			except asyncio.CancelledError:  # Not a BaseException until Python 3.8
+				raise
+			except Exception as e:
+				return SaveResult(fname, e)
+
+		return SaveResult(fname)
+
+	tasks = [asyncio.ensure_future(save(figure, fname)) for figure, fname in figures]
+	if not tasks:
+		return []
+
+	try:
+		await asyncio.wait(tasks)
+	except asyncio.CancelledError:
+		# Unlike asyncio.gather, wait for any figures being rendered to finish before returning.
+		for task in tasks:
+			task.cancel()
+		await asyncio.wait(tasks)
+		raise
+
+	return [task.result() for task in tasks]
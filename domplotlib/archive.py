@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+#
+#  archive.py
+"""
+Write many SVGs into a single zip or tar archive.
+
+.. versionadded:: 0.5.0
+"""
+#
+#  Copyright © 2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import gzip
+import io
+import os
+import tarfile
+import time
+import zipfile
+from contextlib import ExitStack, contextmanager
+from typing import IO, Iterator, Optional, Union
+
+# 3rd party
+from domdf_python_tools.paths import PathPlus
+from domdf_python_tools.typing import PathLike
+from matplotlib.figure import Figure  # type: ignore[import]
+from typing_extensions import Literal
+
+# this package
+from domplotlib import save_svg
+
+__all__ = ["SvgArchiveWriter"]
+
+
+class SvgArchiveWriter:
+	r"""
+	Writes SVGs as members of a zip or tar archive, without first writing each one to its own file.
+
+	Members of zip archives are streamed into the archive as they are rendered.
+	Tar archives record the size of each member before its contents,
+	so each member is held in memory until it has been rendered.
+	In either case only one figure is held in memory at a time.
+
+	.. code-block:: python
+
+		with SvgArchiveWriter("plots.zip") as archive:
+			for idx, figure in enumerate(figures):
+				archive.save(figure, f"plot_{idx}.svg")
+
+	The archive can also be passed to :func:`~domplotlib.save_many` to save figures into it in parallel.
+
+	:param file: The file to write the archive to, or a binary file-like object.
+	:param format: The archive format. Tar archives may be compressed with gzip (``'tar.gz'``).
+	:param compresslevel: The compression level, from 0 to 9. ``0`` stores the members of zip archives uncompressed.
+		If :py:obj:`None` the default level is used.
+	:param mtime: The modification time to record for each member, and in the gzip header, in seconds since the epoch.
+		If :py:obj:`None` the ``SOURCE_DATE_EPOCH`` environment variable is used when it is set,
+		otherwise the current time.
+
+	Archives of the same SVGs are byte-for-byte identical when ``mtime`` is given.
+	Pass ``deterministic=True`` to :meth:`~.SvgArchiveWriter.save` so that the SVGs themselves are too.
+	"""
+
+	def __init__(
+			self,
+			file: Union[PathLike, IO[bytes]],
+			format: Literal["zip", "tar", "tar.gz"] = "zip",  # noqa: A002  # pylint: disable=redefined-builtin
+			*,
+			compresslevel: Optional[int] = None,
+			mtime: Optional[float] = None,
+			):
+
+		if format not in {"zip", "tar", "tar.gz"}:
+			raise ValueError(f"Unsupported archive format {format!r}")
+
+		if mtime is None and os.environ.get("SOURCE_DATE_EPOCH"):
+			mtime = int(os.environ["SOURCE_DATE_EPOCH"])
+
+		self.format = format
+		self.mtime = mtime
+		self._stack = ExitStack()
+
+		try:
+			if isinstance(file, (str, os.PathLike)):
+				file = self._stack.enter_context(PathPlus(file).open("wb"))
+
+			self._zip: Optional[zipfile.ZipFile] = None
+			self._tar: Optional[tarfile.TarFile] = None
+
+			if format == "zip":
+				if compresslevel == 0:
+					self._zip = zipfile.ZipFile(file, 'w', compression=zipfile.ZIP_STORED)
+				elif compresslevel is None:
+					self._zip = zipfile.ZipFile(file, 'w', compression=zipfile.ZIP_DEFLATED)
+				else:
+					self._zip = zipfile.ZipFile(
+							file,
+							'w',
+							compression=zipfile.ZIP_DEFLATED,
+							compresslevel=compresslevel,  # type: ignore[call-arg]  # Python 3.7+
+							)
+				self._stack.enter_context(self._zip)
+			else:
+				if format == "tar.gz":
+					# An empty filename keeps the name of the file out of the gzip header.
+					file = self._stack.enter_context(
+							gzip.GzipFile(
+									filename='',
+									mode="wb",
+									fileobj=file,
+									compresslevel=9 if compresslevel is None else compresslevel,
+									mtime=mtime,
+									)
+							)
+				self._tar = self._stack.enter_context(tarfile.open(fileobj=file, mode="w|"))
+
+		except BaseException:
+			self._stack.close()
+			raise
+
+	def __enter__(self) -> "SvgArchiveWriter":
+		return self
+
+	def __exit__(self, *args) -> None:
+		self.close()
+
+	def __repr__(self) -> str:
+		return f"<{type(self).__name__}(format={self.format!r})>"
+
+	def close(self) -> None:
+		"""
+		Finish writing the archive, and close the file if it was opened by the :class:`~.SvgArchiveWriter`.
+		"""
+
+		self._stack.close()
+
+	@contextmanager
+	def open(self, name: str) -> Iterator[IO[bytes]]:  # noqa: A003  # pylint: disable=redefined-builtin
+		"""
+		Context manager to add a member to the archive, returning a binary stream to write its contents to.
+
+		The member is added to tar archives once the context manager exits without an exception.
+		Members of zip archives are written as the stream is written to,
+		so a member is added even if an exception is raised.
+
+		:param name: The name of the member.
+		"""
+
+		name = os.fspath(name)
+
+		if self._zip is not None:
+			with self._zip.open(self._zip_info(name), 'w') as fp:
+				yield fp
+
+		else:
+			buffer = io.BytesIO()
+			yield buffer
+			self.writestr(name, buffer.getvalue())
+
+	def writestr(self, name: str, data: bytes) -> None:
+		"""
+		Add a member to the archive with the given contents.
+
+		:param name: The name of the member.
+		:param data:
+		"""
+
+		name = os.fspath(name)
+
+		if self._zip is not None:
+			self._zip.writestr(self._zip_info(name), data)
+
+		else:
+			assert self._tar is not None
+
+			info = tarfile.TarInfo(name)
+			info.size = len(data)
+			info.mtime = int(time.time() if self.mtime is None else self.mtime)
+			self._tar.addfile(info, io.BytesIO(data))
+
+	def _zip_info(self, name: str) -> Union[str, zipfile.ZipInfo]:
+		"""
+		Returns the :class:`zipfile.ZipInfo` for a new member of the zip archive with the fixed ``mtime``,
+		or just its name to give the member the current time.
+
+		:param name: The name of the member.
+		"""
+
+		if self.mtime is None:
+			return name
+
+		assert self._zip is not None
+
+		# Zip archives can't record times before 1980.
+		date_time = max(time.gmtime(self.mtime)[:6], (1980, 1, 1, 0, 0, 0))
+
+		# The same attributes ZipFile gives members which are added by name.
+		info = zipfile.ZipInfo(name, date_time=date_time)
+		info.compress_type = self._zip.compression
+		info.external_attr = 0o600 << 16
+
+		compresslevel = getattr(self._zip, "compresslevel", None)
+		if compresslevel is not None:
+			if hasattr(info, "compress_level"):  # pragma: no cover (<py313)
+				info.compress_level = compresslevel
+			else:  # pragma: no cover (py313+)
+				info._compresslevel = compresslevel
+
+		return info
+
+	def save(self, figure: Figure, name: str, **kwargs) -> None:
+		r"""
+		Save the given figure as an SVG in the archive.
+
+		:param figure:
+		:param name: The name of the member. If it ends with ``.svgz`` the SVG is compressed with gzip.
+		:param \*\*kwargs: Keyword arguments passed to :func:`~domplotlib.save_svg`.
+		"""
+
+		with self.open(name) as fp:
+			save_svg(figure, fp, **{"compress": os.fspath(name).endswith(".svgz"), **kwargs})
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+#
+#  batch.py
+"""
+Export many figures at once.
+
+.. versionadded:: 0.5.0
+"""
+#
+#  Copyright © 2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import io
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import ExitStack
+from functools import partial
+from typing import IO, Any, Callable, Deque, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+# 3rd party
+from domdf_python_tools.typing import PathLike
+from matplotlib.figure import Figure  # type: ignore[import]
+
+# this package
+from domplotlib import save_svg
+from domplotlib.archive import SvgArchiveWriter
+from domplotlib.textcache import text_layout_cache
+
+__all__ = ["FigureBuilder", "SaveJob", "SaveResult", "save_many"]
+
+#: A callable which takes no arguments and returns a figure, or a tuple whose first element is a figure.
+FigureBuilder = Callable[[], Union[Figure, Tuple[Any, ...]]]
+
+
+class SaveJob(NamedTuple):
+	"""
+	A figure to export with :func:`~.save_many`.
+	"""
+
+	#: Picklable callable which creates the figure.
+	builder: FigureBuilder
+
+	#: The file to save the SVG as.
+	fname: PathLike
+
+	#: Keyword arguments passed to :func:`~domplotlib.save_svg` for this job only.
+	kwargs: Optional[Dict[str, Any]] = None
+
+
+class SaveResult(NamedTuple):
+	"""
+	The outcome of a :class:`~.SaveJob`.
+	"""
+
+	#: The file the SVG was saved as.
+	fname: PathLike
+
+	#: The exception raised while building or saving the figure, if any.
+	error: Optional[BaseException] = None
+
+	@property
+	def ok(self) -> bool:
+		"""
+		Returns whether the figure was saved successfully.
+		"""
+
+		return self.error is None
+
+
+def _run_job(
+		job: SaveJob,
+		common_kwargs: Dict[str, Any],
+		headless: bool = False,
+		fp: Optional[IO] = None,
+		text_cache: bool = False,
+		) -> SaveResult:
+	"""
+	Build and save the figure for ``job``, capturing any exception raised.
+
+	:param job:
+	:param common_kwargs: Keyword arguments passed to :func:`~domplotlib.save_svg` for every job.
+	:param headless: Switch to the non-interactive ``Agg`` backend first. Used in worker processes.
+	:param fp: The file-like object to save the SVG to, rather than :attr:`SaveJob.fname <.SaveJob.fname>`.
+	:param text_cache: Share text layouts with other figures drawn by this process.
+	"""
+
+	# 3rd party
+	import matplotlib  # type: ignore[import]
+
+	if headless and matplotlib.get_backend().lower() != "agg":
+		matplotlib.use("Agg")
+
+	# 3rd party
+	from matplotlib import pyplot  # type: ignore[import]
+
+	figure = None
+
+	try:
+		with ExitStack() as stack:
+			if text_cache:
+				stack.enter_context(text_layout_cache())
+
+			figure = job.builder()
+			if isinstance(figure, tuple):
+				figure = figure[0]
+
+			save_svg(figure, job.fname if fp is None else fp, **{**common_kwargs, **(job.kwargs or {})})
+	except Exception as e:
+		return SaveResult(job.fname, e)
+	finally:
+		if figure is not None:
+			pyplot.close(figure)
+
+	return SaveResult(job.fname)
+
+
+def _render_jobs(
+		jobs: List[SaveJob],
+		common_kwargs: Dict[str, Any],
+		headless: bool = False,
+		text_cache: bool = False,
+		) -> List[Tuple[SaveResult, Optional[bytes]]]:
+	"""
+	Build the figures for ``jobs`` and render them as SVGs in memory.
+
+	:param jobs: The jobs. The :attr:`SaveJob.fname <.SaveJob.fname>` of each is the name of a member of an archive,
+		and the SVG is compressed with gzip if it ends with ``.svgz``.
+	:param common_kwargs: Keyword arguments passed to :func:`~domplotlib.save_svg` for every job.
+	:param headless: Switch to the non-interactive ``Agg`` backend first. Used in worker processes.
+	:param text_cache: Share text layouts with other figures drawn by this process.
+
+	:returns: The result of each job, and the SVG if it was rendered successfully.
+	"""
+
+	rendered = []
+
+	for job in jobs:
+		fp = io.BytesIO()
+		kwargs = {"compress": os.fspath(job.fname).endswith(".svgz"), **common_kwargs}
+		result = _run_job(job, kwargs, headless, fp, text_cache)
+		rendered.append((result, fp.getvalue() if result.ok else None))
+
+	return rendered
+
+
+def _save_to_archive(
+		jobs: List[SaveJob],
+		archive: SvgArchiveWriter,
+		workers: Optional[int],
+		chunksize: int,
+		common_kwargs: Dict[str, Any],
+		text_cache: bool = False,
+		) -> List[SaveResult]:
+	"""
+	Build and save the figures for ``jobs`` as members of ``archive``.
+
+	The SVGs are rendered in worker processes and written to the archive by this process in the order of ``jobs``.
+	At most two chunks of jobs per worker are in progress at once, which bounds the memory used.
+
+	:param jobs:
+	:param archive:
+	:param workers: The number of worker processes.
+	:param chunksize: The number of jobs sent to a worker process at a time.
+	:param common_kwargs: Keyword arguments passed to :func:`~domplotlib.save_svg` for every job.
+	:param text_cache: Share text layouts between the figures drawn by each process.
+	"""
+
+	results: List[SaveResult] = []
+
+	def write(rendered: List[Tuple[SaveResult, Optional[bytes]]]) -> None:
+		for result, data in rendered:
+			if data is not None:
+				archive.writestr(os.fspath(result.fname), data)
+			results.append(result)
+
+	batches = [jobs[idx:idx + chunksize] for idx in range(0, len(jobs), chunksize)]
+
+	if workers == 0:
+		for chunk in batches:
+			write(_render_jobs(chunk, common_kwargs, text_cache=text_cache))
+		return results
+
+	max_pending = 2 * (workers or os.cpu_count() or 1)
+
+	with ProcessPoolExecutor(max_workers=workers) as executor:
+		pending: Deque[Future] = deque()
+
+		for chunk in batches:
+			pending.append(executor.submit(_render_jobs, chunk, common_kwargs, True, text_cache))
+			if len(pending) >= max_pending:
+				write(pending.popleft().result())
+
+		while pending:
+			write(pending.popleft().result())
+
+	return results
+
+
+def save_many(
+		jobs: Iterable[Union[SaveJob, Tuple[FigureBuilder, PathLike]]],
+		workers: Optional[int] = None,
+		*,
+		chunksize: int = 1,
+		archive: Optional[SvgArchiveWriter] = None,
+		text_cache: bool = False,
+		**kwargs,
+		) -> List[SaveResult]:
+	r"""
+	Build and save many figures as SVGs, in parallel over a pool of processes.
+
+	Each job is a :class:`~.SaveJob`, or a ``(builder, fname)`` tuple.
+	``builder`` is called in the worker process to create the figure,
+	so it must be picklable (e.g. a function defined at the top level of a module).
+	The figure is closed once it has been saved.
+
+	Exceptions raised by a job do not stop the others from running;
+	instead they are returned in the corresponding :class:`~.SaveResult`.
+
+	:param jobs:
+	:param workers: The number of worker processes.
+		If :py:obj:`None` the number of CPUs is used.
+		If ``0`` the jobs are run one after another in the current process.
+	:param chunksize: The number of jobs sent to a worker process at a time.
+		Larger values reduce the overhead of communicating with the workers when there are many small jobs.
+	:param archive: An optional archive to save the SVGs into.
+		The ``fname`` of each job is then the name of its member in the archive.
+		The SVGs are written to the archive by the current process, in the same order as ``jobs``.
+		Members whose name ends with ``.svgz`` are compressed with gzip.
+	:param text_cache: Share the layout of text (tick labels, titles, legend labels etc.)
+		between the figures drawn by each process, using :func:`~domplotlib.textcache.text_layout_cache`.
+		This speeds up exporting many figures with the same style.
+	:param \*\*kwargs: Keyword arguments passed to :func:`~domplotlib.save_svg` for every job.
+		These can be overridden for individual jobs with :attr:`SaveJob.kwargs <.SaveJob.kwargs>`.
+
+	:returns: A :class:`~.SaveResult` for each job, in the same order as ``jobs``.
+	"""
+
+	job_list = [SaveJob(*job) for job in jobs]
+
+	if archive is not None:
+		return _save_to_archive(job_list, archive, workers, chunksize, kwargs, text_cache)
+
+	if workers == 0:
+		return [_run_job(job, kwargs, text_cache=text_cache) for job in job_list]
+
+	run_job = partial(_run_job, common_kwargs=kwargs, headless=True, text_cache=text_cache)
+
+	with ProcessPoolExecutor(max_workers=workers) as executor:
+		return list(executor.map(run_job, job_list, chunksize=chunksize))
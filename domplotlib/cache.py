@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+#
+#  cache.py
+"""
+On-disk cache of rendered figures.
+
+.. versionadded:: 0.5.0
+"""
+#
+#  Copyright © 2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import hashlib
+import os
+import shutil
+import tempfile
+import types
+import weakref
+from collections import OrderedDict
+from functools import partial
+from typing import IO, Any, Callable, Optional, Set, Union
+
+# 3rd party
+import numpy
+from domdf_python_tools.paths import PathPlus
+from domdf_python_tools.typing import PathLike
+from matplotlib.artist import Artist  # type: ignore[import]
+from matplotlib.cbook import CallbackRegistry  # type: ignore[import]
+from matplotlib.figure import Figure  # type: ignore[import]
+from matplotlib.path import Path  # type: ignore[import]
+from matplotlib.transforms import BboxBase, Transform  # type: ignore[import]
+
+__all__ = ["SvgCache", "figure_fingerprint"]
+
+#: Attributes of artists which do not affect their appearance, or which refer back up the tree.
+_ignored_attributes = frozenset({
+		"stale",
+		"_stale",
+		"stale_callback",
+		"_remove_method",
+		"figure",
+		"_figure",
+		"_parent_figure",
+		"axes",
+		"_axes",
+		"canvas",
+		"_canvas",
+		"_cachedRenderer",
+		"_renderer",
+		"callbacks",
+		"_callbacks",
+		"callbacksSM",
+		"_mouseover",
+		"number",
+		"_number",
+		})
+
+_max_depth = 8
+
+
+def _update(hasher: Any, value: Any, seen: Set[int], depth: int = 0) -> None:
+	"""
+	Update ``hasher`` with a stable representation of ``value``.
+
+	:param hasher:
+	:param value:
+	:param seen: The :func:`id`\\s of objects already hashed, to avoid cycles.
+	:param depth: How deeply nested ``value`` is.
+	"""
+
+	update = hasher.update
+
+	if value is None or isinstance(value, (bool, int, float, complex, str, bytes)):
+		update(repr(value).encode("UTF-8"))
+
+	elif isinstance(value, numpy.ndarray):
+		if value.dtype.hasobject:
+			update(f"object{value.shape}".encode("UTF-8"))
+			for element in value.ravel():
+				_update(hasher, element, seen, depth + 1)
+		else:
+			update(f"{value.dtype.str}{value.shape}".encode("UTF-8"))
+			update(numpy.ascontiguousarray(value).tobytes())
+
+	elif isinstance(value, numpy.generic):
+		update(repr(value.item()).encode("UTF-8"))
+
+	elif isinstance(value, (list, tuple)):
+		update(b'[')
+		for element in value:
+			_update(hasher, element, seen, depth + 1)
+		update(b']')
+
+	elif isinstance(value, (set, frozenset)):
+		update(repr(sorted(map(repr, value))).encode("UTF-8"))
+
+	elif isinstance(value, dict):
+		update(b'{')
+		for key in sorted(value, key=repr):
+			_update(hasher, key, seen, depth + 1)
+			_update(hasher, value[key], seen, depth + 1)
+		update(b'}')
+
+	elif isinstance(value, Path):
+		_update(hasher, value.vertices, seen, depth + 1)
+		_update(hasher, value.codes, seen, depth + 1)
+
+	elif isinstance(value, BboxBase):
+		_update(hasher, value.get_points(), seen, depth + 1)
+
+	elif isinstance(value, Transform) and value.is_affine:
+		_update(hasher, value.get_matrix(), seen, depth + 1)
+
+	elif isinstance(value, (Artist, CallbackRegistry, weakref.ref)) or type(value) is object:
+		# Artists are hashed separately as the tree is walked. Plain objects are sentinels without any state.
+		update(type(value).__qualname__.encode("UTF-8"))
+
+	elif isinstance(value, type):
+		update(f"{value.__module__}.{value.__qualname__}".encode("UTF-8"))
+
+	elif isinstance(value, types.ModuleType):
+		update(value.__name__.encode("UTF-8"))
+
+	elif id(value) in seen or depth >= _max_depth:
+		update(b"...")
+
+	elif isinstance(value, types.CodeType):
+		seen.add(id(value))
+		update(value.co_code)
+		_update(hasher, (value.co_consts, value.co_names), seen, depth + 1)
+
+	elif isinstance(value, types.FunctionType):
+		seen.add(id(value))
+		update(f"{value.__module__}.{value.__qualname__}".encode("UTF-8"))
+		closure = [_cell_contents(cell) for cell in value.__closure__ or ()]
+		_update(hasher, (value.__code__, value.__defaults__, value.__kwdefaults__, closure), seen, depth + 1)
+
+	elif isinstance(value, types.MethodType):
+		seen.add(id(value))
+		_update(hasher, (value.__func__, value.__self__), seen, depth + 1)
+
+	elif isinstance(value, types.BuiltinFunctionType):
+		seen.add(id(value))
+		update(f"{value.__module__}.{value.__qualname__}".encode("UTF-8"))
+		_update(hasher, value.__self__, seen, depth + 1)
+
+	elif isinstance(value, partial):
+		seen.add(id(value))
+		_update(hasher, (value.func, value.args, value.keywords), seen, depth + 1)
+
+	elif hasattr(value, "__dict__"):
+		seen.add(id(value))
+		update(type(value).__qualname__.encode("UTF-8"))
+		_update_attributes(hasher, vars(value), seen, depth + 1)
+
+	else:
+		representation = repr(value)
+
+		# The default repr only gives the object's address, not its state.
+		if " at 0x" in representation:
+			raise TypeError(f"The state of {type(value).__qualname__!r} objects can't be fingerprinted.")
+
+		update(f"{type(value).__qualname__}{representation}".encode("UTF-8"))
+
+
+def _cell_contents(cell: Any) -> Any:
+	try:
+		return cell.cell_contents
+	except ValueError:  # The variable hasn't been assigned yet.
+		return None
+
+
+def _update_attributes(hasher: Any, attributes: dict, seen: Set[int], depth: int) -> None:
+	for name in sorted(attributes):
+		if name not in _ignored_attributes:
+			hasher.update(name.encode("UTF-8"))
+			_update(hasher, attributes[name], seen, depth)
+
+
+def figure_fingerprint(figure: Figure, **kwargs) -> str:
+	r"""
+	Returns a fingerprint of the figure, which changes when anything which affects its appearance changes.
+
+	The fingerprint is computed from the state of every artist in the figure
+	(including their data arrays), the figure's size, :data:`matplotlib.rcParams`,
+	the versions of matplotlib and domplotlib, and ``kwargs``.
+
+	:param figure:
+	:param \*\*kwargs: Additional values to include in the fingerprint,
+		such as the keyword arguments used to save the figure.
+
+	:returns: A hex digest.
+
+	:raises TypeError: If part of the figure's state can't be fingerprinted.
+	"""
+
+	# 3rd party
+	import matplotlib  # type: ignore[import]
+
+	# this package
+	import domplotlib
+
+	hasher = hashlib.sha256()
+	seen: Set[int] = set()
+
+	_update(hasher, (matplotlib.__version__, domplotlib.__version__), seen)
+	_update(hasher, tuple(figure.get_size_inches()), seen)
+	_update(hasher, dict(matplotlib.rcParams), seen)
+	_update(hasher, kwargs, seen)
+
+	for artist in figure.findobj():
+		hasher.update(type(artist).__qualname__.encode("UTF-8"))
+		seen.add(id(artist))
+		_update_attributes(hasher, vars(artist), seen, 1)
+
+	return hasher.hexdigest()
+
+
+class SvgCache:
+	"""
+	A content-addressed, size-bounded cache of rendered SVG files.
+
+	Pass the cache to :func:`~domplotlib.save_svg` to use it.
+	When a figure with the same :func:`fingerprint <.figure_fingerprint>` has already been saved,
+	the earlier output is copied (or hard linked) rather than rendering the figure again.
+
+	When the cache grows larger than ``max_size`` the least recently used entries are removed.
+
+	:param directory: The directory to store the cached files in. It will be created if it doesn't exist.
+	:param max_size: The maximum total size of the cached files, in bytes.
+		If :py:obj:`None` the cache is unbounded.
+	:param hardlink: Hard link cached files to their destination rather than copying them.
+		Files will be copied if hard linking is not possible.
+		Note that changes to a hard linked file will also change the cached file.
+	"""
+
+	#: The number of times a figure was found in the cache.
+	hits: int
+
+	#: The number of times a figure was not found in the cache.
+	misses: int
+
+	def __init__(self, directory: PathLike, max_size: Optional[int] = None, *, hardlink: bool = False):
+		self.directory = PathPlus(directory)
+		self.directory.maybe_make(parents=True)
+		self.max_size = max_size
+		self.hardlink = hardlink
+		self.hits = 0
+		self.misses = 0
+
+		# Least recently used first.
+		entries = sorted(self.directory.glob("*.svg"), key=lambda p: p.stat().st_mtime)
+		self._entries: "OrderedDict[str, int]" = OrderedDict((p.stem, p.stat().st_size) for p in entries)
+
+	def __len__(self) -> int:
+		return len(self._entries)
+
+	def __repr__(self) -> str:
+		return f"<{type(self).__name__}({str(self.directory)!r}, entries={len(self)}, size={self.size})>"
+
+	@property
+	def size(self) -> int:
+		"""
+		The total size of the cached files, in bytes.
+		"""
+
+		return sum(self._entries.values())
+
+	def fingerprint(self, figure: Figure, **kwargs) -> Optional[str]:
+		r"""
+		Returns the key for ``figure`` in the cache,
+		or :py:obj:`None` if part of its state can't be fingerprinted and it mustn't be cached.
+
+		:param figure:
+		:param \*\*kwargs: The keyword arguments used to save the figure.
+		"""
+
+		try:
+			return figure_fingerprint(figure, **kwargs)
+		except TypeError:
+			return None
+
+	def _path_for(self, key: str) -> PathPlus:
+		return self.directory / f"{key}.svg"
+
+	def get(self, key: str) -> Optional[PathPlus]:
+		"""
+		Returns the path to the cached file for ``key``, or :py:obj:`None` if it isn't in the cache.
+
+		:param key:
+		"""
+
+		path = self._path_for(key)
+
+		if key in self._entries and path.is_file():
+			self.hits += 1
+			self._entries.move_to_end(key)
+			os.utime(path)
+			return path
+
+		self.misses += 1
+		self._entries.pop(key, None)
+		return None
+
+	def put(self, key: str, write: Callable[[PathPlus], Any]) -> PathPlus:
+		"""
+		Add a file to the cache.
+
+		:param key:
+		:param write: Function which writes the file to the path it is given.
+			The file is only added to the cache if this does not raise an exception.
+
+		:returns: The path to the cached file.
+		"""
+
+		fd, tmpname = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+		os.close(fd)
+		tmpfile = PathPlus(tmpname)
+
+		try:
+			write(tmpfile)
+			path = self._path_for(key)
+			os.replace(tmpfile, path)
+		finally:
+			if tmpfile.exists():
+				tmpfile.unlink()
+
+		self._entries[key] = path.stat().st_size
+		self._entries.move_to_end(key)
+		self._evict(keep=key)
+
+		return path
+
+	def _evict(self, keep: str) -> None:
+		if self.max_size is None:
+			return
+
+		size = self.size
+
+		while size > self.max_size and len(self._entries) > 1:
+			key, entry_size = next(iter(self._entries.items()))
+			if key == keep:  # pragma: no cover
+				break
+
+			self.discard(key)
+			size -= entry_size
+
+	def discard(self, key: str) -> None:
+		"""
+		Remove ``key`` from the cache, if present.
+
+		:param key:
+		"""
+
+		self._entries.pop(key, None)
+		path = self._path_for(key)
+		if path.exists():
+			path.unlink()
+
+	def clear(self) -> None:
+		"""
+		Remove every file from the cache, and reset the hit and miss counters.
+		"""
+
+		for key in list(self._entries):
+			self.discard(key)
+
+		self.hits = 0
+		self.misses = 0
+
+	def export(self, path: PathLike, fname: Union[PathLike, IO]) -> None:
+		"""
+		Copy (or hard link) the cached file at ``path`` to ``fname``.
+
+		:param path:
+		:param fname: The destination filename, or a file-like object to write the contents to.
+		"""
+
+		if not isinstance(fname, (str, os.PathLike)):
+			try:
+				fname.write(b'')
+			except TypeError:
+				with open(path, encoding="UTF-8", newline='') as fp:
+					shutil.copyfileobj(fp, fname)
+			else:
+				with open(path, "rb") as fp:
+					shutil.copyfileobj(fp, fname)
+			return
+
+		if self.hardlink:
+			try:
+				if os.path.lexists(fname):
+					os.unlink(fname)
+				os.link(path, fname)
+				return
+			except OSError:
+				pass
+
+		shutil.copyfile(path, fname)
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+#
+#  decimate.py
+"""
+Reduce the number of points in lines which are denser than the output can display.
+
+.. versionadded:: 0.5.0
+"""
+#
+#  Copyright © 2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+# 3rd party
+import numpy
+from matplotlib.figure import Figure  # type: ignore[import]
+from matplotlib.lines import Line2D  # type: ignore[import]
+
+__all__ = ["decimate_lines", "min_max_indices"]
+
+
+def min_max_indices(x: numpy.ndarray, y: numpy.ndarray) -> numpy.ndarray:
+	"""
+	Returns the indices of the points to keep when decimating the line ``(x, y)``.
+
+	``x`` gives the bucket each point falls in, and must be sorted.
+	The first, last, lowest and highest points in each bucket are kept,
+	which draws the same shape as the full line when each bucket is no wider than a pixel.
+
+	:param x: The bucket of each point, as integers.
+	:param y:
+
+	:returns: The sorted indices of the points to keep.
+	"""
+
+	if not len(x):
+		return numpy.arange(0)
+
+	starts = numpy.flatnonzero(numpy.diff(x)) + 1
+	firsts = numpy.concatenate(([0], starts))
+	lasts = numpy.concatenate((starts - 1, [len(x) - 1]))
+
+	# Within each bucket the points are ordered by y, so the first is the lowest and the last the highest.
+	by_y = numpy.lexsort((y, x))
+
+	return numpy.unique(numpy.concatenate((firsts, lasts, by_y[firsts], by_y[lasts])))
+
+
+def _decimatable(line: Line2D) -> bool:
+	"""
+	Returns whether ``line`` can be decimated without changing its appearance.
+
+	Lines with markers are left alone, as every point is drawn,
+	as are stepped lines, whose shape depends on every point.
+
+	:param line:
+	"""
+
+	return (
+			line.get_visible() and line.axes is not None and line.get_marker() in {None, "None", '', ' '}
+			and line.get_drawstyle() == "default"
+			)
+
+
+def _decimated_indices(line: Line2D, max_points_per_pixel: float, scale: float) -> Optional[numpy.ndarray]:
+	xy = line.get_xydata()
+
+	if len(xy) <= 4 or not numpy.isfinite(xy).all():
+		return None
+
+	x_pixels = line.get_transform().transform(xy)[:, 0] * scale
+	steps = numpy.diff(x_pixels)
+
+	if (steps < 0).all():
+		x_pixels = -x_pixels
+	elif not (steps >= 0).all():
+		# Unordered data (e.g. a closed curve) can't be bucketed by x.
+		return None
+
+	# Four points (first, last, lowest and highest) are kept from each bucket.
+	buckets = numpy.floor(x_pixels * max_points_per_pixel / 4).astype(numpy.int64)
+	indices = min_max_indices(buckets, xy[:, 1])
+
+	if len(indices) >= len(xy):
+		return None
+
+	return indices
+
+
+@contextmanager
+def decimate_lines(
+		figure: Figure,
+		max_points_per_pixel: float = 4,
+		dpi: Optional[float] = None,
+		) -> Iterator[List[Line2D]]:
+	"""
+	Context manager to temporarily reduce the number of points in the figure's lines.
+
+	Each line is split into buckets along the x-axis,
+	and only the first, last, lowest and highest points in each bucket are kept.
+	With the default of four points per pixel each bucket is one pixel wide,
+	so the decimated line looks the same as the original when the figure is displayed at ``dpi``.
+
+	Only lines whose x values are sorted, which have no markers and which are drawn without steps are decimated.
+	Lines containing non-finite values are left alone.
+
+	The original data is restored on exit.
+
+	.. code-block:: python
+
+		with decimate_lines(fig, dpi=150):
+			save_svg(fig, "timeseries.svg", dpi=150)
+
+	:param figure:
+	:param max_points_per_pixel: The maximum number of points to keep per pixel.
+	:param dpi: The resolution the figure will be displayed at.
+		If :py:obj:`None` the figure's dpi is used.
+
+	:returns: A list of the lines which were decimated.
+	"""
+
+	if max_points_per_pixel <= 0:
+		raise ValueError("'max_points_per_pixel' must be greater than zero.")
+
+	scale = 1 if dpi is None else dpi / figure.dpi
+	originals: List[Tuple[Line2D, Tuple]] = []
+
+	try:
+		for line in figure.findobj(Line2D):
+			if not _decimatable(line):
+				continue
+
+			indices = _decimated_indices(line, max_points_per_pixel, scale)
+			if indices is None:
+				continue
+
+			x, y = line.get_data(orig=True)
+			originals.append((line, (x, y)))
+			line.set_data(numpy.asarray(x)[indices], numpy.asarray(y)[indices])
+
+		yield [line for line, data in originals]
+
+	finally:
+		for line, data in originals:
+			line.set_data(*data)
@@ -29,14 +29,22 @@ Custom plotting functions.
 #
 
 # stdlib
-from typing import Collection, List, Optional, Tuple, overload
+import math
+from collections import Counter
+from functools import partial
+from typing import Any, Callable, Collection, Dict, Iterable, List, Mapping, Optional, Tuple, Union, overload
 
 # 3rd party
-from cawdrey.tally import SupportsMostCommon, Tally
+import numpy
+from cawdrey.tally import Tally
+from matplotlib.artist import Artist  # type: ignore[import]
+from matplotlib.collections import PolyCollection  # type: ignore[import]
 from matplotlib.patches import Wedge  # type: ignore[import]
 from matplotlib.text import Text  # type: ignore[import]
+from matplotlib.ticker import FuncFormatter, Locator  # type: ignore[import]
+from typing_extensions import Literal
 
-__all__ = ["pie_from_tally"]
+__all__ = ["LivePie", "bar_from_tally", "pie_from_tally", "pies_from_tallies"]
 
 
 @overload
@@ -46,6 +54,8 @@ def pie_from_tally(
 		*,
 		percent: bool = ...,
 		reverse: bool = ...,
+		top: Optional[int] = ...,
+		other_label: str = ...,
 		autopct: None = ...,
 		**kwargs,
 		) -> Tuple[List[Wedge], List[Text]]: ...
@@ -58,6 +68,8 @@ def pie_from_tally(
 		*,
 		percent: bool = ...,
 		reverse: bool = ...,
+		top: Optional[int] = ...,
+		other_label: str = ...,
 		autopct: str,
 		**kwargs,
 		) -> Tuple[List[Wedge], List[Text], List[Text]]: ...
@@ -69,6 +81,8 @@ def pie_from_tally(
 		*,
 		percent: bool = False,
 		reverse: bool = False,
+		top: Optional[int] = None,
+		other_label: str = "Other",
 		autopct: Optional[str] = None,
 		**kwargs,
 		) -> Tuple[List, ...]:
@@ -79,6 +93,10 @@ def pie_from_tally(
 	:param explode: A list of key names to explode the segments for.
 	:param percent: If :py:obj:`True`, shows the percentage of each element out of the sum of all elements.
 	:param reverse: Order the wedges clockwise rather than anticlockwise..
+	:param top: Show only the ``top`` most common elements, with the remainder combined into a single wedge.
+		The most common elements are found without sorting the whole tally,
+		so the time taken to draw the chart does not depend on how many distinct elements it has.
+	:param other_label: The label for the wedge combining the elements not in the ``top`` most common.
 	:param \*\*kwargs: Other keyword arguments taken by :meth:`matplotlib.axes.Axes.pie`.
 
 	:return:
@@ -87,8 +105,13 @@ def pie_from_tally(
 		* texts (:class:`list`\) -- A list of the label `.Text` instances.
 		* autotexts (:class:`list`\) -- A list of `.Text` instances for the numeric labels. This will only
 		  be returned if the parameter *autopct* is not *None*.
+
+	.. versionchanged:: 0.5.0  Added the ``top`` and ``other_label`` keyword arguments.
 	"""
 
+	if top is not None and top < 1:
+		raise ValueError("'top' must be at least 1")
+
 	if "ax" in kwargs:
 		ax = kwargs.pop("ax")
 	else:  # pragma: no cover
@@ -100,16 +123,16 @@ def pie_from_tally(
 	kwargs.pop("labels", None)
 	kwargs["autopct"] = autopct
 
-	data: SupportsMostCommon[str]
+	data = _tally_items(tally, top, other_label)
+
 	if percent:
-		data = tally.as_percentage()
-	else:
-		data = tally
+		total = tally.total
+		data = [(label, count / total) for label, count in data]
 
 	if reverse:
-		labels, sizes = list(zip(*reversed(data.most_common())))
-	else:
-		labels, sizes = list(zip(*data.most_common()))
+		data.reverse()
+
+	labels, sizes = list(zip(*data))
 
 	if explode:
 		kwargs["explode"] = tuple(0.1 if label in explode else 0.0 for label in labels)
@@ -117,3 +140,567 @@ def pie_from_tally(
 		kwargs.pop("explode", None)
 
 	return ax.pie(sizes, labels=labels, **kwargs)
+
+
+def _tally_items(tally: Tally[str], top: Optional[int], other_label: str) -> List[Tuple[str, float]]:
+	"""
+	Returns the elements of ``tally`` and their counts, from the most common to the least.
+
+	:param tally:
+	:param top: Return only the ``top`` most common elements, followed by the total count of the remainder.
+	:param other_label: The label for the total count of the elements not in the ``top`` most common.
+	"""
+
+	if top is None or len(tally) <= top:
+		return tally.most_common()  # type: ignore[return-value]
+
+	# Counter.most_common(n) selects with heapq.nlargest rather than sorting every element.
+	data: List[Tuple[str, float]] = tally.most_common(top)  # type: ignore[assignment]
+	other = tally.total - sum(count for label, count in data)
+	if other > 0:
+		data.append((other_label, other))
+
+	return data
+
+
+def pies_from_tallies(
+		tallies: Mapping[str, Tally[str]],
+		ncols: int = 4,
+		*,
+		top: Optional[int] = None,
+		other_label: str = "Other",
+		reverse: bool = False,
+		colors: Optional[Mapping[str, Any]] = None,
+		legend: bool = True,
+		legend_kwargs: Optional[Dict[str, Any]] = None,
+		**kwargs,
+		) -> Dict[str, Tuple[List, ...]]:
+	r"""
+	Construct a grid of pie charts, one for each :class:`cawdrey.tally.Tally`.
+
+	The pies are drawn on a single axes, rather than creating an axes for each one,
+	which makes large grids much quicker to build and render.
+	Each element has the same colour in every pie, and the pies share a single legend
+	placed on the figure with :func:`~domplotlib.horizontal_legend`, rather than labelling every wedge.
+
+	.. code-block:: python
+
+		fig, ax = create_figure(A4.inch, left=0, bottom=0.1, right=0, top=0)
+		pies_from_tallies({"North": north_tally, "South": south_tally}, ncols=2, top=5, ax=ax)
+
+	:param tallies: Mapping of the title of each pie to its tally.
+	:param ncols: The number of pies in each row.
+	:param top: Show only the ``top`` most common elements of each tally,
+		with the remainder combined into a single wedge.
+	:param other_label: The label for the wedge combining the elements not in the ``top`` most common.
+	:param reverse: Order the wedges clockwise rather than anticlockwise.
+	:param colors: Mapping of elements to colours.
+		Other elements are given the colours of the ``axes.prop_cycle`` in turn,
+		from the most common across all the tallies to the least.
+	:param legend: Whether to add a legend to the figure.
+	:param legend_kwargs: Keyword arguments passed to :func:`~domplotlib.horizontal_legend`.
+	:param \*\*kwargs: Other keyword arguments taken by :meth:`matplotlib.axes.Axes.pie`.
+
+	:returns: A mapping of the title of each pie to the values returned by :meth:`matplotlib.axes.Axes.pie`.
+
+	.. versionadded:: 0.5.0
+	"""
+
+	# 3rd party
+	from matplotlib import rcParams  # type: ignore[import]
+
+	# this package
+	from domplotlib import horizontal_legend
+
+	if ncols < 1:
+		raise ValueError("'ncols' must be at least 1")
+
+	if "ax" in kwargs:
+		ax = kwargs.pop("ax")
+	else:  # pragma: no cover
+
+		# 3rd party
+		from matplotlib import pyplot  # type: ignore[import]
+		ax = pyplot.gca()
+
+	for key in ("labels", "colors", "labeldistance", "center", "frame"):
+		kwargs.pop(key, None)
+
+	radius = kwargs.get("radius") or 1
+	spacing = 2.5 * radius
+
+	data = {title: _tally_items(tally, top, other_label) for title, tally in tallies.items()}
+
+	# Colours are assigned from the most common element across all the pies to the least,
+	# with the remainder last.
+	overall: Counter = Counter()
+	for items in data.values():
+		for label, count in items:
+			overall[label] += count
+
+	order = [label for label, count in overall.most_common() if label != other_label]
+	if other_label in overall:
+		order.append(other_label)
+
+	cycle = rcParams["axes.prop_cycle"].by_key().get("color", ["C0"])
+	color_map: Dict[str, Any] = {}
+	for idx, label in enumerate(label for label in order if label not in (colors or {})):
+		color_map[label] = cycle[idx % len(cycle)]
+	color_map.update(colors or {})
+
+	pies: Dict[str, Tuple[List, ...]] = {}
+	handles: Dict[str, Wedge] = {}
+
+	for idx, (title, items) in enumerate(data.items()):
+		row, col = divmod(idx, ncols)
+		center = (col * spacing, -row * spacing)
+
+		if reverse:
+			items = items[::-1]
+
+		labels, sizes = zip(*items) if items else ((), ())
+
+		# labeldistance=None labels the wedges for the legend without drawing the labels.
+		pies[title] = tuple(
+				ax.pie(
+						sizes,
+						labels=labels,
+						colors=[color_map[label] for label in labels],
+						labeldistance=None,
+						center=center,
+						**kwargs,
+						)
+				)
+
+		for label, wedge in zip(labels, pies[title][0]):
+			handles.setdefault(label, wedge)
+
+		ax.text(
+				center[0],
+				center[1] + 1.05 * radius,
+				title,
+				ha="center",
+				va="bottom",
+				fontsize=rcParams["axes.titlesize"],
+				)
+
+	nrows = max(math.ceil(len(data) / ncols), 1)
+	ax.set_xlim(-spacing / 2, (min(len(data), ncols) - 0.5) * spacing)
+	ax.set_ylim(-(nrows - 0.5) * spacing, spacing / 2)
+	ax.set_aspect("equal")
+	ax.set_axis_off()
+
+	if legend and handles:
+		horizontal_legend(
+				ax.figure,
+				[handles[label] for label in order],
+				order,
+				deduplicate=False,
+				**{"ncol": min(len(order), ncols), "loc": "lower center", **(legend_kwargs or {})},
+				)
+
+	return pies
+
+
+class LivePie:
+	r"""
+	A pie chart of a :class:`cawdrey.tally.Tally` which can be updated in place as the tally changes.
+
+	On each update the existing wedges and labels are moved and relabelled,
+	and wedges are only created or removed for elements which have appeared in or disappeared from the chart.
+	Each element keeps the same colour for the life of the chart.
+
+	.. code-block:: python
+
+		pie = LivePie(Tally(), top=10, autopct="%1.1f%%", ax=ax, animated=True)
+
+		def update(frame):
+			return pie.add(fetch_new_events())
+
+		FuncAnimation(fig, update, blit=True)
+
+	Using ``top`` keeps the time taken by each update bounded, however many distinct elements the tally has.
+
+	:param tally: The initial tally. The :class:`~.LivePie` keeps a reference to it, and updates it in :meth:`~.add`.
+	:param explode: A list of key names to explode the segments for.
+	:param reverse: Order the wedges clockwise rather than anticlockwise.
+	:param top: Show only the ``top`` most common elements, with the remainder combined into a single wedge.
+	:param other_label: The label for the wedge combining the elements not in the ``top`` most common.
+	:param autopct: A format string, or a function taking the percentage, for the numeric label on each wedge.
+	:param colors: Mapping of elements to colours.
+		Other elements are given the colours of the ``axes.prop_cycle`` in turn, in the order they first appear.
+	:param startangle: The angle, in degrees, of the start of the first wedge, anticlockwise from the x-axis.
+	:param counterclock: Place the wedges anticlockwise.
+	:param radius:
+	:param center: The position of the centre of the pie.
+	:param labeldistance: The distance of the labels from the centre, relative to the radius.
+		If :py:obj:`None` the labels are not drawn, but are still used for a legend.
+	:param pctdistance: The distance of the numeric labels from the centre, relative to the radius.
+	:param wedgeprops: Properties for the wedges.
+	:param textprops: Properties for the labels and numeric labels.
+	:param animated: Whether the artists are animated, for use with blitting.
+	:param \*\*kwargs: The ``ax`` to draw the pie on. If not given the current :mod:`~matplotlib.pyplot` axes is used.
+
+	.. versionadded:: 0.5.0
+	"""
+
+	#: The tally shown in the chart.
+	tally: Tally[str]
+
+	#: The wedges, in the order they are drawn around the pie.
+	wedges: List[Wedge]
+
+	#: The labels, in the same order as the wedges.
+	texts: List[Text]
+
+	#: The numeric labels, in the same order as the wedges, if ``autopct`` was given.
+	autotexts: List[Text]
+
+	def __init__(
+			self,
+			tally: Tally[str],
+			explode: Collection[str] = (),
+			*,
+			reverse: bool = False,
+			top: Optional[int] = None,
+			other_label: str = "Other",
+			autopct: Union[str, Callable[[float], str], None] = None,
+			colors: Optional[Mapping[str, Any]] = None,
+			startangle: float = 0,
+			counterclock: bool = True,
+			radius: float = 1,
+			center: Tuple[float, float] = (0, 0),
+			labeldistance: Optional[float] = 1.1,
+			pctdistance: float = 0.6,
+			wedgeprops: Optional[Dict[str, Any]] = None,
+			textprops: Optional[Dict[str, Any]] = None,
+			animated: bool = False,
+			**kwargs,
+			):
+
+		if top is not None and top < 1:
+			raise ValueError("'top' must be at least 1")
+
+		if "ax" in kwargs:
+			self.ax = kwargs.pop("ax")
+		else:  # pragma: no cover
+
+			# 3rd party
+			from matplotlib import pyplot  # type: ignore[import]
+			self.ax = pyplot.gca()
+
+		if kwargs:
+			raise TypeError(f"Unexpected keyword arguments: {', '.join(map(repr, kwargs))}")
+
+		self.tally = tally
+		self.explode = explode
+		self.reverse = reverse
+		self.top = top
+		self.other_label = other_label
+		self.autopct = autopct
+		self.startangle = startangle
+		self.counterclock = counterclock
+		self.radius = radius
+		self.center = center
+		self.labeldistance = labeldistance
+		self.pctdistance = pctdistance
+		self.wedgeprops = wedgeprops or {}
+		self.textprops = textprops or {}
+		self.animated = animated
+
+		self.wedges = []
+		self.texts = []
+		self.autotexts = []
+		self._colors: Dict[str, Any] = dict(colors or {})
+		self._artists: Dict[str, Tuple[Wedge, Optional[Text], Optional[Text]]] = {}
+
+		self.ax.set(
+				frame_on=False,
+				xticks=[],
+				yticks=[],
+				xlim=(-1.25 + center[0], 1.25 + center[0]),
+				ylim=(-1.25 + center[1], 1.25 + center[1]),
+				)
+
+		self.update()
+
+	@property
+	def artists(self) -> List[Artist]:
+		"""
+		The wedges, labels and numeric labels currently in the chart.
+		"""
+
+		return [*self.wedges, *self.texts, *self.autotexts]
+
+	def add(self, events: Iterable[str]) -> List[Artist]:
+		"""
+		Count the given elements in the tally, and update the chart.
+
+		:param events:
+
+		:returns: The artists currently in the chart, for blitting.
+		"""
+
+		self.tally.update(events)
+		return self.update()
+
+	def update(self, tally: Optional[Tally[str]] = None) -> List[Artist]:
+		"""
+		Update the chart to show the current counts in the tally.
+
+		:param tally: A new tally to show. If :py:obj:`None` the existing tally is used.
+
+		:returns: The artists currently in the chart, for blitting.
+		"""
+
+		if tally is not None:
+			self.tally = tally
+
+		items = _tally_items(self.tally, self.top, self.other_label)
+		items = [(label, count) for label, count in items if count > 0]
+		if self.reverse:
+			items.reverse()
+
+		total = sum(count for label, count in items)
+
+		for label in set(self._artists) - {label for label, count in items}:
+			for artist in self._artists.pop(label):
+				if artist is not None:
+					artist.remove()
+
+		self.wedges, self.texts, self.autotexts = [], [], []
+		theta1 = self.startangle / 360
+
+		for label, count in items:
+			frac = count / total
+			theta2 = (theta1 + frac) if self.counterclock else (theta1 - frac)
+			thetam = math.pi * (theta1 + theta2)
+			expl = 0.1 if label in self.explode else 0.0
+			x = self.center[0] + expl * math.cos(thetam)
+			y = self.center[1] + expl * math.sin(thetam)
+
+			if label not in self._artists:
+				self._artists[label] = self._create_artists(label)
+
+			wedge, text, autotext = self._artists[label]
+			wedge.set_center((x, y))
+			wedge.set_theta1(360 * min(theta1, theta2))
+			wedge.set_theta2(360 * max(theta1, theta2))
+			self.wedges.append(wedge)
+
+			if text is not None:
+				assert self.labeldistance is not None
+				xt = x + self.labeldistance * self.radius * math.cos(thetam)
+				yt = y + self.labeldistance * self.radius * math.sin(thetam)
+				text.set_position((xt, yt))
+				text.set_horizontalalignment("left" if xt > 0 else "right")
+				self.texts.append(text)
+
+			if autotext is not None:
+				xt = x + self.pctdistance * self.radius * math.cos(thetam)
+				yt = y + self.pctdistance * self.radius * math.sin(thetam)
+				autotext.set_position((xt, yt))
+				if isinstance(self.autopct, str):
+					autotext.set_text(self.autopct % (100 * frac))
+				else:
+					autotext.set_text(self.autopct(100 * frac))  # type: ignore[misc]
+				self.autotexts.append(autotext)
+
+			theta1 = theta2
+
+		self.ax.stale = True
+		return self.artists
+
+	def _create_artists(self, label: str) -> Tuple[Wedge, Optional[Text], Optional[Text]]:
+		"""
+		Create the wedge, label and numeric label for an element which has appeared in the chart.
+
+		:param label:
+		"""
+
+		# 3rd party
+		from matplotlib import rcParams  # type: ignore[import]
+
+		if label not in self._colors:
+			cycle = rcParams["axes.prop_cycle"].by_key().get("color", ["C0"])
+			self._colors[label] = cycle[len(self._colors) % len(cycle)]
+
+		wedge = Wedge(self.center, self.radius, 0, 0, facecolor=self._colors[label], clip_on=False, label=label)
+		wedge.set(**self.wedgeprops)
+		wedge.set_animated(self.animated)
+		self.ax.add_patch(wedge)
+
+		text = autotext = None
+
+		if self.labeldistance is not None:
+			text = self.ax.text(
+					0,
+					0,
+					label,
+					clip_on=False,
+					verticalalignment="center",
+					fontsize=rcParams["xtick.labelsize"],
+					animated=self.animated,
+					)
+			text.set(**self.textprops)
+
+		if self.autopct is not None:
+			autotext = self.ax.text(
+					0,
+					0,
+					'',
+					clip_on=False,
+					horizontalalignment="center",
+					verticalalignment="center",
+					animated=self.animated,
+					)
+			autotext.set(**self.textprops)
+
+		return wedge, text, autotext
+
+
+def bar_from_tally(
+		tally: Tally[str],
+		*,
+		orientation: Literal["vertical", "horizontal"] = "vertical",
+		percent: bool = False,
+		reverse: bool = False,
+		top: Optional[int] = None,
+		other_label: str = "Other",
+		width: float = 0.8,
+		**kwargs,
+		) -> PolyCollection:
+	r"""
+	Construct a bar chart from :class:`cawdrey.tally.Tally`, from the most common element to the least.
+
+	The bars are drawn as a single :class:`~matplotlib.collections.PolyCollection`
+	rather than a :class:`~matplotlib.patches.Rectangle` for each bar,
+	so charts of tallies with thousands of elements are quick to draw and save.
+	Where there isn't room to label every bar without the labels overlapping, only every few bars are labelled.
+
+	:param tally:
+	:param orientation: Whether the bars are vertical, or horizontal.
+	:param percent: If :py:obj:`True`, shows the percentage of each element out of the sum of all elements.
+	:param reverse: Order the bars from the least common element to the most.
+	:param top: Show only the ``top`` most common elements, with the remainder combined into a single bar.
+	:param other_label: The label for the bar combining the elements not in the ``top`` most common.
+	:param width: The width of each bar.
+	:param \*\*kwargs: Other keyword arguments taken by :class:`~matplotlib.collections.PolyCollection`,
+		and the ``ax`` to draw the chart on. If ``ax`` is not given the current :mod:`~matplotlib.pyplot` axes is used.
+
+	.. versionadded:: 0.5.0
+	"""
+
+	# 3rd party
+	from matplotlib import rcParams  # type: ignore[import]
+
+	if top is not None and top < 1:
+		raise ValueError("'top' must be at least 1")
+
+	if orientation not in {"vertical", "horizontal"}:
+		raise ValueError(f"'orientation' must be 'vertical' or 'horizontal', not {orientation!r}")
+
+	if "ax" in kwargs:
+		ax = kwargs.pop("ax")
+	else:  # pragma: no cover
+
+		# 3rd party
+		from matplotlib import pyplot  # type: ignore[import]
+		ax = pyplot.gca()
+
+	data = _tally_items(tally, top, other_label)
+	if reverse:
+		data.reverse()
+
+	labels = [label for label, count in data]
+	values = numpy.fromiter((count for label, count in data), dtype=float, count=len(data))
+
+	if percent and len(values):
+		values /= tally.total
+
+	# The corners of each bar, anticlockwise from the bottom left for vertical bars.
+	positions = numpy.arange(len(values), dtype=float)
+	verts = numpy.empty((len(values), 4, 2))
+	verts[:, (0, 3), 0] = (positions - width / 2)[:, None]
+	verts[:, (1, 2), 0] = (positions + width / 2)[:, None]
+	verts[:, (0, 1), 1] = 0
+	verts[:, (2, 3), 1] = values[:, None]
+
+	if orientation == "horizontal":
+		verts = verts[..., ::-1]
+
+	if not any(key in kwargs for key in ("color", "facecolor", "facecolors")):
+		kwargs["facecolor"] = rcParams["axes.prop_cycle"].by_key().get("color", ["C0"])[0]
+
+	collection = PolyCollection(verts, closed=True, **kwargs)
+
+	if orientation == "vertical":
+		collection.sticky_edges.y.append(0)
+		category_axis = ax.xaxis
+	else:
+		collection.sticky_edges.x.append(0)
+		category_axis = ax.yaxis
+
+	ax.add_collection(collection, autolim=True)
+	ax.autoscale_view()
+
+	category_axis.set_major_locator(_CategoryLocator(labels))
+	category_axis.set_major_formatter(FuncFormatter(partial(_category_label, labels)))
+
+	return collection
+
+
+def _category_label(labels: List[str], x: float, pos: Optional[int] = None) -> str:
+	idx = int(round(x))
+	return labels[idx] if 0 <= idx < len(labels) else ''
+
+
+class _CategoryLocator(Locator):
+	"""
+	Places ticks on the bars of a :func:`~.bar_from_tally` chart,
+	skipping bars where there isn't room to label every bar without the labels overlapping.
+
+	:param labels: The label for each bar.
+	"""  # noqa: D400
+
+	def __init__(self, labels: List[str]):
+		self.labels = labels
+		self._longest = max(map(len, labels), default=0)
+
+	def __call__(self) -> numpy.ndarray:
+		vmin, vmax = sorted(self.axis.get_view_interval())
+		first = max(math.ceil(vmin), 0)
+		last = min(math.floor(vmax), len(self.labels) - 1)
+
+		if last < first:
+			return numpy.array([], dtype=float)
+
+		stride = self._stride(last - first + 1)
+
+		# Keep the labelled bars the same when the view is panned.
+		first = math.ceil(first / stride) * stride
+		return numpy.arange(first, last + 1, stride, dtype=float)
+
+	def _stride(self, visible: int) -> int:
+		"""
+		Returns how many bars there are for each label, so that the labels don't overlap.
+
+		:param visible: The number of bars in view.
+		"""
+
+		axes = self.axis.axes
+		name = self.axis.axis_name
+		length = axes.bbox.width if name == 'x' else axes.bbox.height
+
+		# The ticks share their label properties, and looking them up doesn't call the locator.
+		label = self.axis.majorTicks[0].label1
+		pixels = label.get_fontsize() * axes.figure.dpi / 72
+		rotated = abs(math.sin(math.radians(label.get_rotation()))) > 0.5
+
+		if (name == 'x') != rotated:
+			# An approximation of the width of the longest label.
+			spacing = pixels * (0.6 * self._longest + 1)
+		else:
+			spacing = pixels * 1.5
+
+		return max(math.ceil(visible * spacing / max(length, 1)), 1)
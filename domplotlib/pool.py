@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+#
+#  pool.py
+"""
+Reuse figures between plots, rather than creating a new figure for each one.
+
+.. versionadded:: 0.5.0
+"""
+#
+#  Copyright © 2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, NamedTuple, Tuple
+
+# 3rd party
+from domdf_python_tools.pagesizes import PageSize
+from matplotlib.axes import Axes  # type: ignore[import]
+from matplotlib.figure import Figure  # type: ignore[import]
+
+# this package
+from domplotlib import _agg_figure
+
+__all__ = ["FigurePool", "PoolStats"]
+
+_Size = Tuple[float, float]
+
+
+class PoolStats(NamedTuple):
+	"""
+	Statistics about the figures handed out by a :class:`~.FigurePool`.
+	"""
+
+	#: The number of figures created by the pool.
+	created: int
+
+	#: The number of times a figure was handed out again after being returned to the pool.
+	reused: int
+
+	#: The number of figures dropped by the pool, either because it was full or because they couldn't be reset.
+	discarded: int
+
+	#: The number of figures waiting in the pool to be handed out.
+	idle: int
+
+	#: The number of figures which have been handed out and not yet returned.
+	in_use: int
+
+
+class FigurePool:
+	"""
+	Hands out reusable figures with a single set of axes, in the same layout as :func:`~domplotlib.create_figure`.
+
+	When a figure is returned to the pool its axes and any artists added to the figure itself are removed.
+	When it is next handed out it is given new axes, its size and background are reset,
+	and its dpi, colours and layout engine are reset from :data:`matplotlib.rcParams`, as if it were a new figure.
+	Figures containing subfigures are discarded rather than reused.
+
+	The figures are not registered with :mod:`matplotlib.pyplot`, so they don't need to be closed,
+	and the memory used by a long running process stays flat however many plots it makes.
+
+	.. code-block:: python
+
+		pool = FigurePool()
+
+		for name, data in datasets.items():
+			with pool.create_figure(A4.inch) as (fig, ax):
+				ax.plot(data)
+				save_svg(fig, f"{name}.svg")
+
+	:param maxsize: The maximum number of idle figures to keep in the pool.
+		Figures returned to a full pool are discarded.
+	"""
+
+	def __init__(self, maxsize: int = 8):
+		self.maxsize = maxsize
+		self._idle: Dict[_Size, List[Figure]] = {}
+		self._in_use: Dict[int, Tuple[_Size, Figure]] = {}
+		self._created = 0
+		self._reused = 0
+		self._discarded = 0
+		self._lock = threading.Lock()
+
+	def __enter__(self) -> "FigurePool":
+		return self
+
+	def __exit__(self, *args) -> None:
+		self.clear()
+
+	def __len__(self) -> int:
+		return sum(map(len, self._idle.values()))
+
+	def __repr__(self) -> str:
+		return f"<{type(self).__name__}(maxsize={self.maxsize}, idle={len(self)}, in_use={len(self._in_use)})>"
+
+	@property
+	def stats(self) -> PoolStats:
+		"""
+		Statistics about the figures handed out by the pool.
+		"""
+
+		with self._lock:
+			return PoolStats(self._created, self._reused, self._discarded, len(self), len(self._in_use))
+
+	def acquire(
+			self,
+			pagesize: PageSize,
+			left: float = 0.2,
+			bottom: float = 0.14,
+			right: float = 0.025,
+			top: float = 0.13,
+			) -> Tuple[Figure, Axes]:
+		"""
+		Returns a figure with the given margins, and its axes, reusing a figure from the pool if one is available.
+
+		The figure must be returned to the pool with :meth:`~.FigurePool.release` once it is no longer needed.
+
+		:param pagesize:
+		:param left: Left margin
+		:param bottom: Bottom margin
+		:param right: Right margin
+		:param top: Top margin
+		"""
+
+		size: _Size = (float(pagesize[0]), float(pagesize[1]))
+
+		with self._lock:
+			idle = self._idle.get(size)
+
+			if idle:
+				fig = idle.pop()
+				self._reused += 1
+			else:
+				fig = None
+				self._created += 1
+
+		if fig is None:
+			fig = _agg_figure(size)
+		else:
+			_restore_defaults(fig, size)
+
+		# [left, bottom, width, height]
+		ax = fig.add_axes([left, bottom, 1 - left - right, 1 - top - bottom])
+
+		with self._lock:
+			self._in_use[id(fig)] = (size, fig)
+
+		return fig, ax
+
+	def release(self, figure: Figure) -> None:
+		"""
+		Return a figure to the pool once it is no longer needed.
+
+		:param figure: A figure returned by :meth:`~.FigurePool.acquire`.
+		"""
+
+		with self._lock:
+			if id(figure) not in self._in_use:
+				raise ValueError("The figure was not acquired from this pool.")
+
+			size, fig = self._in_use.pop(id(figure))
+			full = len(self) >= self.maxsize
+
+		reusable = not full and _empty_figure(fig)
+
+		with self._lock:
+			if reusable and len(self) < self.maxsize:
+				self._idle.setdefault(size, []).append(fig)
+			else:
+				self._discarded += 1
+
+	@contextmanager
+	def create_figure(
+			self,
+			pagesize: PageSize,
+			left: float = 0.2,
+			bottom: float = 0.14,
+			right: float = 0.025,
+			top: float = 0.13,
+			) -> Iterator[Tuple[Figure, Axes]]:
+		"""
+		Context manager to borrow a figure with the given margins from the pool,
+		returning a tuple of the figure and its axes.
+
+		The figure is returned to the pool when the context manager exits.
+
+		:param pagesize:
+		:param left: Left margin
+		:param bottom: Bottom margin
+		:param right: Right margin
+		:param top: Top margin
+		"""  # noqa: D400
+
+		fig, ax = self.acquire(pagesize, left, bottom, right, top)
+
+		try:
+			yield fig, ax
+		finally:
+			self.release(fig)
+
+	def clear(self) -> None:
+		"""
+		Discard the idle figures in the pool.
+
+		Figures which are in use can still be returned to the pool.
+		"""
+
+		with self._lock:
+			self._discarded += len(self)
+			self._idle.clear()
+
+
+def _empty_figure(fig: Figure) -> bool:
+	"""
+	Remove the axes and artists from ``fig``, ready for it to be reused.
+
+	Unlike :meth:`Figure.clear() <matplotlib.figure.Figure.clear>` the axes are not cleared before being removed,
+	as creating new axes is quicker.
+
+	:returns: Whether the figure can be reused.
+	"""
+
+	if getattr(fig, "subfigs", None):
+		return False
+
+	try:
+		for ax in fig.get_axes():
+			fig.delaxes(ax)
+
+		fig.artists = []
+		fig.lines = []
+		fig.patches = []
+		fig.texts = []
+		fig.images = []
+		fig.legends = []
+
+		if hasattr(fig.subplotpars, "reset"):  # matplotlib 3.7+
+			fig.subplotpars.reset()
+
+		for attr in ("_suptitle", "_supxlabel", "_supylabel"):
+			setattr(fig, attr, None)
+
+		fig.stale = True
+
+	except Exception:
+		return False
+
+	return True
+
+
+def _restore_defaults(fig: Figure, size: _Size) -> None:
+	"""
+	Reset the size and background of ``fig``, and the properties a new figure takes from :data:`matplotlib.rcParams`.
+	"""
+
+	# 3rd party
+	from matplotlib import rcParams  # type: ignore[import]
+	from matplotlib.patches import Rectangle  # type: ignore[import]
+
+	fig.set_size_inches(size, forward=False)
+
+	# The background may have been changed through fig.patch, so it is replaced as in Figure.__init__.
+	fig.patch = Rectangle(xy=(0, 0), width=1, height=1, linewidth=0.0, transform=fig.transFigure, in_layout=False)
+	fig._set_artist_props(fig.patch)
+	fig.patch.set_antialiased(False)
+
+	fig.set_dpi(rcParams["figure.dpi"])
+	fig.set_facecolor(rcParams["figure.facecolor"])
+	fig.set_edgecolor(rcParams["figure.edgecolor"])
+	fig.set_frameon(rcParams["figure.frameon"])
+
+	if hasattr(fig, "set_layout_engine"):  # matplotlib 3.6+
+		fig.set_layout_engine(None)
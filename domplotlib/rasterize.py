@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+#
+#  rasterize.py
+"""
+Rasterize artists which would make vector output too large.
+
+.. versionadded:: 0.5.0
+"""
+#
+#  Copyright © 2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import io
+from contextlib import contextmanager
+from typing import Iterator, List, NamedTuple
+
+# 3rd party
+from matplotlib.artist import Artist  # type: ignore[import]
+from matplotlib.collections import Collection, QuadMesh  # type: ignore[import]
+from matplotlib.figure import Figure  # type: ignore[import]
+from matplotlib.lines import Line2D  # type: ignore[import]
+from matplotlib.patches import Patch  # type: ignore[import]
+
+# this package
+from domplotlib.template import data_artists
+
+__all__ = ["RasterizeReport", "element_count", "rasterize_heavy_artists", "rasterize_report"]
+
+
+def element_count(artist: Artist) -> int:
+	"""
+	Returns the number of vertices or elements (such as scatter points) in ``artist``.
+
+	Only lines, patches and collections are counted. For any other artist ``0`` is returned.
+
+	:param artist:
+	"""
+
+	if isinstance(artist, QuadMesh):
+		rows, columns, _ = artist.get_coordinates().shape
+		return rows * columns
+
+	if isinstance(artist, Collection):
+		vertices = sum(len(path.vertices) for path in artist.get_paths())
+		return max(len(artist.get_offsets()), vertices)
+
+	if isinstance(artist, Line2D):
+		return len(artist.get_xydata())
+
+	if isinstance(artist, Patch):
+		return len(artist.get_path().vertices)
+
+	return 0
+
+
+@contextmanager
+def rasterize_heavy_artists(figure: Figure, threshold: int) -> Iterator[List[Artist]]:
+	"""
+	Context manager to temporarily rasterize the lines, patches and collections in the figure
+	with more than ``threshold`` vertices or elements.
+
+	In vector output (such as SVG) these artists are then drawn as an image at the saved dpi,
+	while the rest of the figure, including text and the axes, is still drawn as vectors.
+	Only the :func:`data artists <domplotlib.template.data_artists>` of each axes are considered,
+	so the backgrounds of the figure and axes, and the spines, are never rasterized.
+
+	The artists' original settings are restored on exit.
+
+	:param figure:
+	:param threshold:
+
+	:returns: A list of the artists which were rasterized.
+	"""  # noqa: D400
+
+	rasterized: List[Artist] = []
+
+	try:
+		for artist in data_artists(figure):
+			if artist.get_rasterized() or element_count(artist) <= threshold:
+				continue
+
+			rasterized.append(artist)
+			artist.set_rasterized(True)
+
+		yield list(rasterized)
+
+	finally:
+		for artist in rasterized:
+			artist.set_rasterized(False)
+
+
+class _ByteCounter(io.RawIOBase):
+	"""
+	Binary stream which discards its input, counting the number of bytes written.
+	"""
+
+	def __init__(self):
+		super().__init__()
+		self.size = 0
+
+	def writable(self) -> bool:  # noqa: D102
+		return True
+
+	def write(self, b) -> int:  # noqa: D102
+		size = memoryview(b).nbytes
+		self.size += size
+		return size
+
+
+class RasterizeReport(NamedTuple):
+	"""
+	The effect of rasterizing the heavy artists in a figure.
+	"""
+
+	#: The artists which were rasterized.
+	artists: List[Artist]
+
+	#: The size of the SVG with every artist drawn as vectors, in bytes.
+	vector_size: int
+
+	#: The size of the SVG with the heavy artists rasterized, in bytes.
+	rasterized_size: int
+
+	@property
+	def saved(self) -> int:
+		"""
+		The number of bytes saved by rasterizing the artists.
+		"""
+
+		return self.vector_size - self.rasterized_size
+
+
+def rasterize_report(figure: Figure, threshold: int, **kwargs) -> RasterizeReport:
+	r"""
+	Returns a report of which artists in the figure :func:`~domplotlib.save_svg` would rasterize
+	for the given ``rasterize_threshold``, and how much smaller that makes the SVG.
+
+	The figure is rendered twice (once fully as vectors) without writing either SVG to disk.
+
+	:param figure:
+	:param threshold:
+	:param \*\*kwargs: Keyword arguments passed to :func:`~domplotlib.save_svg`.
+	"""  # noqa: D400
+
+	# this package
+	from domplotlib import save_svg
+
+	vector = _ByteCounter()
+	save_svg(figure, vector, **kwargs)
+
+	rasterized = _ByteCounter()
+	with rasterize_heavy_artists(figure, threshold) as artists:
+		save_svg(figure, rasterized, **kwargs)
+
+	return RasterizeReport(artists, vector.size, rasterized.size)
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+#
+#  report.py
+"""
+Build multi-page PDF reports, one figure per page, in constant memory.
+
+.. versionadded:: 0.5.0
+"""
+#
+#  Copyright © 2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import os
+from contextlib import contextmanager
+from functools import partial
+from typing import IO, Any, Dict, Iterator, Optional, Tuple, Union
+
+# 3rd party
+from domdf_python_tools.pagesizes import PageSize
+from domdf_python_tools.typing import PathLike
+from matplotlib.axes import Axes  # type: ignore[import]
+from matplotlib.figure import Figure  # type: ignore[import]
+
+# this package
+from domplotlib.pool import FigurePool
+
+__all__ = ["Report"]
+
+
+class Report:
+	r"""
+	Builds a multi-page PDF, with one figure per page.
+
+	Each page is written to the PDF as soon as it is finished, and its figure is reused for the next page,
+	so the memory used does not grow with the number of pages.
+	Images (including rasterized artists) are also written out after each page rather than when the PDF is closed.
+	Each font is embedded once, subsetted to the characters used on every page.
+
+	.. code-block:: python
+
+		with Report("report.pdf", A4.inch) as report:
+			for name, data in datasets.items():
+				with report.page() as (fig, ax):
+					ax.plot(data)
+					ax.set_title(name)
+
+	:param file: The file to write the PDF to, or a binary file-like object.
+	:param pagesize: The size of each page, in inches.
+	:param left: Left margin
+	:param bottom: Bottom margin
+	:param right: Right margin
+	:param top: Top margin
+	:param metadata: Information for the PDF's document information dictionary, such as ``'Title'``.
+	:param \*\*kwargs: Keyword arguments passed to :meth:`~matplotlib.figure.Figure.savefig` for each page.
+	"""
+
+	#: The number of pages written so far.
+	pages: int
+
+	def __init__(
+			self,
+			file: Union[PathLike, IO[bytes]],
+			pagesize: PageSize,
+			*,
+			left: float = 0.2,
+			bottom: float = 0.14,
+			right: float = 0.025,
+			top: float = 0.13,
+			metadata: Optional[Dict[str, Any]] = None,
+			**kwargs,
+			):
+
+		# 3rd party
+		from matplotlib.backends.backend_pdf import PdfPages  # type: ignore[import]
+
+		if isinstance(file, (str, os.PathLike)):
+			file = os.fspath(file)
+
+		self.pagesize = pagesize
+		self.margins = (left, bottom, right, top)
+		self.pages = 0
+		self._savefig_kwargs = kwargs
+		self._pool = FigurePool(maxsize=1)
+		self._pdf = PdfPages(file, metadata=metadata)
+		self._pdf_file: Optional[Any] = None
+
+	def __enter__(self) -> "Report":
+		return self
+
+	def __exit__(self, *args) -> None:
+		self.close()
+
+	def __repr__(self) -> str:
+		return f"<{type(self).__name__}(pages={self.pages})>"
+
+	@contextmanager
+	def page(self) -> Iterator[Tuple[Figure, Axes]]:
+		"""
+		Context manager to add a page to the report, returning a tuple of its figure and axes.
+
+		The page is written to the PDF when the context manager exits,
+		unless an exception was raised in which case it is left out.
+		The figure must not be used once the context manager has exited.
+		"""
+
+		with self._pool.create_figure(self.pagesize, *self.margins) as (fig, ax):
+			yield fig, ax
+			self.add_figure(fig)
+
+	def add_figure(self, figure: Figure) -> None:
+		"""
+		Add the given figure to the report as a new page.
+
+		:param figure:
+		"""
+
+		self._pdf.savefig(figure, **self._savefig_kwargs)
+		self.pages += 1
+
+		if self._pdf_file is None:
+			self._pdf_file = getattr(self._pdf, "_file", None)
+			_write_images_early(self._pdf_file)
+
+		if self._pdf_file is not None:
+			self._pdf_file.writeImages()
+
+	def close(self) -> None:
+		"""
+		Finish writing the PDF.
+		"""
+
+		self._pdf.close()
+		self._pool.clear()
+
+
+def _write_images_early(pdf_file: Any) -> None:
+	"""
+	Make ``pdf_file.writeImages()`` write the images drawn since it was last called,
+	rather than every image once the PDF is closed.
+
+	Matplotlib holds every image in memory until the PDF is closed.
+	The images can be written as soon as the page using them is finished,
+	as long as their names stay in the PDF's table of images.
+
+	:param pdf_file: A :class:`matplotlib.backends.backend_pdf.PdfFile`.
+	"""  # noqa: D400
+
+	# Relies on private attributes of PdfFile; the images are written when the PDF is closed if they are missing.
+	if not all(hasattr(pdf_file, attr) for attr in ("_images", "_unpack", "_writeImg", "reserveObject")):
+		return
+
+	pdf_file.writeImages = partial(_write_pending_images, pdf_file)
+
+
+def _write_pending_images(pdf_file: Any) -> None:
+	for key, (image, name, ob) in list(pdf_file._images.items()):
+		if image is None:
+			continue
+
+		data, adata = pdf_file._unpack(image)
+
+		if adata is not None:
+			smask_object = pdf_file.reserveObject("smask")
+			pdf_file._writeImg(adata, smask_object.id)
+		else:
+			smask_object = None
+
+		pdf_file._writeImg(data, ob.id, smask_object)
+
+		# The table of images is keyed by id(), so the written image is moved to a key which can't be reused.
+		del pdf_file._images[key]
+		pdf_file._images[("written", name)] = (None, name, ob)
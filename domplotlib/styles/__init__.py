@@ -3,6 +3,10 @@
 #  styles/__init__.py
 """
 Matplotlib styles.
+
+.. versionchanged:: 0.5.0
+
+	Added :func:`~.use` and :func:`~.context` to apply a style without importing :mod:`matplotlib.pyplot`.
 """
 #
 #  Copyright © 2020 Dominic Davis-Foster <dominic@davis-foster.co.uk>
@@ -26,6 +30,179 @@ Matplotlib styles.
 #  OR OTHER DEALINGS IN THE SOFTWARE.
 #
 
+# stdlib
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Mapping
+
+__all__ = ["available", "context", "rc_params", "use"]
+
+#: The names of the styles provided by domplotlib.
+available = ("default", "domdf")
+
+# matplotlib's rcParams are shared between threads.
+_lock = threading.RLock()
+
+
+class _ActiveContext:
+	"""
+	A :func:`~.context` which has been entered and not yet exited.
+	"""
+
+	def __init__(self, original: Dict[str, Any]):
+		#: The rcParams to restore when the context exits.
+		self.original = original
+
+
+#: The contexts which have been entered and not yet exited, from the first entered to the last.
+_active_contexts: List[_ActiveContext] = []
+
+
+def _default_params() -> Dict[str, Any]:
+	"""
+	Returns matplotlib's default rcParams, without those which a style may not set (such as the backend).
+	"""
+
+	# 3rd party
+	import matplotlib  # type: ignore[import]
+
+	try:
+		# 3rd party
+		from matplotlib.style import _STYLE_BLACKLIST as blacklist  # type: ignore[import]
+	except ImportError:  # pragma: no cover (<mpl311)
+		# 3rd party
+		from matplotlib.style.core import STYLE_BLACKLIST as blacklist  # type: ignore[import]
+
+	return {key: value for key, value in dict.items(matplotlib.rcParamsDefault) if key not in blacklist}
+
+
+@lru_cache(maxsize=None)
+def rc_params(style: str) -> Mapping[str, Any]:
+	"""
+	Returns the rcParams which make up the given style.
+
+	The mapping contains every rcParam a style may set, not just those in the style's file.
+	It starts from matplotlib's defaults (:py:data:`matplotlib.rcParamsDefault`), without the backend
+	and the other rcParams which styles can't set, and the style's own rcParams are applied on top.
+
+	The style is read the first time it is requested, and the same read-only mapping is returned thereafter.
+
+	:param style: The name of the style. One of :py:data:`~.available`.
+
+	.. versionadded:: 0.5.0
+	"""
+
+	# 3rd party
+	import matplotlib  # type: ignore[import]
+
+	if style not in available:
+		raise ValueError(f"Unknown style {style!r}. The available styles are {', '.join(available)}.")
+
+	params = _default_params()
+
+	if style == "domdf":
+		# 3rd party
+		from domdf_python_tools.compat import importlib_resources
+
+		with importlib_resources.path("domplotlib.styles", "domdf.mplstyle") as mystyle:
+			style_params = matplotlib.rc_params_from_file(str(mystyle), use_default_template=False)
+			params.update(dict.items(style_params))
+
+	return MappingProxyType(params)
+
+
+def use(style: str) -> None:
+	"""
+	Configure matplotlib to use the given style.
+
+	Unlike importing one of the style modules this doesn't import :mod:`matplotlib.pyplot` or :mod:`tkinter`,
+	and leaves the backend alone, so it is safe to use on machines without a display.
+
+	.. attention::
+
+		This applies every rcParam from :func:`~.rc_params`, so rcParams which the style doesn't set
+		are reset to matplotlib's defaults, discarding any changes made to them before.
+		Importing :mod:`domplotlib.styles.domdf` instead applies only the rcParams in the style's file.
+
+	:param style: The name of the style. One of :py:data:`~.available`.
+
+	.. versionadded:: 0.5.0
+	"""
+
+	# 3rd party
+	import matplotlib  # type: ignore[import]
+
+	params = rc_params(style)
+
+	with _lock:
+		# The values were validated when the style was read.
+		dict.update(matplotlib.rcParams, params)
+
+
+@contextmanager
+def context(style: str) -> Iterator[None]:
+	"""
+	Context manager to use the given style, restoring the previous style when it exits.
+
+	.. code-block:: python
+
+		with styles.context("domdf"):
+			fig = create_figure(A5, headless=True)
+			save_svg(fig, "plot.svg")
+
+	The style is cached by :func:`~.rc_params`, so switching between styles is cheap
+	enough to create each figure in a different style.
+
+	Contexts may be nested, or overlap within a thread (for example in :mod:`asyncio` tasks
+	which await inside a context). Each context's changes are undone when it exits, even if it
+	exits before a context entered after it. The innermost style stays in use until that context exits.
+
+	.. attention::
+
+		matplotlib's rcParams are global, so the style isn't thread-local.
+		Contexts entered in different threads overlap in the same way as those within a thread,
+		so every thread sees the style of the most recently entered context which hasn't yet exited.
+		The rcParams from before the first context are restored once all of them have exited.
+		To render figures in different styles in parallel, use a different process for each style.
+
+	:param style: The name of the style. One of :py:data:`~.available`.
+
+	.. versionadded:: 0.5.0
+	"""
+
+	# 3rd party
+	import matplotlib  # type: ignore[import]
+
+	params = rc_params(style)
+
+	# The lock is only held while the rcParams are swapped, not while inside the context,
+	# so work inside the context can be handed to other threads which also use contexts.
+	with _lock:
+		# dict.copy would go through RcParams.__getitem__ for each key.
+		original = dict(dict.items(matplotlib.rcParams))
+		original.pop("backend", None)
+
+		active = _ActiveContext(original)
+		_active_contexts.append(active)
+		dict.update(matplotlib.rcParams, params)
+
+	try:
+		yield
+	finally:
+		with _lock:
+			idx = next(idx for idx, other in enumerate(_active_contexts) if other is active)
+			del _active_contexts[idx]
+
+			if idx < len(_active_contexts):
+				# A context entered after this one is still active, and its style stays in use.
+				# When that context exits it restores the rcParams from before this one was entered.
+				_active_contexts[idx].original = active.original
+			else:
+				dict.update(matplotlib.rcParams, active.original)
+
+
 # print(plt.style.available)
 
 # Good combinations
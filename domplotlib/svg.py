@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+#
+#  svg.py
+"""
+Streaming helpers for writing SVG files.
+
+.. versionadded:: 0.5.0
+"""
+#
+#  Copyright © 2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import codecs
+import io
+import math
+import re
+from typing import IO, Dict, List, Match, Optional
+from xml.sax.saxutils import escape, unescape
+
+__all__ = ["CleanWriter", "CompactWriter", "default_precision", "text_stream"]
+
+_tag_re = re.compile(r"<[^<>]*>|[^<>]+")
+_tag_name_re = re.compile(r"<(/?)([\w:.-]+)")
+_attribute_re = re.compile(r'([\w:.-]+)="([^"]*)"')
+_number_re = re.compile(r"-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_translate_re = re.compile(r"translate\(([^)]*)\)")
+_path_whitespace_re = re.compile(r"(?:\s|&#10;|&#xA;)+")
+_path_command_re = re.compile(r" ?([A-Za-z]) ?")
+
+#: Attributes whose values are coordinates or lengths, and which are rounded by :class:`~.CompactWriter`.
+_numeric_attributes = frozenset({
+		'd',
+		'x',
+		'y',
+		"x1",
+		"y1",
+		"x2",
+		"y2",
+		"cx",
+		"cy",
+		'r',
+		"rx",
+		"ry",
+		"width",
+		"height",
+		"points",
+		})
+
+#: Elements whose content is kept exactly as written by :class:`~.CompactWriter`.
+_verbatim_elements = frozenset({"text", "style", "title", "desc"})
+
+_attribute_entities = {"&quot;": '"', "&apos;": "'"}
+
+
+def text_stream(fp: IO) -> IO[str]:
+	"""
+	Returns a text stream for ``fp``, wrapping it in a UTF-8 writer if it only accepts bytes.
+
+	:param fp:
+	"""
+
+	try:
+		fp.write('')
+	except TypeError:
+		return codecs.getwriter("UTF-8")(fp)  # type: ignore[return-value]
+	else:
+		return fp
+
+
+class CleanWriter(io.TextIOBase):
+	"""
+	Text stream which strips trailing whitespace from each line as it is written.
+
+	Trailing blank lines are dropped and the output ends with a single newline,
+	giving the same output as :func:`domdf_python_tools.paths.clean_writer`
+	without first holding the whole document in memory.
+
+	Only the current, incomplete line is buffered.
+	The remainder of the line is written when the stream is closed.
+	Closing the :class:`~.CleanWriter` does not close ``fp``.
+
+	:param fp: The text stream to write the cleaned output to.
+	"""
+
+	def __init__(self, fp: IO[str]):
+		super().__init__()
+		self._fp = fp
+		self._partial: List[str] = []
+		self._blank_lines = 0
+
+	def writable(self) -> bool:  # noqa: D102
+		return True
+
+	def write(self, s: str) -> int:
+		"""
+		Write ``s`` to the stream, stripping trailing whitespace from any lines it completes.
+
+		:param s:
+
+		:returns: The number of characters written.
+		"""
+
+		if self.closed:
+			raise ValueError("I/O operation on closed file.")
+		if not isinstance(s, str):
+			raise TypeError(f"write() argument must be str, not {type(s).__name__}")
+
+		*complete, tail = s.split('\n')
+
+		if complete:
+			self._partial.append(complete[0])
+			complete[0] = ''.join(self._partial)
+			self._partial = []
+			self._write_lines(complete)
+
+		if tail:
+			self._partial.append(tail)
+
+		return len(s)
+
+	def _write_lines(self, lines: List[str]) -> None:
+		output = []
+
+		for line in lines:
+			line = line.rstrip()
+			if line:
+				if self._blank_lines:
+					output.append('\n' * self._blank_lines)
+					self._blank_lines = 0
+				output.append(line)
+				output.append('\n')
+			else:
+				# Deferred until the next non-blank line, so trailing blank lines are dropped.
+				self._blank_lines += 1
+
+		if output:
+			self._fp.write(''.join(output))
+
+	def close(self) -> None:
+		"""
+		Write the final line to the underlying stream and close the :class:`~.CleanWriter`.
+		"""
+
+		if not self.closed:
+			try:
+				if self._partial:
+					self._write_lines([''.join(self._partial)])
+					self._partial = []
+			finally:
+				super().close()
+
+
+def default_precision(dpi: float) -> int:
+	"""
+	Returns the number of decimal places needed for coordinates to be accurate to
+	within a twentieth of a pixel when the SVG is displayed at ``dpi``.
+
+	SVG coordinates are in points (1/72 inch).
+
+	:param dpi:
+	"""  # noqa: D400
+
+	return max(0, math.ceil(math.log10(dpi / 7.2)))
+
+
+def _format_number(match: Match[str], precision: int) -> str:
+	number = f"{round(float(match.group()), precision):.{precision}f}"
+
+	if '.' in number:
+		number = number.rstrip('0').rstrip('.')
+
+	if number == "-0":
+		return '0'
+
+	return number
+
+
+class CompactWriter(io.TextIOBase):
+	"""
+	Text stream which makes SVG output from matplotlib more compact as it is written.
+
+	* Coordinates are rounded to ``precision`` decimal places.
+	* Indentation and comments are removed, and path data is written without redundant whitespace.
+	* Repeated ``style`` attributes are replaced with CSS classes,
+	  which are defined in a ``<style>`` element at the end of the document.
+	* Definitions (such as markers) which are identical to an earlier one are dropped,
+	  and references to them point to the earlier definition instead.
+
+	Elements are processed as soon as their closing ``>`` is written,
+	so only the element currently being written is held in memory.
+	The output is written to ``fp`` with one element per line.
+	Closing the :class:`~.CompactWriter` does not close ``fp``.
+
+	:param fp: The text stream to write the compacted output to.
+	:param precision: The number of decimal places to round coordinates to.
+	"""
+
+	def __init__(self, fp: IO[str], precision: int = 2):
+		super().__init__()
+		self._fp = fp
+		self.precision = precision
+
+		self._partial: List[str] = []
+		self._verbatim_depth = 0
+		self._defs_depth = 0
+		self._pending_defs: Optional[str] = None
+		self._at_line_start = True
+
+		#: Mapping of style attribute values to CSS class names.
+		self._classes: Dict[str, str] = {}
+
+		#: Mapping of definitions (without their ``id``) to the ``id`` of the first such definition.
+		self._definitions: Dict[str, str] = {}
+
+		#: Mapping of the ``id`` of dropped definitions to the ``id`` of the definition which replaced them.
+		self._aliases: Dict[str, str] = {}
+
+	def writable(self) -> bool:  # noqa: D102
+		return True
+
+	def write(self, s: str) -> int:
+		"""
+		Write ``s`` to the stream, compacting any elements it completes.
+
+		:param s:
+
+		:returns: The number of characters written.
+		"""
+
+		if self.closed:
+			raise ValueError("I/O operation on closed file.")
+		if not isinstance(s, str):
+			raise TypeError(f"write() argument must be str, not {type(s).__name__}")
+
+		end = s.rfind('>')
+
+		if end == -1:
+			self._partial.append(s)
+		else:
+			self._partial.append(s[:end + 1])
+			self._process(''.join(self._partial))
+			self._partial = [s[end + 1:]] if end + 1 < len(s) else []
+
+		return len(s)
+
+	def _process(self, string: str) -> None:
+		output: List[str] = []
+
+		for token in _tag_re.findall(string):
+			if token[0] != '<':
+				if self._verbatim_depth:
+					self._emit(output, token)
+				elif token.isspace():
+					self._newline(output)
+				else:
+					self._emit(output, token)
+			elif token.startswith("<!--"):
+				if self._verbatim_depth:
+					self._emit(output, token)
+			else:
+				self._process_tag(output, token)
+
+		if output:
+			self._fp.write(''.join(output))
+
+	def _emit(self, output: List[str], token: str) -> None:
+		if self._pending_defs is not None:
+			output.append(self._pending_defs)
+			output.append('\n')
+			self._pending_defs = None
+
+		output.append(token)
+		self._at_line_start = token[-1] == '\n'
+
+	def _newline(self, output: List[str]) -> None:
+		if not self._at_line_start:
+			output.append('\n')
+			self._at_line_start = True
+
+	def _process_tag(self, output: List[str], tag: str) -> None:
+		match = _tag_name_re.match(tag)
+		if match is None:
+			# Processing instructions and the DOCTYPE.
+			self._emit(output, tag)
+			return
+
+		closing, name = bool(match.group(1)), match.group(2)
+		self_closing = tag.endswith("/>")
+
+		if closing:
+			if name in _verbatim_elements:
+				self._verbatim_depth -= 1
+			elif name == "defs":
+				self._defs_depth -= 1
+				if self._pending_defs is not None:
+					# All the definitions were duplicates.
+					self._pending_defs = None
+					return
+			elif name == "svg":
+				self._write_classes(output)
+
+			self._emit(output, tag)
+			return
+
+		if name in _verbatim_elements:
+			if not self_closing:
+				self._verbatim_depth += 1
+			self._emit(output, tag)
+			return
+
+		if name != "svg":
+			tag = self._compact_tag(tag)
+
+		if name == "defs" and not self_closing:
+			self._defs_depth += 1
+			self._pending_defs = tag
+			return
+
+		if self._defs_depth and self_closing and not self._verbatim_depth:
+			element_id = _get_attribute(tag, "id")
+			if element_id is not None:
+				key = tag.replace(f' id="{element_id}"', '', 1)
+				if key in self._definitions:
+					self._aliases[element_id] = self._definitions[key]
+					return
+				self._definitions[key] = element_id
+
+		self._emit(output, tag)
+
+	def _compact_tag(self, tag: str) -> str:
+		has_class = _get_attribute(tag, "class") is not None
+
+		def replace_attribute(match: Match[str]) -> str:
+			name, value = match.groups()
+
+			if name == 'd':
+				value = _number_re.sub(self._format_number, value)
+				value = _path_whitespace_re.sub(' ', value).strip()
+				value = _path_command_re.sub(r"\1", value).replace(" -", '-')
+			elif name in _numeric_attributes:
+				value = _number_re.sub(self._format_number, value)
+			elif name == "transform":
+				value = _translate_re.sub(
+						lambda m: f"translate({_number_re.sub(self._format_number, m.group(1))})",
+						value,
+						)
+			elif name in {"xlink:href", "href"} and value[1:] in self._aliases:
+				value = f"#{self._aliases[value[1:]]}"
+			elif name == "style" and not has_class:
+				if value not in self._classes:
+					self._classes[value] = f"s{len(self._classes):x}"
+				return f'class="{self._classes[value]}"'
+
+			return f'{name}="{value}"'
+
+		return _attribute_re.sub(replace_attribute, tag)
+
+	def _format_number(self, match: Match[str]) -> str:
+		return _format_number(match, self.precision)
+
+	def _write_classes(self, output: List[str]) -> None:
+		if not self._classes:
+			return
+
+		rules = ''.join(
+				f".{class_name}{{{escape(unescape(style, _attribute_entities))}}}"
+				for style, class_name in self._classes.items()
+				)
+
+		self._newline(output)
+		self._emit(output, f'<defs>\n<style type="text/css">{rules}</style>\n</defs>\n')
+
+	def close(self) -> None:
+		"""
+		Write any remaining output to the underlying stream and close the :class:`~.CompactWriter`.
+		"""
+
+		if not self.closed:
+			try:
+				if self._partial:
+					self._process(''.join(self._partial))
+					self._partial = []
+			finally:
+				super().close()
+
+
+def _get_attribute(tag: str, name: str) -> Optional[str]:
+	for match in _attribute_re.finditer(tag):
+		if match.group(1) == name:
+			return match.group(2)
+
+	return None
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+#
+#  template.py
+"""
+Re-render a figure with a fixed layout for many datasets, serializing only the artists which change.
+
+.. versionadded:: 0.5.0
+"""
+#
+#  Copyright © 2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import io
+import re
+from contextlib import ExitStack, contextmanager
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+# 3rd party
+from domdf_python_tools.typing import PathLike
+from matplotlib.artist import Artist  # type: ignore[import]
+from matplotlib.figure import Figure  # type: ignore[import]
+from typing_extensions import Literal
+
+# this package
+from domplotlib import _open_svg, _resolve_compresslevel, _resolve_dpi, _svg_writer
+from domplotlib.svg import default_precision
+
+__all__ = ["SvgTemplate", "data_artists"]
+
+_sentinel_re = re.compile(r"^( *)<!-- domplotlib-template-(\d+)-(start|end) -->\n", re.MULTILINE)
+_defs_re = re.compile(r"^ *<defs>\n.*?^ *</defs>\n", re.MULTILINE | re.DOTALL)
+_definition_re = re.compile(
+		r'^ *<([\w:]+) [^>]*?\bid="([^"]*)"(?:[^>]*?/>|[^>]*>.*?</\1>)\n',
+		re.MULTILINE | re.DOTALL,
+		)
+_id_re = re.compile(r'\bid="([^"]*)"')
+
+
+def data_artists(figure: Figure) -> List[Artist]:
+	"""
+	Returns the artists in the figure which show data, and which are re-rendered by default by :class:`~.SvgTemplate`.
+
+	These are the lines, collections (such as scatter plots) and patches (such as bars) of each axes.
+
+	:param figure:
+	"""
+
+	artists: List[Artist] = []
+
+	for ax in figure.axes:
+		artists.extend(ax.lines)
+		artists.extend(ax.collections)
+		artists.extend(ax.patches)
+
+	return artists
+
+
+class _Fragment:
+	"""
+	Where a data artist was drawn in the template, and the state of the renderer at that point.
+	"""
+
+	def __init__(self):
+		#: The indentation of the artist's elements in the template.
+		self.indent = 0
+
+		#: The number of groups of each kind opened before the artist, used to name its groups.
+		self.groups: Dict[str, int] = {}
+
+		#: The number of path collections drawn before the artist, used to name their definitions.
+		self.path_collections = 0
+
+
+@contextmanager
+def _mark_draws(artists: Sequence[Artist], fragments: Sequence[_Fragment]) -> Iterator[None]:
+	"""
+	Context manager to write a comment to the SVG before and after each of the ``artists`` is drawn,
+	and to record the renderer's state in the corresponding fragment.
+
+	:param artists:
+	:param fragments:
+	"""  # noqa: D400
+
+	patched: List[Tuple[Artist, Any]] = []
+
+	def patch(idx: int, artist: Artist, draw: Callable) -> Callable:
+
+		def marked_draw(renderer, *args, **kwargs) -> Any:
+			if artist.get_rasterized() or not hasattr(renderer, "writer"):
+				raise ValueError(f"{artist!r} cannot be used in a template as it is rasterized.")
+
+			fragment = fragments[idx]
+			fragment.groups = dict(getattr(renderer, "_groupd", {}))
+			fragment.path_collections = getattr(renderer, "_path_collection_id", 0)
+
+			renderer.writer.comment(f"domplotlib-template-{idx}-start")
+			result = draw(renderer, *args, **kwargs)
+			renderer.writer.comment(f"domplotlib-template-{idx}-end")
+			return result
+
+		return marked_draw
+
+	try:
+		for idx, artist in enumerate(artists):
+			patched.append((artist, vars(artist).get("draw")))
+			artist.draw = patch(idx, artist, artist.draw)
+
+		yield
+
+	finally:
+		for artist, draw in patched:
+			if draw is None:
+				del artist.draw
+			else:
+				artist.draw = draw
+
+
+def _split(svg: str, count: int) -> Tuple[List[str], List[str], List[int], List[int]]:
+	"""
+	Split an SVG written with :func:`~._mark_draws` into the static parts and the fragments drawn by each artist.
+
+	:param svg:
+	:param count: The number of artists.
+
+	:returns: The ``count + 1`` static parts, the ``count`` fragments, the indentation of each fragment,
+		and the indices of the artists in the order they were drawn.
+	"""
+
+	static: List[str] = []
+	fragments: List[str] = [''] * count
+	indents: List[int] = [0] * count
+	drawn: List[int] = []
+
+	position = 0
+	start = 0
+
+	for match in _sentinel_re.finditer(svg):
+		idx = int(match.group(2))
+		if match.group(3) == "start":
+			static.append(svg[position:match.start()])
+			indents[idx] = len(match.group(1))
+			start = match.end()
+		else:
+			fragments[idx] = svg[start:match.start()]
+			drawn.append(idx)
+		position = match.end()
+
+	static.append(svg[position:])
+
+	if len(drawn) != count:
+		missing = sorted(set(range(count)).difference(drawn))
+		raise ValueError(f"The artists at indices {missing} were not drawn. Are they part of the figure?")
+
+	return static, fragments, indents, drawn
+
+
+def _drop_definitions(svg: str, ids: Set[str]) -> str:
+	"""
+	Remove definitions from ``<defs>`` elements in ``svg`` which have one of the given ``ids``.
+
+	``<defs>`` elements left empty are removed entirely.
+
+	:param svg:
+	:param ids:
+	"""
+
+	def replace_definition(match: "re.Match[str]") -> str:
+		return '' if match.group(2) in ids else match.group(0)
+
+	def replace_defs(match: "re.Match[str]") -> str:
+		defs = _definition_re.sub(replace_definition, match.group(0))
+		if defs.count('\n') == 2:
+			# Only the opening and closing tags are left.
+			return ''
+		return defs
+
+	return _defs_re.sub(replace_defs, svg)
+
+
+class SvgTemplate:
+	r"""
+	Renders the static parts of a figure (its axes, ticks, labels and legend) once,
+	so the figure can be saved many times with new data while only re-rendering the data-bearing artists.
+
+	The output is the same as :func:`~domplotlib.save_svg` would produce for the figure.
+
+	Create the template once the layout is final, then update the artists' data
+	(e.g. with :meth:`Line2D.set_data() <matplotlib.lines.Line2D.set_data>`) and call :meth:`~.save`:
+
+	.. code-block:: python
+
+		fig, ax = create_figure(A4)
+		line, = ax.plot(x, y0)
+		ax.set_ylim(0, 1)
+
+		template = SvgTemplate(fig)
+
+		for idx, y in enumerate(datasets):
+			line.set_ydata(y)
+			template.save(f"plot_{idx}.svg")
+
+	Nothing except the ``artists`` is re-rendered, so the axes limits, ticks, legend and any other
+	text must not depend on the new data. For example, autoscaling should be turned off,
+	and legends should not be placed with ``loc="best"``.
+
+	:param figure:
+	:param artists: The artists which are re-rendered for each new dataset.
+		If :py:obj:`None` the lines, collections and patches of each axes are used (see :func:`~.data_artists`).
+		These artists must not be rasterized.
+	:param dpi: The resolution in dots per inch. If ``'figure'``, use the figure's dpi value.
+	:param compact: If :py:obj:`True`, write a smaller SVG using a :class:`~domplotlib.svg.CompactWriter`.
+	:param precision: The number of decimal places to round coordinates to when ``compact`` is :py:obj:`True`.
+	:param \*\*kwargs: Additional keyword arguments passed to :meth:`~.Figure.savefig`
+		when rendering the static parts of the figure. ``bbox_inches`` is not supported.
+	"""  # noqa: D400
+
+	def __init__(
+			self,
+			figure: Figure,
+			artists: Optional[Sequence[Artist]] = None,
+			*,
+			dpi: Union[float, Literal["figure"], None] = None,
+			compact: bool = False,
+			precision: Optional[int] = None,
+			**kwargs,
+			):
+
+		if kwargs.get("bbox_inches") is not None:
+			raise ValueError("'bbox_inches' is not supported by SvgTemplate.")
+
+		self.figure = figure
+		self.artists: List[Artist] = list(data_artists(figure) if artists is None else artists)
+		self.dpi = _resolve_dpi(figure, dpi)
+
+		if not compact:
+			self.precision = None
+		elif precision is None:
+			self.precision = default_precision(self.dpi)
+		else:
+			self.precision = precision
+
+		fragments = [_Fragment() for _ in self.artists]
+		buffer = io.StringIO()
+
+		# The same defaults as save_svg, rather than those of savefig.
+		kwargs = {"facecolor": 'w', "edgecolor": 'w', **kwargs}
+
+		with _mark_draws(self.artists, fragments):
+			figure.savefig(buffer, format="svg", dpi=self.dpi, **kwargs)
+
+		static, drawn, indents, order = _split(buffer.getvalue(), len(self.artists))
+
+		for fragment, indent in zip(fragments, indents):
+			fragment.indent = indent
+
+		# Definitions in a fragment may be referenced by the static parts of the figure
+		# (e.g. a marker shared with the legend). These are kept for when they aren't redefined.
+		static_text = ''.join(static)
+		self._pinned: Dict[int, Tuple[Set[str], str]] = {}
+		for idx, fragment_text in enumerate(drawn):
+			referenced = {id_ for id_ in _id_re.findall(fragment_text) if f"#{id_}" in static_text}
+			if referenced:
+				self._pinned[idx] = (referenced, ''.join(_defs_re.findall(fragment_text)))
+
+		self._static = static
+		self._fragments = fragments
+		self._order = order
+		self._static_ids = set(_id_re.findall(''.join(static)))
+
+		# need this if 'transparent=True' to reset colors
+		figure.canvas.draw_idle()
+
+	def _render_artists(self) -> Tuple[List[str], str]:
+		"""
+		Render the template's artists.
+
+		:returns: The SVG for each artist, in the order they are drawn in the figure,
+			and any definitions (such as clip paths) which must be added at the end of the document.
+		"""
+
+		# 3rd party
+		from matplotlib.backends.backend_mixed import MixedModeRenderer  # type: ignore[import]
+		from matplotlib.backends.backend_svg import RendererSVG  # type: ignore[import]
+
+		figure = self.figure
+		buffer = io.StringIO()
+		original_dpi = figure.dpi
+
+		# As FigureCanvasSVG.print_svg
+		figure.dpi = 72
+		try:
+			width, height = figure.get_size_inches()
+			svg_renderer = RendererSVG(width * 72, height * 72, buffer, image_dpi=self.dpi)
+			renderer = MixedModeRenderer(figure, width, height, self.dpi, svg_renderer)
+
+			for idx in self._order:
+				fragment = self._fragments[idx]
+
+				# Give the artist's groups and definitions the same names as in the full figure.
+				if hasattr(svg_renderer, "_groupd"):
+					svg_renderer._groupd = dict(fragment.groups)
+				if hasattr(svg_renderer, "_path_collection_id"):
+					svg_renderer._path_collection_id = fragment.path_collections
+
+				svg_renderer.writer.comment(f"domplotlib-template-{idx}-start")
+				self.artists[idx].draw(renderer)
+				svg_renderer.writer.comment(f"domplotlib-template-{idx}-end")
+
+			renderer.finalize()
+		finally:
+			figure.dpi = original_dpi
+
+		svg = buffer.getvalue()
+		_, drawn, indents, _ = _split(svg, len(self.artists))
+
+		fragments = []
+		for idx in self._order:
+			fragment_text = _drop_definitions(drawn[idx], self._static_ids)
+			padding = ' ' * (self._fragments[idx].indent - indents[idx])
+			fragment_text = re.sub(r"^(?= *<)", padding, fragment_text, flags=re.MULTILINE)
+
+			if idx in self._pinned:
+				referenced, definitions = self._pinned[idx]
+				if not referenced.issubset(_id_re.findall(fragment_text)):
+					fragment_text = definitions + fragment_text
+
+			fragments.append(fragment_text)
+
+		# The clip paths etc. written when the renderer is finalized.
+		sentinels = list(_sentinel_re.finditer(svg))
+		if not sentinels:
+			return fragments, ''
+
+		trailer = svg[sentinels[-1].end():svg.rindex("</svg>")]
+		trailer = trailer[:trailer.rindex('\n') + 1]
+
+		return fragments, _drop_definitions(trailer, self._static_ids)
+
+	def save(self, fname: Union[PathLike, IO], *, compress: Union[bool, int, None] = None) -> None:
+		"""
+		Save the figure as an SVG, with the current data of the template's artists.
+
+		:param fname: The file to save the SVG as.
+		:param compress: Whether to compress the SVG with gzip as it is written.
+			May also be an integer from 0 to 9 giving the compression level (default 9).
+			If :py:obj:`None` the output is compressed if ``fname`` ends with ``.svgz``.
+		"""
+
+		fragments, trailer = self._render_artists()
+
+		*static, tail = self._static
+		end = tail.rindex("</svg>")
+		end = tail.rindex('\n', 0, end) + 1
+
+		with ExitStack() as stack:
+			fp = _open_svg(stack, fname, _resolve_compresslevel(fname, compress))
+			writer = _svg_writer(stack, fp, self.precision)
+
+			for static_text, fragment_text in zip(static, fragments):
+				writer.write(static_text)
+				writer.write(fragment_text)
+
+			writer.write(tail[:end])
+			writer.write(trailer)
+			writer.write(tail[end:])
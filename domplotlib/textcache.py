@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+#
+#  textcache.py
+"""
+A process-wide cache of text layouts, shared between figures.
+
+Matplotlib lays out each piece of text (tick labels, titles, legend labels etc.) every time a figure is drawn,
+measuring the text and looking up the metrics of its font.
+When many figures with the same style are saved, the same text is laid out over and over again.
+:func:`~.text_layout_cache` shares the layouts between every figure drawn while it is active.
+
+.. versionadded:: 0.5.0
+"""
+#
+#  Copyright © 2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Hashable, Iterator, List, Optional, Tuple
+
+# 3rd party
+from matplotlib.text import Text  # type: ignore[import]
+
+__all__ = ["TextLayoutCache", "default_text_cache", "text_layout_cache"]
+
+#: rcParams which affect the layout of text, besides the properties of the text itself.
+_rc_keys = (
+		"text.hinting",
+		"text.hinting_factor",
+		"text.kerning_factor",
+		"text.latex.preamble",
+		"mathtext.fontset",
+		"mathtext.fallback",
+		"mathtext.default",
+		"pdf.use14corefonts",
+		"ps.useafm",
+		)
+
+_GetLayout = Callable[[Text, Any], Tuple[Any, ...]]
+
+
+class TextLayoutCache:
+	"""
+	A size-bounded cache of text layouts, shared between figures.
+
+	Layouts are keyed by the string, its font properties, rotation and alignment, the figure's dpi,
+	the type of renderer and the rcParams which affect text layout.
+	They do not depend on the position of the text, so a tick label is laid out once for every figure.
+	When the cache holds more than ``maxsize`` layouts the least recently used are removed.
+
+	Use :func:`~.text_layout_cache` to install the cache.
+
+	:param maxsize: The maximum number of layouts to keep.
+	"""
+
+	#: The number of times a layout was found in the cache.
+	hits: int
+
+	#: The number of times text had to be laid out.
+	misses: int
+
+	def __init__(self, maxsize: int = 10_000):
+		self.maxsize = maxsize
+		self.hits = 0
+		self.misses = 0
+		self._entries: "OrderedDict[Hashable, Tuple[Any, ...]]" = OrderedDict()
+		self._lock = threading.Lock()
+
+	def __len__(self) -> int:
+		return len(self._entries)
+
+	def __repr__(self) -> str:
+		return f"<{type(self).__name__}(entries={len(self)}, hits={self.hits}, misses={self.misses})>"
+
+	@property
+	def hit_rate(self) -> float:
+		"""
+		The proportion of lookups which were found in the cache, or ``0.0`` if there have been none.
+		"""
+
+		total = self.hits + self.misses
+		return self.hits / total if total else 0.0
+
+	def clear(self) -> None:
+		"""
+		Remove every layout from the cache, and reset the hit and miss counters.
+		"""
+
+		with self._lock:
+			self._entries.clear()
+			self.hits = 0
+			self.misses = 0
+
+	def get_layout(self, text: Text, renderer: Any, get_layout: _GetLayout) -> Tuple[Any, ...]:
+		"""
+		Returns the layout of ``text``, calling ``get_layout(text, renderer)`` if it isn't in the cache.
+
+		:param text:
+		:param renderer:
+		:param get_layout: The uncached :meth:`matplotlib.text.Text._get_layout`.
+		"""
+
+		key = _layout_key(text, renderer)
+
+		if key is None:
+			return get_layout(text, renderer)
+
+		with self._lock:
+			layout = self._entries.get(key)
+
+			if layout is not None:
+				self.hits += 1
+				self._entries.move_to_end(key)
+
+		if layout is None:
+			layout = get_layout(text, renderer)
+
+			# FontProperties are mutable, so the stored key holds a copy.
+			key = (*key[:4], key[4].copy(), *key[5:])
+
+			with self._lock:
+				self.misses += 1
+				self._entries[key] = layout
+
+				while len(self._entries) > self.maxsize:
+					self._entries.popitem(last=False)
+
+		# The bounding box is mutable, so each caller gets its own.
+		bbox, lines, *rest = layout
+		return (bbox.frozen(), list(lines), *rest)
+
+
+def _layout_key(text: Text, renderer: Any) -> Optional[Hashable]:
+	"""
+	Returns the key for the layout of ``text``, or :py:obj:`None` if it can't be cached.
+
+	:param text:
+	:param renderer:
+	"""
+
+	# 3rd party
+	from matplotlib import rcParams  # type: ignore[import]
+
+	figure = text.figure
+
+	# Wrapped text depends on the position of the text within the figure.
+	if figure is None or text.get_wrap():
+		return None
+
+	# MixedModeRenderer measures text with whichever renderer is currently active.
+	measuring_renderer = getattr(renderer, "_renderer", renderer)
+
+	return (
+			type(measuring_renderer),
+			getattr(measuring_renderer, "dpi", None),
+			figure.dpi,
+			text.get_text(),
+			text.get_fontproperties(),
+			text.get_usetex(),
+			getattr(text, "_parse_math", True),
+			text.get_rotation(),
+			text.get_rotation_mode(),
+			text.get_horizontalalignment(),
+			text.get_verticalalignment(),
+			text._multialignment,
+			text._linespacing,
+			tuple(rcParams[name] for name in _rc_keys if name in rcParams),
+			)
+
+
+_default_cache: Optional[TextLayoutCache] = None
+_active_caches: List[TextLayoutCache] = []
+_original_get_layout: Optional[_GetLayout] = None
+_install_lock = threading.Lock()
+
+
+def default_text_cache() -> TextLayoutCache:
+	"""
+	Returns the :class:`~.TextLayoutCache` used by :func:`~.text_layout_cache` when no cache is given.
+	"""
+
+	global _default_cache
+
+	with _install_lock:
+		if _default_cache is None:
+			_default_cache = TextLayoutCache()
+		return _default_cache
+
+
+def _cached_get_layout(self: Text, renderer: Any) -> Tuple[Any, ...]:
+	assert _original_get_layout is not None
+
+	try:
+		cache = _active_caches[-1]
+	except IndexError:
+		return _original_get_layout(self, renderer)
+
+	return cache.get_layout(self, renderer, _original_get_layout)
+
+
+@contextmanager
+def text_layout_cache(cache: Optional[TextLayoutCache] = None) -> Iterator[TextLayoutCache]:
+	"""
+	Context manager to share text layouts between every figure drawn in this process until it exits.
+
+	.. code-block:: python
+
+		with text_layout_cache() as cache:
+			for figure, fname in figures:
+				save_svg(figure, fname)
+
+		print(f"{cache.hit_rate:.0%} of text layouts were reused")
+
+	The context manager may be nested, in which case the innermost cache is used.
+
+	:param cache: The cache to use. If :py:obj:`None` the :func:`~.default_text_cache` is used.
+
+	:returns: The cache.
+	"""
+
+	global _original_get_layout
+
+	if cache is None:
+		cache = default_text_cache()
+
+	with _install_lock:
+		if not _active_caches:
+			_original_get_layout = Text._get_layout
+			Text._get_layout = _cached_get_layout
+		_active_caches.append(cache)
+
+	try:
+		yield cache
+	finally:
+		with _install_lock:
+			_active_caches.remove(cache)
+			if not _active_caches:
+				Text._get_layout = _original_get_layout
+				_original_get_layout = None
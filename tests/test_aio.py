@@ -0,0 +1,142 @@
+# stdlib
+import asyncio
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, List
+from unittest import mock
+
+# 3rd party
+import matplotlib  # type: ignore[import]
+import pytest
+from domdf_python_tools.paths import PathPlus
+
+# this package
+import domplotlib.aio
+from domplotlib import asave_many, asave_svg, save_svg
+from domplotlib.batch import SaveResult
+from tests.plots import h_bar_chart, koch_snowflake
+
+
+def run(coro: Any) -> Any:
+	loop = asyncio.new_event_loop()
+	try:
+		return loop.run_until_complete(coro)
+	finally:
+		loop.close()
+
+
+class ConcurrencyCounter:
+
+	def __init__(self, delay: float = 0.05):
+		self.delay = delay
+		self.lock = threading.Lock()
+		self.active = 0
+		self.max_active = 0
+		self.calls: List[Any] = []
+
+	def __call__(self, figure, fname, **kwargs):
+		with self.lock:
+			self.active += 1
+			self.max_active = max(self.max_active, self.active)
+			self.calls.append(fname)
+
+		time.sleep(self.delay)
+
+		with self.lock:
+			self.active -= 1
+
+
+def test_asave_svg(tmp_pathplus: PathPlus):
+	with matplotlib.rc_context({"svg.hashsalt": "domplotlib"}):
+		fig, ax = koch_snowflake()
+		save_svg(fig, tmp_pathplus / "expected.svg", metadata={"Date": None})
+
+		with ThreadPoolExecutor(2) as executor:
+			run(asave_svg(fig, tmp_pathplus / "actual.svg", executor=executor, metadata={"Date": None}))
+
+	assert (tmp_pathplus / "actual.svg").read_bytes() == (tmp_pathplus / "expected.svg").read_bytes()
+
+
+def test_asave_svg_process_pool(tmp_pathplus: PathPlus):
+	fig, ax = koch_snowflake()
+
+	with ProcessPoolExecutor(1) as executor:
+		with pytest.raises(TypeError, match="Figures can only be rendered in a thread pool, not a process pool."):
+			run(asave_svg(fig, tmp_pathplus / "plot.svg", executor=executor))
+
+		with pytest.raises(TypeError, match="Figures can only be rendered in a thread pool, not a process pool."):
+			run(asave_many([(fig, tmp_pathplus / "plot.svg")], executor=executor))
+
+	assert not (tmp_pathplus / "plot.svg").exists()
+
+
+def test_asave_many(tmp_pathplus: PathPlus):
+	with matplotlib.rc_context({"svg.hashsalt": "domplotlib"}):
+		koch, _ = koch_snowflake()
+		bar, _ = h_bar_chart()
+
+		figures = [
+				(koch, tmp_pathplus / "koch.svg"),
+				(bar, tmp_pathplus / "missing" / "bar.svg"),
+				(bar, tmp_pathplus / "bar.svg"),
+				]
+		results = run(asave_many(figures, metadata={"Date": None}))
+
+		assert results == [
+				SaveResult(tmp_pathplus / "koch.svg"),
+				SaveResult(tmp_pathplus / "missing" / "bar.svg", results[1].error),
+				SaveResult(tmp_pathplus / "bar.svg"),
+				]
+		assert isinstance(results[1].error, FileNotFoundError)
+
+		save_svg(bar, tmp_pathplus / "expected.svg", metadata={"Date": None})
+		assert (tmp_pathplus / "bar.svg").read_bytes() == (tmp_pathplus / "expected.svg").read_bytes()
+
+
+@pytest.mark.parametrize("max_concurrency", [1, 3])
+def test_asave_many_max_concurrency(tmp_pathplus: PathPlus, max_concurrency: int):
+	counter = ConcurrencyCounter()
+	figures = [(koch_snowflake()[0], tmp_pathplus / f"{idx}.svg") for idx in range(8)]
+
+	with ThreadPoolExecutor(8) as executor, mock.patch.object(domplotlib.aio, "save_svg", counter):
+		results = run(asave_many(figures, max_concurrency=max_concurrency, executor=executor))
+
+	assert all(result.ok for result in results)
+	assert len(counter.calls) == 8
+	assert counter.max_active == max_concurrency
+
+
+def test_asave_svg_same_figure(tmp_pathplus: PathPlus):
+	counter = ConcurrencyCounter()
+	fig, ax = koch_snowflake()
+
+	async def save_all():
+		await asyncio.gather(*(asave_svg(fig, tmp_pathplus / f"{idx}.svg", executor=executor) for idx in range(4)))
+
+	with ThreadPoolExecutor(4) as executor, mock.patch.object(domplotlib.aio, "save_svg", counter):
+		run(save_all())
+
+	assert len(counter.calls) == 4
+	assert counter.max_active == 1
+
+
+def test_asave_many_cancel(tmp_pathplus: PathPlus):
+	counter = ConcurrencyCounter(delay=0.2)
+	figures = [(koch_snowflake()[0], tmp_pathplus / f"{idx}.svg") for idx in range(4)]
+
+	async def cancel_early():
+		task = asyncio.ensure_future(asave_many(figures, max_concurrency=4, executor=executor))
+		await asyncio.sleep(0.05)
+		task.cancel()
+
+		with pytest.raises(asyncio.CancelledError):
+			await task
+
+		# The figure which had started rendering was allowed to finish.
+		assert counter.active == 0
+
+	with ThreadPoolExecutor(1) as executor, mock.patch.object(domplotlib.aio, "save_svg", counter):
+		run(cancel_early())
+
+	assert counter.calls == [tmp_pathplus / "0.svg"]
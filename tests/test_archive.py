@@ -0,0 +1,151 @@
+# stdlib
+import gzip
+import tarfile
+import zipfile
+from io import BytesIO
+
+# 3rd party
+import matplotlib  # type: ignore[import]
+import pytest
+from domdf_python_tools.paths import PathPlus
+from domdf_python_tools.typing import PathLike
+
+# this package
+from domplotlib import SvgArchiveWriter, save_many, save_svg
+from domplotlib.batch import SaveJob
+from tests.plots import h_bar_chart, koch_snowflake
+from tests.test_batch import broken_plot, salted_h_bar_chart, salted_koch_snowflake
+
+
+def read_members(path: PathLike, format: str):  # noqa: A002  # pylint: disable=redefined-builtin
+	if format == "zip":
+		with zipfile.ZipFile(path) as archive:
+			return {name: archive.read(name) for name in archive.namelist()}
+	else:
+		with tarfile.open(path) as archive:
+			return {member.name: archive.extractfile(member).read() for member in archive.getmembers()}
+
+
+def expected_svg(builder, **kwargs) -> bytes:
+	fp = BytesIO()
+
+	with matplotlib.rc_context({"svg.hashsalt": "domplotlib"}):
+		fig, ax = builder()
+		save_svg(fig, fp, metadata={"Date": None}, **kwargs)
+
+	return fp.getvalue()
+
+
+@pytest.mark.parametrize("format", ["zip", "tar", "tar.gz"])
+def test_svg_archive_writer(tmp_pathplus: PathPlus, format: str):  # noqa: A002  # pylint: disable=redefined-builtin
+	path = tmp_pathplus / f"plots.{format}"
+
+	with matplotlib.rc_context({"svg.hashsalt": "domplotlib"}):
+		with SvgArchiveWriter(path, format) as archive:
+			archive.save(koch_snowflake()[0], "koch.svg", metadata={"Date": None})
+			archive.save(h_bar_chart()[0], "plots/bar.svgz", metadata={"Date": None})
+			archive.writestr("README.txt", b"Hello World")
+
+	members = read_members(path, format)
+	assert list(members) == ["koch.svg", "plots/bar.svgz", "README.txt"]
+	assert members["koch.svg"] == expected_svg(koch_snowflake)
+	assert gzip.decompress(members["plots/bar.svgz"]) == expected_svg(h_bar_chart)
+	assert members["README.txt"] == b"Hello World"
+
+
+def test_svg_archive_writer_file_object():
+	fp = BytesIO()
+
+	with SvgArchiveWriter(fp, "tar.gz") as archive:
+		archive.writestr("README.txt", b"Hello World")
+
+	assert not fp.closed
+
+	with tarfile.open(fileobj=BytesIO(fp.getvalue())) as tar:
+		assert tar.extractfile("README.txt").read() == b"Hello World"
+
+
+def write_archive(format: str, **kwargs) -> bytes:  # noqa: A002  # pylint: disable=redefined-builtin
+	fp = BytesIO()
+
+	with SvgArchiveWriter(fp, format, **kwargs) as archive:  # type: ignore[arg-type]
+		archive.save(koch_snowflake()[0], "koch.svg", deterministic=True)
+		archive.save(h_bar_chart()[0], "plots/bar.svgz", deterministic=True)
+		with archive.open("README.txt") as member:
+			member.write(b"Hello World")
+
+	return fp.getvalue()
+
+
+def member_mtimes(data: bytes, format: str):  # noqa: A002  # pylint: disable=redefined-builtin
+	if format == "zip":
+		with zipfile.ZipFile(BytesIO(data)) as archive:
+			return {info.date_time for info in archive.infolist()}
+	else:
+		with tarfile.open(fileobj=BytesIO(data)) as archive:
+			return {member.mtime for member in archive.getmembers()}
+
+
+@pytest.mark.parametrize("format", ["zip", "tar", "tar.gz"])
+def test_svg_archive_writer_mtime(format: str):  # noqa: A002  # pylint: disable=redefined-builtin
+	data = write_archive(format, mtime=1234567890)
+	assert write_archive(format, mtime=1234567890) == data
+
+	if format == "zip":
+		assert member_mtimes(data, format) == {(2009, 2, 13, 23, 31, 30)}
+	else:
+		assert member_mtimes(data, format) == {1234567890}
+
+	if format == "tar.gz":
+		# The MTIME field of the gzip header.
+		assert data[4:8] == (1234567890).to_bytes(4, "little")
+
+
+@pytest.mark.parametrize("format", ["zip", "tar", "tar.gz"])
+def test_svg_archive_writer_source_date_epoch(
+		monkeypatch,
+		format: str,  # noqa: A002  # pylint: disable=redefined-builtin
+		):
+	monkeypatch.setenv("SOURCE_DATE_EPOCH", "1234567890")
+	data = write_archive(format)
+	assert write_archive(format) == data
+	assert data == write_archive(format, mtime=1234567890)
+
+
+def test_svg_archive_writer_mtime_before_1980():
+	with zipfile.ZipFile(BytesIO(write_archive("zip", mtime=0))) as archive:
+		assert {info.date_time for info in archive.infolist()} == {(1980, 1, 1, 0, 0, 0)}
+
+
+def test_svg_archive_writer_bad_format(tmp_pathplus: PathPlus):
+	with pytest.raises(ValueError, match="Unsupported archive format 'rar'"):
+		SvgArchiveWriter(tmp_pathplus / "plots.rar", "rar")  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+@pytest.mark.parametrize("format", ["zip", "tar.gz"])
+def test_save_many_archive(
+		tmp_pathplus: PathPlus,
+		workers: int,
+		format: str,  # noqa: A002  # pylint: disable=redefined-builtin
+		):
+	path = tmp_pathplus / f"plots.{format}"
+	jobs = [
+			(salted_koch_snowflake, "koch_0.svg"),
+			SaveJob(salted_h_bar_chart, "bar.svgz"),
+			(broken_plot, "broken.svg"),
+			SaveJob(salted_koch_snowflake, "koch_1.svg", {"dpi": 200}),
+			]
+
+	with matplotlib.rc_context():
+		with SvgArchiveWriter(path, format) as archive:
+			results = save_many(jobs, workers, archive=archive, dpi=100, metadata={"Date": None})
+
+	assert [result.fname for result in results] == [job[1] for job in jobs]
+	assert [result.ok for result in results] == [True, True, False, True]
+
+	members = read_members(path, format)
+	assert list(members) == ["koch_0.svg", "bar.svgz", "koch_1.svg"]
+	assert members["koch_0.svg"] == expected_svg(koch_snowflake, dpi=100)
+	assert gzip.decompress(members["bar.svgz"]) == expected_svg(h_bar_chart, dpi=100)
+	assert members["koch_1.svg"] == expected_svg(koch_snowflake, dpi=200)
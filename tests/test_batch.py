@@ -0,0 +1,72 @@
+# stdlib
+from typing import Tuple
+
+# 3rd party
+import matplotlib  # type: ignore[import]
+import pytest
+from domdf_python_tools.paths import PathPlus
+from matplotlib.axes import Axes  # type: ignore[import]
+from matplotlib.figure import Figure  # type: ignore[import]
+
+# this package
+from domplotlib import save_many, save_svg
+from domplotlib.batch import SaveJob, SaveResult
+from tests.plots import h_bar_chart, koch_snowflake
+
+
+def salted_koch_snowflake() -> Tuple[Figure, Axes]:
+	matplotlib.rcParams["svg.hashsalt"] = "domplotlib"
+	return koch_snowflake()
+
+
+def salted_h_bar_chart() -> Tuple[Figure, Axes]:
+	matplotlib.rcParams["svg.hashsalt"] = "domplotlib"
+	return h_bar_chart()
+
+
+def broken_plot() -> Figure:
+	raise ValueError("Something went wrong")
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+@pytest.mark.parametrize("chunksize", [1, 3])
+@pytest.mark.parametrize("text_cache", [False, True])
+def test_save_many(tmp_pathplus: PathPlus, workers: int, chunksize: int, text_cache: bool):
+	jobs = [
+			(salted_koch_snowflake, tmp_pathplus / "koch_0.svg"),
+			SaveJob(salted_h_bar_chart, tmp_pathplus / "bar.svg"),
+			(broken_plot, tmp_pathplus / "broken.svg"),
+			SaveJob(salted_koch_snowflake, tmp_pathplus / "koch_1.svg", {"dpi": 200}),
+			]
+
+	with matplotlib.rc_context():
+		results = save_many(
+				jobs,
+				workers,
+				chunksize=chunksize,
+				text_cache=text_cache,
+				dpi=100,
+				metadata={"Date": None},
+				)
+
+	assert [result.fname for result in results] == [job[1] for job in jobs]
+	assert [result.ok for result in results] == [True, True, False, True]
+	assert isinstance(results[2].error, ValueError)
+	assert str(results[2].error) == "Something went wrong"
+	assert not (tmp_pathplus / "broken.svg").exists()
+
+	# Results match the serial output.
+	with matplotlib.rc_context({"svg.hashsalt": "domplotlib"}):
+		for builder, fname, dpi in [
+				(koch_snowflake, "koch_0.svg", 100),
+				(h_bar_chart, "bar.svg", 100),
+				(koch_snowflake, "koch_1.svg", 200),
+				]:
+			fig, ax = builder()
+			save_svg(fig, tmp_pathplus / "expected.svg", dpi=dpi, metadata={"Date": None})
+			assert (tmp_pathplus / fname).read_bytes() == (tmp_pathplus / "expected.svg").read_bytes()
+
+
+def test_save_result():
+	assert SaveResult("plot.svg").ok
+	assert not SaveResult("plot.svg", ValueError()).ok
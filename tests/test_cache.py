@@ -0,0 +1,190 @@
+# stdlib
+import gzip
+import os
+from io import BytesIO, StringIO
+
+# 3rd party
+import numpy
+import pytest
+from domdf_python_tools.paths import PathPlus
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # type: ignore[import]
+from matplotlib.figure import Figure  # type: ignore[import]
+from matplotlib.ticker import FuncFormatter  # type: ignore[import]
+
+# this package
+from domplotlib import save_svg
+from domplotlib.cache import SvgCache, figure_fingerprint
+from tests.plots import h_bar_chart, koch_snowflake, markevery
+
+
+def test_figure_fingerprint():
+	fig, ax = koch_snowflake()
+	fingerprint = figure_fingerprint(fig, dpi=100)
+
+	# Same figure built again
+	assert figure_fingerprint(koch_snowflake()[0], dpi=100) == fingerprint
+
+	# Different keyword arguments
+	assert figure_fingerprint(fig, dpi=200) != fingerprint
+
+	ax.set_title("Koch Snowflake")
+	assert figure_fingerprint(fig, dpi=100) != fingerprint
+
+
+def test_figure_fingerprint_data():
+	fig, axs = markevery()
+	fingerprint = figure_fingerprint(fig)
+	assert figure_fingerprint(markevery()[0]) == fingerprint
+
+	line = axs[0].lines[0]
+	line.set_ydata(line.get_ydata() * 2)
+	assert figure_fingerprint(fig) != fingerprint
+
+	fig, axs = markevery()
+	axs[3].lines[0].set_color("red")
+	assert figure_fingerprint(fig) != fingerprint
+
+
+def image_plot(cmap: str = "viridis", vmax: float = 3, formatter: str = "{:.1f}") -> Figure:
+	fig = Figure(figsize=(4, 3))
+	FigureCanvasAgg(fig)
+	ax = fig.subplots()
+	ax.imshow(numpy.arange(16).reshape(4, 4) % 4, cmap=cmap, vmin=0, vmax=vmax)
+	ax.xaxis.set_major_formatter(FuncFormatter(lambda x, pos: formatter.format(x)))
+	return fig
+
+
+def test_figure_fingerprint_callables():
+	fingerprint = figure_fingerprint(image_plot())
+	assert figure_fingerprint(image_plot()) == fingerprint
+
+	# Colormaps, norms and formatters are callable, but their state must still be fingerprinted.
+	assert figure_fingerprint(image_plot(cmap="plasma")) != fingerprint
+	assert figure_fingerprint(image_plot(vmax=30)) != fingerprint
+	assert figure_fingerprint(image_plot(formatter="{:.3f}")) != fingerprint
+
+	fig = image_plot()
+	fig.axes[0].images[0].set_clim(0, 30)
+	assert figure_fingerprint(fig) != fingerprint
+
+	fig = image_plot()
+	fig.axes[0].xaxis.set_major_formatter(FuncFormatter(lambda x, pos: f"{x}%"))
+	assert figure_fingerprint(fig) != fingerprint
+
+
+def test_figure_fingerprint_opaque():
+
+	class Opaque:
+		__slots__ = ("value", )
+
+	fig = image_plot()
+	fig.axes[0].images[0].opaque = Opaque()
+
+	with pytest.raises(TypeError, match=r"The state of '.*Opaque' objects can't be fingerprinted."):
+		figure_fingerprint(fig)
+
+
+def test_svg_cache_callables(tmp_pathplus: PathPlus):
+	cache = SvgCache(tmp_pathplus / "cache")
+
+	save_svg(image_plot(), tmp_pathplus / "viridis.svg", cache=cache)
+	save_svg(image_plot(cmap="plasma"), tmp_pathplus / "plasma.svg", cache=cache)
+	assert (cache.hits, cache.misses) == (0, 2)
+	assert (tmp_pathplus / "viridis.svg").read_bytes() != (tmp_pathplus / "plasma.svg").read_bytes()
+
+	# Figures which can't be fingerprinted are always rendered, and not added to the cache.
+	fig = image_plot()
+	fig.axes[0].images[0].opaque = iter(())
+	save_svg(fig, tmp_pathplus / "opaque.svg", cache=cache)
+	assert (cache.hits, cache.misses) == (0, 3)
+	assert len(cache) == 2
+	assert (tmp_pathplus / "opaque.svg").is_file()
+
+
+def test_svg_cache(tmp_pathplus: PathPlus):
+	cache = SvgCache(tmp_pathplus / "cache")
+
+	save_svg(koch_snowflake()[0], tmp_pathplus / "first.svg", cache=cache)
+	assert (cache.hits, cache.misses) == (0, 1)
+	assert len(cache) == 1
+	assert cache.size == (tmp_pathplus / "first.svg").stat().st_size
+
+	save_svg(koch_snowflake()[0], tmp_pathplus / "second.svg", cache=cache)
+	assert (cache.hits, cache.misses) == (1, 1)
+	assert (tmp_pathplus / "second.svg").read_bytes() == (tmp_pathplus / "first.svg").read_bytes()
+
+	string_io = StringIO()
+	save_svg(koch_snowflake()[0], string_io, cache=cache)
+	assert (cache.hits, cache.misses) == (2, 1)
+	assert string_io.getvalue() == (tmp_pathplus / "first.svg").read_text()
+
+	# Different options
+	save_svg(koch_snowflake()[0], tmp_pathplus / "third.svg", cache=cache, compact=True)
+	assert (cache.hits, cache.misses) == (2, 2)
+	assert len(cache) == 2
+
+	# Entries are found by a new cache using the same directory.
+	cache = SvgCache(tmp_pathplus / "cache")
+	assert len(cache) == 2
+	save_svg(koch_snowflake()[0], tmp_pathplus / "fourth.svg", cache=cache)
+	assert (cache.hits, cache.misses) == (1, 0)
+
+	cache.clear()
+	assert (cache.hits, cache.misses) == (0, 0)
+	assert len(cache) == 0
+	assert not list((tmp_pathplus / "cache").iterdir())
+
+
+def test_svg_cache_eviction(tmp_pathplus: PathPlus):
+	cache = SvgCache(tmp_pathplus / "cache")
+	save_svg(koch_snowflake()[0], tmp_pathplus / "koch.svg", cache=cache)
+	save_svg(h_bar_chart()[0], tmp_pathplus / "bar.svg", cache=cache)
+	koch_key = cache.fingerprint(koch_snowflake()[0])
+
+	save_svg(koch_snowflake()[0], tmp_pathplus / "koch_200.svg", dpi=200)
+	max_size = (tmp_pathplus / "bar.svg").stat().st_size + (tmp_pathplus / "koch_200.svg").stat().st_size
+
+	cache = SvgCache(tmp_pathplus / "cache", max_size=max_size)
+	assert len(cache) == 2
+
+	# The least recently used entry is evicted.
+	save_svg(h_bar_chart()[0], tmp_pathplus / "bar.svg", cache=cache)
+	save_svg(koch_snowflake()[0], tmp_pathplus / "koch_200.svg", dpi=200, cache=cache)
+	assert len(cache) == 2
+	assert cache.size == max_size
+	assert cache.get(koch_key) is None
+
+
+def test_svg_cache_compressed(tmp_pathplus: PathPlus):
+	cache = SvgCache(tmp_pathplus / "cache")
+
+	save_svg(koch_snowflake()[0], tmp_pathplus / "plot.svg", cache=cache)
+	save_svg(koch_snowflake()[0], tmp_pathplus / "plot.svgz", cache=cache)
+	assert (cache.hits, cache.misses) == (0, 2)
+
+	bytes_io = BytesIO()
+	save_svg(koch_snowflake()[0], bytes_io, cache=cache, compress=True)
+	assert (cache.hits, cache.misses) == (1, 2)
+	assert bytes_io.getvalue() == (tmp_pathplus / "plot.svgz").read_bytes()
+	assert gzip.decompress(bytes_io.getvalue()).startswith(b"<?xml")
+
+
+def test_svg_cache_hardlink(tmp_pathplus: PathPlus):
+	cache = SvgCache(tmp_pathplus / "cache", hardlink=True)
+	save_svg(koch_snowflake()[0], tmp_pathplus / "first.svg", cache=cache)
+	save_svg(koch_snowflake()[0], tmp_pathplus / "second.svg", cache=cache)
+	assert os.path.samefile(tmp_pathplus / "first.svg", tmp_pathplus / "second.svg")
+
+
+def test_svg_cache_error(tmp_pathplus: PathPlus):
+	cache = SvgCache(tmp_pathplus / "cache")
+
+	def write(path: PathPlus):
+		path.write_text("<svg")
+		raise ValueError("Something went wrong")
+
+	with pytest.raises(ValueError, match="Something went wrong"):
+		cache.put("abcdef", write)
+
+	assert len(cache) == 0
+	assert not list((tmp_pathplus / "cache").iterdir())
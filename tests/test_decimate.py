@@ -0,0 +1,106 @@
+# stdlib
+from typing import Tuple
+
+# 3rd party
+import matplotlib  # type: ignore[import]
+import numpy
+import pytest
+from domdf_python_tools.paths import PathPlus
+from matplotlib.axes import Axes  # type: ignore[import]
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # type: ignore[import]
+from matplotlib.figure import Figure  # type: ignore[import]
+
+# this package
+from domplotlib import save_svg
+from domplotlib.decimate import decimate_lines, min_max_indices
+
+
+def timeseries(n: int = 200_000) -> Tuple[Figure, Axes]:
+	rng = numpy.random.default_rng(1234)
+	x = numpy.linspace(0, 100, n)
+	y = numpy.sin(x / 5) + rng.normal(scale=0.2, size=n).cumsum() / 50
+
+	fig = Figure(figsize=(6, 4), dpi=100)
+	FigureCanvasAgg(fig)
+	ax = fig.add_subplot(1, 1, 1)
+	ax.plot(x, y)
+	return fig, ax
+
+
+def render(fig: Figure) -> numpy.ndarray:
+	fig.canvas.draw()
+	return numpy.asarray(fig.canvas.buffer_rgba(), dtype=float)
+
+
+def test_min_max_indices():
+	buckets = numpy.array([0, 0, 0, 0, 0, 1, 1, 2, 3, 3, 3, 3, 3, 3])
+	y = numpy.array([5, 1, 9, 3, 4, 2, 7, 0, 1, 8, 2, 6, 0, 3])
+
+	assert list(min_max_indices(buckets, y)) == [0, 1, 2, 4, 5, 6, 7, 8, 9, 12, 13]
+	assert list(min_max_indices(numpy.arange(0), numpy.arange(0))) == []
+
+
+def test_decimate_lines():
+	fig, ax = timeseries()
+	line, = ax.get_lines()
+	x, y = line.get_data(orig=True)
+
+	expected = render(fig)
+
+	with decimate_lines(fig) as decimated:
+		assert decimated == [line]
+		assert len(line.get_xydata()) < 4 * 600
+		actual = render(fig)
+
+	numpy.testing.assert_array_equal(line.get_data(orig=True)[0], x)
+	numpy.testing.assert_array_equal(line.get_data(orig=True)[1], y)
+
+	# The decimated line is drawn almost identically.
+	assert numpy.abs(actual - expected).mean() < 0.5
+
+
+def test_decimate_lines_skipped():
+	fig, ax = timeseries(1000)
+	x = numpy.linspace(0, 100, 1000)
+	ax.plot(x, x, marker='o')
+	ax.plot(x, x, drawstyle="steps-mid")
+	ax.plot(numpy.cos(x), numpy.sin(x))
+	ax.plot(x, numpy.where(x > 50, numpy.nan, x))
+	ax.plot(x[:4], x[:4])
+
+	with decimate_lines(fig) as decimated:
+		assert decimated == ax.get_lines()[:1]
+
+	with pytest.raises(ValueError, match="'max_points_per_pixel' must be greater than zero."):
+		with decimate_lines(fig, 0):
+			pass
+
+
+def test_decimate_lines_descending():
+	fig, ax = timeseries(10_000)
+	line, = ax.get_lines()
+	x, y = line.get_data()
+	line.set_data(x[::-1], y[::-1])
+
+	with decimate_lines(fig, dpi=50) as decimated:
+		assert decimated == [line]
+		assert len(line.get_xydata()) < 4 * 300
+
+
+def test_save_svg_decimate(tmp_pathplus: PathPlus):
+	fig, ax = timeseries()
+	line, = ax.get_lines()
+	x, y = line.get_data(orig=True)
+
+	with matplotlib.rc_context({"svg.hashsalt": "domplotlib"}):
+		save_svg(fig, tmp_pathplus / "full.svg", metadata={"Date": None})
+		save_svg(fig, tmp_pathplus / "decimated.svg", decimate=True, metadata={"Date": None})
+		save_svg(fig, tmp_pathplus / "coarse.svg", decimate=1, metadata={"Date": None})
+
+	numpy.testing.assert_array_equal(line.get_data(orig=True)[0], x)
+	numpy.testing.assert_array_equal(line.get_data(orig=True)[1], y)
+
+	full = (tmp_pathplus / "full.svg").stat().st_size
+	decimated = (tmp_pathplus / "decimated.svg").stat().st_size
+	coarse = (tmp_pathplus / "coarse.svg").stat().st_size
+	assert coarse < decimated < full / 2
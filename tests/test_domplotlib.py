@@ -1,14 +1,32 @@
 # stdlib
-from typing import Callable, Tuple
+import gzip
+import itertools
+import re
+import subprocess
+import sys
+import typing
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO, StringIO
+from typing import Callable, List, Optional, Sequence, Tuple
+from unittest import mock
 
 # 3rd party
+import matplotlib  # type: ignore[import]
+import numpy
 import pytest
+from domdf_python_tools.pagesizes import PageSize
 from domdf_python_tools.paths import PathPlus
+from matplotlib._pylab_helpers import Gcf  # type: ignore[import]
+from matplotlib.artist import Artist  # type: ignore[import]
 from matplotlib.axes import Axes  # type: ignore[import]
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # type: ignore[import]
 from matplotlib.figure import Figure  # type: ignore[import]
+from matplotlib.legend import Legend  # type: ignore[import]
 
 # this package
-from domplotlib import horizontal_legend, save_svg
+import domplotlib
+from domplotlib import create_figure, horizontal_legend, save_formats, save_svg, transpose
 from tests.common import check_images
 from tests.plots import h_bar_chart, hatch_filled_histograms, koch_snowflake, markevery
 
@@ -30,6 +48,206 @@ def test_save_svg(tmp_pathplus: PathPlus, plot: Callable[[], Tuple[Figure, ...]]
 		assert line.rstrip() == line
 
 
+@pytest.mark.parametrize("plot", [
+		koch_snowflake,
+		hatch_filled_histograms,
+		h_bar_chart,
+		])
+def test_save_svg_unchanged(tmp_pathplus: PathPlus, plot: Callable[[], Tuple[Figure, ...]]):
+	fig, *_ = plot()
+
+	with matplotlib.rc_context({"svg.hashsalt": "domplotlib"}):
+		buf = StringIO()
+		fig.savefig(buf, format="svg", dpi=1600, facecolor='w', edgecolor='w', metadata={"Date": None})
+		expected = tmp_pathplus / "expected.svg"
+		expected.write_clean(buf.getvalue())
+
+		filename = tmp_pathplus / "plot.svg"
+		save_svg(fig, filename, dpi=1600, metadata={"Date": None})
+
+		string_io = StringIO()
+		save_svg(fig, string_io, dpi=1600, metadata={"Date": None})
+
+		bytes_io = BytesIO()
+		save_svg(fig, bytes_io, dpi=1600, metadata={"Date": None})
+
+	assert filename.read_bytes() == expected.read_bytes()
+	assert string_io.getvalue().encode("UTF-8") == expected.read_bytes()
+	assert bytes_io.getvalue() == expected.read_bytes()
+
+
+@pytest.mark.parametrize("plot", [
+		koch_snowflake,
+		h_bar_chart,
+		])
+def test_save_svg_compressed(tmp_pathplus: PathPlus, plot: Callable[[], Tuple[Figure, ...]]):
+	fig, *_ = plot()
+
+	with matplotlib.rc_context({"svg.hashsalt": "domplotlib"}):
+		save_svg(fig, tmp_pathplus / "plot.svg", metadata={"Date": None})
+		save_svg(fig, tmp_pathplus / "plot.svgz", metadata={"Date": None})
+		save_svg(fig, tmp_pathplus / "level_1.svg", metadata={"Date": None}, compress=1)
+		save_svg(fig, tmp_pathplus / "uncompressed.svgz", metadata={"Date": None}, compress=False)
+
+		bytes_io = BytesIO()
+		save_svg(fig, bytes_io, metadata={"Date": None}, compress=True)
+
+	expected = (tmp_pathplus / "plot.svg").read_bytes()
+
+	assert (tmp_pathplus / "plot.svgz").stat().st_size < len(expected) / 3
+	assert gzip.decompress((tmp_pathplus / "plot.svgz").read_bytes()) == expected
+	assert gzip.decompress((tmp_pathplus / "level_1.svg").read_bytes()) == expected
+	assert gzip.decompress(bytes_io.getvalue()) == expected
+	assert (tmp_pathplus / "uncompressed.svgz").read_bytes() == expected
+
+
+@pytest.mark.parametrize("plot", [
+		koch_snowflake,
+		hatch_filled_histograms,
+		h_bar_chart,
+		])
+@pytest.mark.parametrize("suffix", [".svg", ".svgz"])
+def test_save_svg_deterministic(tmp_pathplus: PathPlus, plot: Callable[[], Tuple[Figure, ...]], suffix: str):
+	fig, *_ = plot()
+
+	with mock.patch("time.time", return_value=1_000_000_000):
+		save_svg(fig, tmp_pathplus / f"first{suffix}", deterministic=True, compact=True)
+
+	with mock.patch("time.time", return_value=2_000_000_000):
+		save_svg(fig, tmp_pathplus / f"second{suffix}", deterministic=True, compact=True)
+
+	first = (tmp_pathplus / f"first{suffix}").read_bytes()
+	assert first == (tmp_pathplus / f"second{suffix}").read_bytes()
+
+	# A new figure with the same contents also gives the same bytes.
+	save_svg(plot()[0], tmp_pathplus / f"new{suffix}", deterministic=True, compact=True)
+	assert (tmp_pathplus / f"new{suffix}").read_bytes() == first
+
+	if suffix == ".svgz":
+		first = gzip.decompress(first)
+	assert b"<dc:date>" not in first
+
+	assert matplotlib.rcParams["svg.hashsalt"] is None
+
+
+@pytest.mark.parametrize("plot", [
+		koch_snowflake,
+		hatch_filled_histograms,
+		h_bar_chart,
+		markevery,
+		])
+@pytest.mark.parametrize("dpi, precision", [(100, 2), (1600, 3)])
+def test_save_svg_compact(
+		tmp_pathplus: PathPlus,
+		plot: Callable[[], Tuple[Figure, ...]],
+		dpi: int,
+		precision: int,
+		):
+	fig, *_ = plot()
+
+	# Allow the layout to settle, so both files are of the same figure.
+	fig.savefig(StringIO(), format="svg", dpi=dpi)
+
+	with matplotlib.rc_context({"svg.hashsalt": "domplotlib"}):
+		save_svg(fig, tmp_pathplus / "plot.svg", dpi=dpi)
+		save_svg(fig, tmp_pathplus / "compact.svg", dpi=dpi, compact=True)
+
+	original = ET.parse(tmp_pathplus / "plot.svg").getroot()
+	compact = ET.parse(tmp_pathplus / "compact.svg").getroot()
+
+	assert (tmp_pathplus / "compact.svg").stat().st_size < (tmp_pathplus / "plot.svg").stat().st_size
+
+	def get_paths(root: ET.Element) -> List[List[float]]:
+		return [
+				list(map(float, re.findall(r"-?[\d.]+", element.attrib['d'])))
+				for element in root.iter("{http://www.w3.org/2000/svg}path")
+				if 'd' in element.attrib
+				]
+
+	original_paths = get_paths(original)
+	compact_paths = get_paths(compact)
+	assert len(original_paths) == len(compact_paths)
+
+	for original_path, compact_path in zip(original_paths, compact_paths):
+		assert compact_path == pytest.approx(original_path, abs=0.5 * 10**-precision)
+
+
+@pytest.mark.parametrize("plot", [
+		koch_snowflake,
+		hatch_filled_histograms,
+		h_bar_chart,
+		markevery,
+		])
+@pytest.mark.parametrize("bbox_inches", ["tight", None])
+def test_save_formats(tmp_pathplus: PathPlus, plot: Callable[[], Tuple[Figure, ...]], bbox_inches: str):
+	fig, *_ = plot()
+	layout_engine = fig.get_layout_engine()
+
+	draw = Figure.draw
+	with mock.patch.object(Figure, "draw", autospec=True, side_effect=draw) as mock_draw:
+		save_formats(
+				fig,
+				{"svg": tmp_pathplus / "plot.svg", "png": tmp_pathplus / "plot.png", "pdf": tmp_pathplus / "plot.pdf"},
+				dpi=100,
+				bbox_inches=bbox_inches,
+				)
+
+	assert fig.get_layout_engine() is layout_engine
+
+	# One draw to lay out the figure, one per format, and one from save_svg resetting the canvas.
+	if layout_engine is not None or bbox_inches:
+		assert mock_draw.call_count == 5
+	else:
+		assert mock_draw.call_count == 4
+
+	assert (tmp_pathplus / "plot.png").read_bytes().startswith(b"\x89PNG")
+	assert (tmp_pathplus / "plot.pdf").read_bytes().startswith(b"%PDF")
+	assert (tmp_pathplus / "plot.svg").read_text().startswith("<?xml")
+	for line in (tmp_pathplus / "plot.svg").read_lines():
+		assert line.rstrip() == line
+
+	# Figures with a layout engine are laid out with the Agg renderer rather than the SVG one,
+	# so text positions may differ very slightly from save_svg.
+	if bbox_inches is None and layout_engine is None:
+		with matplotlib.rc_context({"svg.hashsalt": "domplotlib"}):
+			save_formats(fig, {"svg": tmp_pathplus / "plot.svg"}, metadata={"Date": None})
+			save_svg(fig, tmp_pathplus / "expected.svg", metadata={"Date": None})
+
+		assert (tmp_pathplus / "plot.svg").read_bytes() == (tmp_pathplus / "expected.svg").read_bytes()
+
+
+def _reference_transpose(sequence: List, ncol: int) -> List:
+	rows = [sequence[idx:idx + ncol] for idx in range(0, len(sequence), ncol)]
+	sentinel = object()
+	columns = itertools.zip_longest(*rows, fillvalue=sentinel)
+	return [x for x in itertools.chain.from_iterable(columns) if x is not sentinel]
+
+
+@pytest.mark.parametrize("length", [0, 1, 5, 6, 7, 10_000, 100_001])
+@pytest.mark.parametrize("ncol", [1, 2, 3, 7, 150])
+def test_transpose(length: int, ncol: int):
+	sequence = [str(idx) for idx in range(length)]
+	expected = _reference_transpose(sequence, ncol)
+
+	assert list(transpose(sequence, ncol)) == expected
+	assert list(transpose(tuple(sequence), ncol)) == expected
+	assert list(transpose(iter(sequence), ncol)) == expected
+
+	array = numpy.array(sequence, dtype=object)
+	result = transpose(array, ncol)
+	assert isinstance(result, numpy.ndarray)
+	assert result.tolist() == expected
+
+
+def test_transpose_small():
+	assert list(transpose(["a", "b", "c", "d", "e"], 2)) == ["a", "c", "e", "b", "d"]
+	assert list(transpose(['', "b", '', "d", "e"], 3)) == ['', "d", "b", "e", '']
+	assert list(transpose(range(7), 3)) == [0, 3, 6, 1, 4, 2, 5]
+
+	with pytest.raises(ValueError, match="'ncol' must be at least 1"):
+		transpose([1, 2, 3], 0)
+
+
 @pytest.mark.parametrize("plot", [
 		koch_snowflake,
 		hatch_filled_histograms,
@@ -59,3 +277,197 @@ def test_horizontal_legend_markevery():
 	horizontal_legend(fig, handles, labels, ncol=2)
 
 	return fig
+
+
+def test_horizontal_legend_all_axes():
+	fig = Figure()
+	ax1, ax2 = fig.subplots(1, 2)
+
+	for ax in (ax1, ax2):
+		ax.plot([0, 1], [0, 1], color="red", label="Red")
+		ax.plot([0, 1], [1, 0], color="blue", label="Blue")
+
+	ax2.plot([0, 1], [1, 1], color="green", label="Red")
+
+	legend = horizontal_legend(fig, ncol=2)
+	assert [text.get_text() for text in legend.texts] == ["Red", "Red", "Blue"]
+	assert [line.get_color() for line in legend.get_lines()] == ["red", "green", "blue"]
+
+	legend.remove()
+	legend = horizontal_legend(fig, ncol=2, deduplicate=False)
+	assert [text.get_text() for text in legend.texts] == ["Red", "Red", "Red", "Blue", "Blue"]
+
+	# Empty labels are kept.
+	legend.remove()
+	handles = ax1.get_lines()
+	legend = horizontal_legend(fig, handles, ['', "Blue"], ncol=2)
+	assert [text.get_text() for text in legend.texts] == ['', "Blue"]
+
+
+def test_horizontal_legend_max_entries():
+	fig = Figure()
+	ax = fig.subplots()
+
+	for idx in range(10):
+		ax.plot([0, 1], [idx, idx], label=f"Series {idx}")
+
+	legend = horizontal_legend(fig, ncol=2, max_entries=4)
+	assert [text.get_text() for text in legend.texts] == ["Series 0", "Series 2", "6 more", "Series 1", "Series 3"]
+
+	legend.remove()
+	legend = horizontal_legend(fig, max_entries=10, overflow_label="and {} others")
+	assert len(legend.texts) == 10
+
+	legend.remove()
+	legend = horizontal_legend(fig, max_entries=2, overflow_label="and {} others")
+	assert [text.get_text() for text in legend.texts] == ["Series 0", "Series 1", "and 8 others"]
+	assert not legend.legend_handles[-1].get_visible()
+
+
+def test_horizontal_legend_reuses_order():
+	fig = Figure()
+	ax = fig.subplots()
+
+	for idx in range(5):
+		ax.plot([0, 1], [idx, idx], label=f"Series {idx}")
+
+	with mock.patch("domplotlib._legend_order", side_effect=domplotlib._legend_order) as legend_order:
+		horizontal_legend(fig, ncol=2).remove()
+		horizontal_legend(fig, ncol=2).remove()
+		assert legend_order.call_count == 1
+
+		horizontal_legend(fig, ncol=3).remove()
+		assert legend_order.call_count == 2
+
+		ax.plot([0, 1], [0, 0], label="New series")
+		legend = horizontal_legend(fig, ncol=3)
+		assert legend_order.call_count == 3
+
+	assert len(legend.texts) == 6
+
+
+def test_horizontal_legend_restyled_handle():
+	fig = Figure()
+	ax = fig.subplots()
+
+	ax.plot([0, 1], [0, 1], color="red", label='A')
+	line, = ax.plot([0, 1], [1, 0], color="red", label='A')
+
+	legend = horizontal_legend(fig)
+	assert len(legend.texts) == 1
+
+	legend.remove()
+	line.set_color("blue")
+	legend = horizontal_legend(fig)
+	assert [line.get_color() for line in legend.get_lines()] == ["red", "blue"]
+
+	legend.remove()
+	line.set_color("red")
+	legend = horizontal_legend(fig)
+	assert len(legend.texts) == 1
+
+
+def test_create_figure_headless():
+	fig, ax = create_figure((4, 3), left=0.1, bottom=0.1, right=0.1, top=0.1, headless=True)
+
+	assert isinstance(fig.canvas, FigureCanvasAgg)
+	assert fig.get_axes() == [ax]
+	assert ax.get_position().bounds == pytest.approx((0.1, 0.1, 0.8, 0.8))
+	assert all(manager.canvas.figure is not fig for manager in Gcf.get_all_fig_managers())
+
+
+def test_create_figure_headless_no_pyplot():
+	script = "import sys, domplotlib; domplotlib.create_figure((4, 3), headless=True); "
+	script += "print('matplotlib.pyplot' in sys.modules)"
+	output = subprocess.check_output([sys.executable, "-c", script], text=True)
+	assert output.strip() == "False"
+
+
+def headless_plot(idx: int) -> bytes:
+	fig, ax = create_figure((4, 3), headless=True)
+	x = numpy.linspace(0, 10, 200)
+	ax.plot(x, numpy.sin(x * (idx % 5 + 1)), label=f"Series {idx}")
+	ax.bar(range(idx % 7 + 1), range(idx % 7 + 1), hatch="//")
+	ax.set_title(f"Plot {idx}")
+	horizontal_legend(fig)
+
+	fp = BytesIO()
+	save_svg(fig, fp, compress=idx % 2 == 0, deterministic=True)
+	return fp.getvalue()
+
+
+def test_create_figure_headless_threads():
+	with matplotlib.rc_context({"svg.hashsalt": "domplotlib"}):
+		expected = [headless_plot(idx) for idx in range(24)]
+
+		with ThreadPoolExecutor(max_workers=8) as executor:
+			for _ in range(2):
+				assert list(executor.map(headless_plot, range(24))) == expected
+
+
+@pytest.mark.parametrize("module", ["domplotlib", "domplotlib.styles"])
+def test_import_time(module: str):
+	# "python -X importtime" lists every module imported, and how long it took, on stderr.
+	process = subprocess.run(
+			[sys.executable, "-X", "importtime", "-c", f"import {module}; {module}.__all__"],
+			stderr=subprocess.PIPE,
+			text=True,
+			check=True,
+			)
+
+	imported = set(re.findall(r"^import time:\s*\d+ \|\s*\d+ \|\s*(\S+)$", process.stderr, flags=re.MULTILINE))
+	assert module in imported
+
+	for heavy in ("matplotlib", "numpy", "domdf_python_tools", "typing_extensions"):
+		assert heavy not in imported, f"{module} imports {heavy}"
+
+
+def test_lazy_imports():
+	# this package
+	from domplotlib.aio import asave_many, asave_svg
+	from domplotlib.archive import SvgArchiveWriter
+	from domplotlib.batch import save_many
+	from domplotlib.pool import FigurePool
+	from domplotlib.report import Report
+
+	assert domplotlib.asave_many is asave_many
+	assert domplotlib.asave_svg is asave_svg
+	assert domplotlib.SvgArchiveWriter is SvgArchiveWriter
+	assert domplotlib.save_many is save_many
+	assert domplotlib.FigurePool is FigurePool
+	assert domplotlib.Report is Report
+
+	assert set(domplotlib.__all__) <= set(dir(domplotlib))
+
+	with pytest.raises(AttributeError, match="module 'domplotlib' has no attribute 'Chart'"):
+		domplotlib.Chart  # noqa: B018  # pylint: disable=pointless-statement
+
+
+def test_type_hints():
+	assert typing.get_type_hints(save_svg)["figure"] is Figure
+	assert typing.get_type_hints(save_formats)["bbox_extra_artists"] == Optional[Sequence[Artist]]
+	assert typing.get_type_hints(create_figure) == {
+			"pagesize": PageSize,
+			"left": float,
+			"bottom": float,
+			"right": float,
+			"top": float,
+			"headless": bool,
+			"return": Tuple[Figure, Axes],
+			}
+	assert typing.get_type_hints(horizontal_legend)["return"] is Legend
+	assert typing.get_type_hints(domplotlib.save_many)["archive"] == Optional[domplotlib.SvgArchiveWriter]
+
+	# The types are imported when the hints are evaluated, not when domplotlib is imported.
+	process = subprocess.run(
+			[
+					sys.executable,
+					"-c",
+					"import sys, typing, domplotlib; assert 'matplotlib' not in sys.modules; "
+					"print(typing.get_type_hints(domplotlib.save_svg)['figure'])",
+					],
+			stdout=subprocess.PIPE,
+			text=True,
+			check=True,
+			)
+	assert process.stdout == "<class 'matplotlib.figure.Figure'>\n"
@@ -3,13 +3,15 @@ import importlib
 from typing import Iterable, Tuple
 
 # 3rd party
+import numpy
 import pytest
 from cawdrey import Tally
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # type: ignore[import]
 from matplotlib.figure import Figure  # type: ignore[import]
 from matplotlib.text import Text  # type: ignore[import]
 
 # this package
-from domplotlib.plots import pie_from_tally
+from domplotlib.plots import LivePie, bar_from_tally, pie_from_tally, pies_from_tallies
 from tests.common import check_images
 
 
@@ -120,3 +122,213 @@ def test_plot_pie_from_tally_no_explode(reverse: bool, style: str):
 	ax.axis("equal", emit=True)
 
 	return fig
+
+
+@pytest.mark.parametrize("reverse", [True, False])
+def test_pie_from_tally_top(reverse: bool):
+	tally = Tally({f"key_{idx}": idx for idx in range(1, 1001)})
+	ax = Figure().subplots()
+
+	patches, texts, autotexts = pie_from_tally(
+		tally,
+		["Other"],
+		percent=True,
+		top=3,
+		other_label="Other",
+		autopct="%1.1f%%",
+		ax=ax,
+		reverse=reverse,
+		)
+
+	expected = [("key_1000", "0.2%"), ("key_999", "0.2%"), ("key_998", "0.2%"), ("Other", "99.4%")]
+	if reverse:
+		expected.reverse()
+
+	assert [(text.get_text(), autotext.get_text()) for text, autotext in zip(texts, autotexts)] == expected
+	exploded = [tuple(patch.center) != (0, 0) for patch in patches]
+	assert exploded == [text.get_text() == "Other" for text in texts]
+
+
+def test_pie_from_tally_top_small():
+	tally = Tally(["cat", "dog", "dog"])
+
+	patches, texts = pie_from_tally(tally, top=2, ax=Figure().subplots())
+	assert [text.get_text() for text in texts] == ["dog", "cat"]
+
+	with pytest.raises(ValueError, match="'top' must be at least 1"):
+		pie_from_tally(tally, top=0, ax=Figure().subplots())
+
+
+def test_pies_from_tallies():
+	tallies = {
+			"North": Tally(["cat", "dog", "dog", "rabbit", "snake"]),
+			"South": Tally(["dog", "cat", "cat", "cat", "gerbil"]),
+			"East": Tally(["dog"]),
+			}
+
+	fig = Figure()
+	ax = fig.subplots()
+	pies = pies_from_tallies(tallies, 2, top=2, ax=ax, autopct="%1.0f%%", colors={"dog": "black"})
+
+	assert list(pies) == ["North", "South", "East"]
+	assert [len(pie) for pie in pies.values()] == [3, 3, 3]
+	assert [text.get_text() for text in ax.texts if text.get_text() in tallies] == list(tallies)
+	assert [autotext.get_text() for autotext in pies["South"][2]] == ["60%", "20%", "20%"]
+
+	# Each element has the same colour in every pie.
+	colours = {}
+	for patches, *_ in pies.values():
+		for patch in patches:
+			assert colours.setdefault(patch.get_label(), patch.get_facecolor()) == patch.get_facecolor()
+
+	assert colours["dog"] == (0, 0, 0, 1)
+
+	legend, = fig.legends
+	# dog, cat, Other; read left to right in two columns.
+	assert [text.get_text() for text in legend.texts] == ["dog", "Other", "cat"]
+	assert ax.get_xlim() == (-1.25, 3.75)
+	assert ax.get_ylim() == (-3.75, 1.25)
+
+	with pytest.raises(ValueError, match="'ncols' must be at least 1"):
+		pies_from_tallies(tallies, 0, ax=ax)
+
+
+@pytest.mark.parametrize(
+		"kwargs",
+		[
+				pytest.param({}, id="default"),
+				pytest.param({"reverse": True}, id="reverse"),
+				pytest.param({"startangle": 90, "counterclock": False, "radius": 0.8}, id="clockwise"),
+				]
+		)
+def test_live_pie(kwargs):
+	tally = Tally(["cat", "dog", "dog", "cat", "rabbit", "dog", "dog", "cat", "snake", "gerbil"])
+	fig = Figure()
+	FigureCanvasAgg(fig)
+	expected_ax, ax = fig.subplots(1, 2)
+
+	patches, texts, autotexts = pie_from_tally(tally, ["dog"], autopct="%1.1f%%", ax=expected_ax, **kwargs)
+	pie = LivePie(tally, ["dog"], autopct="%1.1f%%", ax=ax, **kwargs)
+
+	# The chart matches pie_from_tally.
+	for expected, actual in zip(patches, pie.wedges):
+		assert actual.get_label() == expected.get_label()
+		assert (actual.theta1, actual.theta2) == pytest.approx((expected.theta1, expected.theta2))
+		assert actual.center == pytest.approx(expected.center)
+		assert actual.get_facecolor() == expected.get_facecolor()
+
+	for expected, actual in zip([*texts, *autotexts], [*pie.texts, *pie.autotexts]):
+		assert actual.get_text() == expected.get_text()
+		assert actual.get_position() == pytest.approx(expected.get_position())
+		assert actual.get_horizontalalignment() == expected.get_horizontalalignment()
+
+	# Existing artists are updated in place.
+	wedges = {wedge.get_label(): wedge for wedge in pie.wedges}
+	artists = pie.add(["gerbil"] * 5 + ["hamster"])
+	assert artists == pie.artists
+	order = ["gerbil", "dog", "cat", "rabbit", "snake", "hamster"]
+	assert [wedge.get_label() for wedge in pie.wedges] == (order[::-1] if kwargs.get("reverse") else order)
+	assert all(wedges[wedge.get_label()] is wedge for wedge in pie.wedges if wedge.get_label() != "hamster")
+	assert tally["gerbil"] == 6
+	assert [text.get_text() for text in pie.autotexts if text.get_text() == "37.5%"]
+
+	# Elements which are no longer shown are removed.
+	pie.update(Tally(["cat", "dog"]))
+	assert sorted(wedge.get_label() for wedge in pie.wedges) == ["cat", "dog"]
+	assert len(ax.patches) == 2
+	assert len(ax.texts) == 4
+	assert pie.wedges[0].get_facecolor() != pie.wedges[1].get_facecolor()
+
+	fig.canvas.draw()
+
+
+def test_live_pie_blit():
+	fig = Figure()
+	FigureCanvasAgg(fig)
+	ax = fig.subplots()
+
+	pie = LivePie(Tally(), top=3, autopct="%1.0f%%", ax=ax, animated=True)
+	assert pie.artists == []
+
+	fig.canvas.draw()
+	background = fig.canvas.copy_from_bbox(ax.bbox)
+
+	for events in ["abc", "aabbd", "eeeeee"]:
+		fig.canvas.restore_region(background)
+		artists = pie.add(events)
+
+		for artist in artists:
+			assert artist.get_animated()
+			ax.draw_artist(artist)
+
+	assert [wedge.get_label() for wedge in pie.wedges] == ["e", "a", "b", "Other"]
+	assert [text.get_text() for text in pie.autotexts] == ["43%", "21%", "21%", "14%"]
+
+
+@pytest.mark.parametrize("orientation", ["vertical", "horizontal"])
+@pytest.mark.parametrize("reverse", [True, False])
+def test_bar_from_tally(orientation: str, reverse: bool):
+	tally = Tally(["cat", "dog", "dog", "rabbit", "dog", "cat", "snake", "gerbil"])
+
+	fig = Figure()
+	FigureCanvasAgg(fig)
+	ax = fig.subplots()
+	bars = bar_from_tally(tally, orientation=orientation, reverse=reverse, top=2, percent=True, ax=ax)
+
+	expected_labels = ["dog", "cat", "Other"]
+	expected_heights = [0.375, 0.25, 0.375]
+	if reverse:
+		expected_labels.reverse()
+		expected_heights.reverse()
+
+	assert list(ax.collections) == [bars]
+	assert len(bars.get_paths()) == 3
+
+	value_axis = 0 if orientation == "horizontal" else 1
+	heights = [path.vertices[:4, value_axis].max() for path in bars.get_paths()]
+	assert heights == pytest.approx(expected_heights)
+
+	category_axis = ax.yaxis if orientation == "horizontal" else ax.xaxis
+	fig.canvas.draw()
+	numpy.testing.assert_array_equal(category_axis.get_majorticklocs(), [0, 1, 2])
+	assert [label.get_text() for label in category_axis.get_ticklabels()] == expected_labels
+
+	# The bars start from zero.
+	assert (ax.get_xlim() if orientation == "horizontal" else ax.get_ylim())[0] == 0
+
+
+def test_bar_from_tally_many():
+	tally = Tally({f"element_{idx}": idx + 1 for idx in range(5000)})
+
+	fig = Figure()
+	FigureCanvasAgg(fig)
+	ax = fig.subplots()
+	bars = bar_from_tally(tally, ax=ax, color="black")
+
+	assert len(bars.get_paths()) == 5000
+	assert tuple(bars.get_facecolor()[0]) == (0, 0, 0, 1)
+
+	fig.canvas.draw()
+	ticks = ax.xaxis.get_majorticklocs()
+	assert 1 < len(ticks) < 20
+	assert [label.get_text() for label in ax.get_xticklabels()] == [f"element_{4999 - int(tick)}" for tick in ticks]
+
+	# The labels don't overlap.
+	extents = [label.get_window_extent() for label in ax.get_xticklabels()]
+	assert all(left.x1 < right.x0 for left, right in zip(extents, extents[1:]))
+
+	# Zooming in labels more of the bars.
+	ax.set_xlim(-0.5, 2.5)
+	fig.canvas.draw()
+	numpy.testing.assert_array_equal(ax.xaxis.get_majorticklocs(), [0, 1, 2])
+
+
+def test_bar_from_tally_errors():
+	tally = Tally(["cat", "dog"])
+	ax = Figure().subplots()
+
+	with pytest.raises(ValueError, match="'top' must be at least 1"):
+		bar_from_tally(tally, top=0, ax=ax)
+
+	with pytest.raises(ValueError, match="'orientation' must be 'vertical' or 'horizontal', not 'diagonal'"):
+		bar_from_tally(tally, orientation="diagonal", ax=ax)  # type: ignore[arg-type]
@@ -0,0 +1,98 @@
+# stdlib
+from io import StringIO
+
+# 3rd party
+import matplotlib  # type: ignore[import]
+import pytest
+from domdf_python_tools.pagesizes import A5, A6
+from matplotlib import pyplot
+from matplotlib._pylab_helpers import Gcf  # type: ignore[import]
+
+# this package
+from domplotlib import FigurePool, create_figure, save_svg
+from domplotlib.pool import PoolStats
+
+
+def plot(fig, ax):
+	ax.plot([1, 2, 3], [4, 1, 3], label="Line")
+	ax.set_title("Title")
+	ax.legend()
+	fig.suptitle("Suptitle")
+
+
+def render(fig) -> str:
+	fp = StringIO()
+	save_svg(fig, fp, metadata={"Date": None})
+	return fp.getvalue()
+
+
+def test_figure_pool():
+	pool = FigurePool()
+
+	with matplotlib.rc_context({"svg.hashsalt": "domplotlib"}):
+		fig, ax = create_figure(A5.inch)
+		plot(fig, ax)
+		expected = render(fig)
+		pyplot.close(fig)
+
+		for _ in range(3):
+			with pool.create_figure(A5.inch) as (fig, ax):
+				assert fig.get_axes() == [ax]
+				assert not fig.texts and not ax.lines
+				plot(fig, ax)
+				ax.twinx()
+				fig.set_facecolor("red")
+				assert render(fig) != expected
+
+			with pool.create_figure(A5.inch) as (fig, ax):
+				plot(fig, ax)
+				assert render(fig) == expected
+
+	assert pool.stats == PoolStats(created=1, reused=5, discarded=0, idle=1, in_use=0)
+	assert all(manager.canvas.figure is not fig for manager in Gcf.get_all_fig_managers())
+
+
+def test_figure_pool_sizes():
+	pool = FigurePool(maxsize=2)
+
+	figures = [pool.acquire(size)[0] for size in (A5.inch, A5.inch, A6.inch)]
+	assert pool.stats == PoolStats(created=3, reused=0, discarded=0, idle=0, in_use=3)
+	assert figures[2].get_size_inches().tolist() == list(A6.inch)
+
+	for fig in figures:
+		pool.release(fig)
+
+	assert pool.stats == PoolStats(created=3, reused=0, discarded=1, idle=2, in_use=0)
+	assert len(pool) == 2
+
+	fig, ax = pool.acquire(A5.inch, left=0.1, bottom=0.1, right=0.1, top=0.1)
+	assert fig is figures[1]
+	assert ax.get_position().bounds == pytest.approx((0.1, 0.1, 0.8, 0.8))
+	pool.release(fig)
+
+	with pytest.raises(ValueError, match="The figure was not acquired from this pool."):
+		pool.release(fig)
+
+	pool.clear()
+	assert pool.stats == PoolStats(created=3, reused=1, discarded=3, idle=0, in_use=0)
+
+
+def test_figure_pool_resets_figure():
+	pool = FigurePool()
+
+	with matplotlib.rc_context({"svg.hashsalt": "domplotlib"}):
+		with pool.create_figure((8, 6)) as (fig, ax):
+			plot(fig, ax)
+			expected = render(fig)
+			fig.set_size_inches(3, 2)
+			fig.patch.set_alpha(0.5)
+			fig.patch.set_hatch("//")
+			first = fig
+
+		with pool.create_figure((8, 6)) as (fig, ax):
+			assert fig is first
+			assert fig.get_size_inches().tolist() == [8, 6]
+			assert fig.patch.get_alpha() is None
+			assert not fig.patch.get_hatch()
+			plot(fig, ax)
+			assert render(fig) == expected
@@ -0,0 +1,98 @@
+# stdlib
+from typing import Tuple
+
+# 3rd party
+import matplotlib  # type: ignore[import]
+import numpy
+from domdf_python_tools.paths import PathPlus
+from matplotlib.axes import Axes  # type: ignore[import]
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # type: ignore[import]
+from matplotlib.figure import Figure  # type: ignore[import]
+
+# this package
+from domplotlib import save_svg
+from domplotlib.rasterize import element_count, rasterize_heavy_artists, rasterize_report
+
+
+def heavy_plot() -> Tuple[Figure, Axes]:
+	rng = numpy.random.default_rng(1234)
+
+	fig = Figure(figsize=(4, 3), dpi=100)
+	FigureCanvasAgg(fig)
+	ax = fig.add_subplot(1, 1, 1)
+	ax.scatter(rng.normal(size=20_000), rng.normal(size=20_000), s=1)
+	ax.plot([-3, 3], [-3, 3])
+	ax.pcolormesh(rng.random((10, 20)))
+	ax.set_title("Heavy plot")
+	return fig, ax
+
+
+def test_element_count():
+	fig, ax = heavy_plot()
+	scatter, mesh = ax.collections
+	line, = ax.get_lines()
+
+	assert element_count(scatter) == 20_000
+	assert element_count(mesh) == 11 * 21
+	assert element_count(line) == 2
+	assert element_count(ax.patch) == 5
+	assert element_count(ax.title) == 0
+
+
+def test_rasterize_heavy_artists():
+	fig, ax = heavy_plot()
+	scatter, mesh = ax.collections
+
+	with rasterize_heavy_artists(fig, 1000) as rasterized:
+		assert rasterized == [scatter]
+		assert scatter.get_rasterized()
+		assert not mesh.get_rasterized()
+
+	assert not scatter.get_rasterized()
+
+	with rasterize_heavy_artists(fig, 100) as rasterized:
+		assert rasterized == [scatter, mesh]
+
+	# Artists which are already rasterized are left alone.
+	mesh.set_rasterized(True)
+	with rasterize_heavy_artists(fig, 100) as rasterized:
+		assert rasterized == [scatter]
+
+	assert mesh.get_rasterized()
+
+
+def test_rasterize_heavy_artists_data_only():
+	fig = Figure(figsize=(4, 3))
+	FigureCanvasAgg(fig)
+	ax = fig.add_subplot(1, 1, 1)
+	polygon, = ax.fill([0, 1, 1, 0.5, 0], [0, 0, 1, 1.5, 1])
+
+	# The backgrounds of the figure and axes, and the spines, have at least as many vertices as the threshold.
+	with rasterize_heavy_artists(fig, 4) as rasterized:
+		assert rasterized == [polygon]
+		assert not fig.patch.get_rasterized()
+		assert not ax.patch.get_rasterized()
+		assert not any(spine.get_rasterized() for spine in ax.spines.values())
+
+
+def test_save_svg_rasterize_threshold(tmp_pathplus: PathPlus):
+	fig, ax = heavy_plot()
+
+	with matplotlib.rc_context({"svg.hashsalt": "domplotlib"}):
+		save_svg(fig, tmp_pathplus / "vector.svg", metadata={"Date": None})
+		save_svg(fig, tmp_pathplus / "rasterized.svg", rasterize_threshold=1000, metadata={"Date": None})
+
+		report = rasterize_report(fig, 1000, metadata={"Date": None})
+
+	assert not ax.collections[0].get_rasterized()
+
+	vector = (tmp_pathplus / "vector.svg").read_text()
+	rasterized = (tmp_pathplus / "rasterized.svg").read_text()
+	assert "<image" not in vector
+	assert "<image" in rasterized
+	assert "Heavy plot" in rasterized
+
+	assert report.artists == [ax.collections[0]]
+	assert report.vector_size == len(vector.encode("UTF-8"))
+	assert report.rasterized_size == len(rasterized.encode("UTF-8"))
+	assert report.saved > report.rasterized_size
@@ -0,0 +1,53 @@
+# stdlib
+import re
+from io import BytesIO
+
+# 3rd party
+import numpy
+import pytest
+from domdf_python_tools.paths import PathPlus
+
+# this package
+from domplotlib import Report
+
+
+def count_pages(pdf: bytes) -> int:
+	return len(re.findall(rb"/Type /Page\b", pdf))
+
+
+def test_report(tmp_pathplus: PathPlus):
+	rng = numpy.random.default_rng(0)
+
+	with Report(tmp_pathplus / "report.pdf", (4, 3), metadata={"Title": "Report"}) as report:
+		for idx in range(5):
+			with report.page() as (fig, ax):
+				assert fig.get_size_inches().tolist() == [4, 3]
+				assert ax.get_position().bounds == pytest.approx((0.2, 0.14, 0.775, 0.73))
+				ax.imshow(rng.random((20, 20)))
+				ax.set_title(f"Page {idx}")
+
+			# Images are written as soon as the page is finished.
+			assert all(image is None for image, name, ob in report._pdf_file._images.values())
+
+		with pytest.raises(ValueError, match="Something went wrong"):
+			with report.page() as (fig, ax):
+				raise ValueError("Something went wrong")
+
+		assert report.pages == 5
+		assert report._pool.stats.created == 1
+
+	pdf = (tmp_pathplus / "report.pdf").read_bytes()
+	assert count_pages(pdf) == 5
+	assert len(re.findall(rb"/Subtype /Image", pdf)) == 5
+	assert b"/Title (Report)" in pdf
+
+
+def test_report_file_object():
+	fp = BytesIO()
+
+	with Report(fp, (4, 3), left=0.1, bottom=0.1, right=0.1, top=0.1) as report:
+		with report.page() as (fig, ax):
+			assert ax.get_position().bounds == pytest.approx((0.1, 0.1, 0.8, 0.8))
+			ax.plot([1, 2, 3])
+
+	assert count_pages(fp.getvalue()) == 1
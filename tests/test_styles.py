@@ -0,0 +1,173 @@
+# stdlib
+import importlib
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple
+
+# 3rd party
+import matplotlib  # type: ignore[import]
+import matplotlib.colors  # type: ignore[import]
+import matplotlib.style  # type: ignore[import]
+import pytest
+from domdf_python_tools.pagesizes import A6
+
+# this package
+from domplotlib import create_figure, styles
+
+
+@pytest.mark.parametrize("style", styles.available)
+def test_use(style: str):
+	style_module = importlib.import_module(f"domplotlib.styles.{style}")
+
+	with matplotlib.rc_context():
+		# The style modules only apply the keys in the style file, whereas use() starts from the defaults.
+		matplotlib.style.use("default")
+		importlib.reload(style_module)
+		expected = {key: value for key, value in matplotlib.rcParams.items() if key != "backend"}
+
+	with matplotlib.rc_context():
+		matplotlib.rcParams["axes.facecolor"] = "red"
+		styles.use(style)
+		assert {key: value for key, value in matplotlib.rcParams.items() if key != "backend"} == expected
+
+
+def test_style_module_keeps_other_params():
+	style_module = importlib.import_module("domplotlib.styles.domdf")
+
+	with matplotlib.rc_context({"hatch.linewidth": 7, "font.size": 22}):
+		importlib.reload(style_module)
+
+		assert matplotlib.rcParams["axes.facecolor"] == "#eee8d5"
+		assert matplotlib.rcParams["hatch.linewidth"] == 7
+		assert matplotlib.rcParams["font.size"] == 22
+
+
+def test_context():
+	with matplotlib.rc_context():
+		styles.use("default")
+
+		with styles.context("domdf"):
+			assert matplotlib.rcParams["axes.facecolor"] == "#eee8d5"
+			assert matplotlib.rcParams["axes.grid"]
+
+		assert matplotlib.rcParams["axes.facecolor"] == "white"
+		assert not matplotlib.rcParams["axes.grid"]
+
+
+def test_context_nested():
+	with matplotlib.rc_context():
+		styles.use("default")
+
+		with styles.context("domdf"):
+			matplotlib.rcParams["font.size"] = 20
+
+			with styles.context("default"):
+				assert matplotlib.rcParams["axes.facecolor"] == "white"
+				assert matplotlib.rcParams["font.size"] == 10
+
+			assert matplotlib.rcParams["axes.facecolor"] == "#eee8d5"
+			assert matplotlib.rcParams["font.size"] == 20
+
+		assert matplotlib.rcParams["axes.facecolor"] == "white"
+		assert matplotlib.rcParams["font.size"] == 10
+
+
+def test_context_overlapping():
+	with matplotlib.rc_context():
+		styles.use("default")
+		matplotlib.rcParams["font.size"] = 22
+
+		first = styles.context("domdf")
+		second = styles.context("default")
+		third = styles.context("domdf")
+
+		first.__enter__()
+		second.__enter__()
+		third.__enter__()
+
+		# Exit the contexts in a different order to which they were entered.
+		first.__exit__(None, None, None)
+		assert matplotlib.rcParams["axes.facecolor"] == "#eee8d5"
+
+		third.__exit__(None, None, None)
+		assert matplotlib.rcParams["axes.facecolor"] == "white"
+
+		second.__exit__(None, None, None)
+		assert matplotlib.rcParams["axes.facecolor"] == "white"
+		assert not matplotlib.rcParams["axes.grid"]
+		assert matplotlib.rcParams["font.size"] == 22
+
+
+def facecolor(style: str) -> Tuple[float, float, float, float]:
+	with styles.context(style):
+		fig, ax = create_figure(A6.inch, headless=True)
+		return ax.get_facecolor()
+
+
+def test_context_threads():
+	with matplotlib.rc_context():
+		styles.use("default")
+
+		with ThreadPoolExecutor(4) as executor:
+			colours = list(executor.map(facecolor, ["domdf", "default"] * 10))
+
+		# The styles of contexts in different threads overlap, but all of them are undone.
+		assert matplotlib.rcParams["axes.facecolor"] == "white"
+
+	assert set(colours) <= {matplotlib.colors.to_rgba("#eee8d5"), (1, 1, 1, 1)}
+
+
+def test_context_fan_out():
+	with matplotlib.rc_context():
+		styles.use("default")
+
+		with ThreadPoolExecutor(4) as executor:
+			with styles.context("domdf"):
+				futures = [executor.submit(facecolor, style) for style in ["domdf", "default"] * 10]
+
+				# The threads' contexts mustn't wait for this one to exit.
+				colours = [future.result(timeout=60) for future in futures]
+
+				assert matplotlib.rcParams["axes.facecolor"] == "#eee8d5"
+
+		assert matplotlib.rcParams["axes.facecolor"] == "white"
+
+	assert set(colours) <= {matplotlib.colors.to_rgba("#eee8d5"), (1, 1, 1, 1)}
+
+
+def test_rc_params():
+	params = styles.rc_params("domdf")
+
+	assert styles.rc_params("domdf") is params
+	assert params["axes.facecolor"] == "#eee8d5"
+	assert styles.rc_params("default")["axes.facecolor"] == "white"
+	assert "backend" not in params
+
+	with pytest.raises(TypeError):
+		params["axes.facecolor"] = "red"  # type: ignore[index]
+
+
+def test_use_unknown():
+	with pytest.raises(ValueError, match="Unknown style 'ggplot'. The available styles are default, domdf."):
+		styles.use("ggplot")
+
+	with pytest.raises(ValueError, match="Unknown style 'ggplot'. The available styles are default, domdf."):
+		styles.rc_params("ggplot")
+
+
+def test_use_no_pyplot():
+	# The backend must be left unresolved, so it can't be read through rcParams.
+	script = '\n'.join([
+			"import sys",
+			"import matplotlib",
+			"backend = dict.__getitem__(matplotlib.rcParams, 'backend')",
+			"from domplotlib import styles",
+			"styles.use('domdf')",
+			"assert matplotlib.rcParams['axes.facecolor'] == '#eee8d5'",
+			"assert dict.__getitem__(matplotlib.rcParams, 'backend') is backend",
+			"assert 'matplotlib.pyplot' not in sys.modules",
+			"assert 'tkinter' not in sys.modules",
+			])
+
+	subprocess.run([sys.executable, "-c", script], check=True)
@@ -0,0 +1,138 @@
+# stdlib
+from io import BytesIO, StringIO
+
+# 3rd party
+import pytest
+from domdf_python_tools.stringlist import StringList
+
+# this package
+from domplotlib.svg import CleanWriter, CompactWriter, default_precision, text_stream
+
+
+def _clean(string: str) -> str:
+	buffer = StringList(string)
+	buffer.blankline(ensure_single=True)
+	return str(buffer)
+
+
+@pytest.mark.parametrize(
+		"string",
+		[
+				'',
+				'\n\n',
+				"hello world",
+				"hello world   \n",
+				"hello   \nworld\t\n\n\n",
+				"\n\nhello\n\n\nworld  \r\n  \n",
+				'<path d="M 0 0 \nL 1 1 \nz\n"/>\n',
+				]
+		)
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 1000])
+def test_clean_writer(string: str, chunk_size: int):
+	fp = StringIO()
+
+	with CleanWriter(fp) as writer:
+		for idx in range(0, len(string), chunk_size):
+			assert writer.write(string[idx:idx + chunk_size]) == len(string[idx:idx + chunk_size])
+
+	assert fp.getvalue() == _clean(string)
+	assert not fp.closed
+
+
+def test_clean_writer_bytes():
+	with CleanWriter(StringIO()) as writer:
+		with pytest.raises(TypeError, match="write.. argument must be str, not bytes"):
+			writer.write(b'')  # type: ignore[arg-type]
+
+
+def test_clean_writer_closed():
+	writer = CleanWriter(StringIO())
+	writer.close()
+
+	with pytest.raises(ValueError, match="I/O operation on closed file."):
+		writer.write("hello")
+
+
+def test_text_stream():
+	fp = StringIO()
+	assert text_stream(fp) is fp
+
+	bfp = BytesIO()
+	text_stream(bfp).write("héllo")
+	assert bfp.getvalue() == "héllo".encode("UTF-8")
+
+
+def _compact(string: str, precision: int = 2, chunk_size: int = 1000) -> str:
+	fp = StringIO()
+
+	with CompactWriter(fp, precision) as writer:
+		for idx in range(0, len(string), chunk_size):
+			writer.write(string[idx:idx + chunk_size])
+
+	return fp.getvalue()
+
+
+_svg = '\n'.join([
+		'<svg xmlns:xlink="http://www.w3.org/1999/xlink" width="720pt" height="576.123456pt">',
+		' <g id="patch_1">',
+		"  <!-- A comment -->",
+		'  <path d="M 0 576.004 ',
+		"L 720.123456 -0.001 ",
+		"z",
+		'" style="fill: #ffffff"/>',
+		" </g>",
+		' <g id="line2d_1">',
+		"  <defs>",
+		'   <path id="m1" d="M 0 0 ',
+		"L 0 3.5 ",
+		'" style="stroke: #000000"/>',
+		"  </defs>",
+		'  <use xlink:href="#m1" x="33.340206" y="123.99976" style="stroke: #000000"/>',
+		"  <defs>",
+		'   <path id="m2" d="M 0 0 ',
+		"L 0 3.500001 ",
+		'" style="stroke: #000000"/>',
+		"  </defs>",
+		'  <use xlink:href="#m2" x="40" y="123.99976" style="font: 10px &apos;DejaVu Sans&apos;"/>',
+		" </g>",
+		' <g transform="translate(30.158956 138.597416) scale(0.015625)">',
+		'  <text x="1.23456">  0.123456  </text>',
+		" </g>",
+		"</svg>",
+		'',
+		])
+
+_compact_svg = """<svg xmlns:xlink="http://www.w3.org/1999/xlink" width="720pt" height="576.123456pt">
+<g id="patch_1">
+<path d="M0 576L720.12 0z" class="s0"/>
+</g>
+<g id="line2d_1">
+<defs>
+<path id="m1" d="M0 0L0 3.5" class="s1"/>
+</defs>
+<use xlink:href="#m1" x="33.34" y="124" class="s1"/>
+<use xlink:href="#m1" x="40" y="124" class="s2"/>
+</g>
+<g transform="translate(30.16 138.6) scale(0.015625)">
+<text x="1.23456">  0.123456  </text>
+</g>
+<defs>
+<style type="text/css">.s0{fill: #ffffff}.s1{stroke: #000000}.s2{font: 10px 'DejaVu Sans'}</style>
+</defs>
+</svg>
+"""
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 1000])
+def test_compact_writer(chunk_size: int):
+	assert _compact(_svg, chunk_size=chunk_size) == _compact_svg
+
+
+def test_compact_writer_precision():
+	assert '<path d="M0 576.004L720.123-0.001z" class="s0"/>' in _compact(_svg, 3)
+	assert '<path d="M0 576L720 0z" class="s0"/>' in _compact(_svg, 0)
+
+
+@pytest.mark.parametrize("dpi, expected", [(72, 1), (100, 2), (300, 2), (600, 2), (1600, 3)])
+def test_default_precision(dpi: int, expected: int):
+	assert default_precision(dpi) == expected
@@ -0,0 +1,128 @@
+# stdlib
+import gzip
+import re
+from io import StringIO
+from typing import Tuple
+
+# 3rd party
+import matplotlib  # type: ignore[import]
+import numpy
+import pytest
+from domdf_python_tools.paths import PathPlus
+from matplotlib.axes import Axes  # type: ignore[import]
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # type: ignore[import]
+from matplotlib.figure import Figure  # type: ignore[import]
+
+# this package
+from domplotlib import save_svg
+from domplotlib.template import SvgTemplate, data_artists
+
+
+def report_plot() -> Tuple[Figure, Axes]:
+	x = numpy.linspace(0, 1, 50)
+
+	fig = Figure(figsize=(4, 3))
+	FigureCanvasAgg(fig)
+	ax = fig.add_subplot(1, 1, 1)
+	ax.plot(x, x**2, marker='o', label="Line")
+	ax.scatter(x, 1 - x, label="Scatter")
+	ax.bar([0.25, 0.75], [0.3, 0.6], width=0.1, hatch="//", label="Bars")
+	ax.set_xlim(0, 1)
+	ax.set_ylim(0, 1)
+	ax.set_title("Report")
+	ax.legend(loc="upper left")
+	return fig, ax
+
+
+def update(ax: Axes, seed: int) -> None:
+	rng = numpy.random.default_rng(seed)
+	line, = ax.get_lines()
+	line.set_ydata(rng.random(50))
+	ax.collections[0].set_offsets(rng.random((50, 2)))
+	for bar in ax.patches:
+		bar.set_height(rng.random())
+
+
+def test_data_artists():
+	fig, ax = report_plot()
+	assert data_artists(fig) == [*ax.get_lines(), *ax.collections, *ax.patches]
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_svg_template(compact: bool):
+	fig, ax = report_plot()
+
+	with matplotlib.rc_context({"svg.hashsalt": "domplotlib"}):
+		template = SvgTemplate(fig, compact=compact, metadata={"Date": None})
+
+		for seed in range(3):
+			update(ax, seed)
+
+			output = StringIO()
+			template.save(output)
+
+			expected = StringIO()
+			save_svg(fig, expected, compact=compact, metadata={"Date": None})
+
+			assert output.getvalue() == expected.getvalue()
+
+
+@pytest.mark.parametrize(
+		"kwargs",
+		[
+				pytest.param({}, id="default"),
+				pytest.param({"facecolor": "blue", "edgecolor": "green"}, id="colours"),
+				pytest.param({"transparent": True}, id="transparent"),
+				]
+		)
+def test_svg_template_facecolor(kwargs):
+	fig, ax = report_plot()
+	fig.set_facecolor("#ff0000")
+	fig.set_edgecolor("#00ff00")
+
+	with matplotlib.rc_context({"svg.hashsalt": "domplotlib"}):
+		template = SvgTemplate(fig, metadata={"Date": None}, **kwargs)
+		update(ax, 1)
+
+		output = StringIO()
+		template.save(output)
+
+		expected = StringIO()
+		save_svg(fig, expected, metadata={"Date": None}, **kwargs)
+
+	assert output.getvalue() == expected.getvalue()
+	assert "#ff0000" not in output.getvalue()
+
+
+def test_svg_template_unsalted(tmp_pathplus: PathPlus):
+	fig, ax = report_plot()
+	template = SvgTemplate(fig)
+	update(ax, 1)
+	template.save(tmp_pathplus / "report.svgz")
+
+	svg = gzip.decompress((tmp_pathplus / "report.svgz").read_bytes()).decode("UTF-8")
+	assert svg.startswith("<?xml")
+	assert svg.endswith("</svg>\n")
+	assert "domplotlib-template" not in svg
+
+	# Every reference points to a definition in the document.
+	for reference in re.findall(r'url\(#([^)]+)\)|href="#([^"]+)"', svg):
+		assert f'id="{"".join(reference)}"' in svg
+
+
+def test_svg_template_errors():
+	fig, ax = report_plot()
+
+	with pytest.raises(ValueError, match="'bbox_inches' is not supported by SvgTemplate."):
+		SvgTemplate(fig, bbox_inches="tight")
+
+	other_fig, other_ax = report_plot()
+	with pytest.raises(ValueError, match=r"The artists at indices \[1\] were not drawn"):
+		SvgTemplate(fig, [ax.get_lines()[0], other_ax.get_lines()[0]])
+
+	ax.get_lines()[0].set_rasterized(True)
+	with pytest.raises(ValueError, match="cannot be used in a template as it is rasterized"):
+		SvgTemplate(fig)
+
+	# The artists are restored even if the template can't be created.
+	assert "draw" not in vars(ax.get_lines()[0])
@@ -0,0 +1,82 @@
+# stdlib
+from io import StringIO
+
+# 3rd party
+import matplotlib  # type: ignore[import]
+import pytest
+from matplotlib.text import Text  # type: ignore[import]
+
+# this package
+from domplotlib import save_svg
+from domplotlib.textcache import TextLayoutCache, default_text_cache, text_layout_cache
+from tests.plots import h_bar_chart, hatch_filled_histograms, koch_snowflake
+
+
+def render(builder) -> str:
+	fp = StringIO()
+
+	with matplotlib.rc_context({"svg.hashsalt": "domplotlib"}):
+		fig, ax = builder()
+		save_svg(fig, fp, metadata={"Date": None})
+
+	return fp.getvalue()
+
+
+@pytest.mark.parametrize("builder", [koch_snowflake, hatch_filled_histograms, h_bar_chart])
+def test_text_layout_cache(builder):
+	expected = render(builder)
+
+	with text_layout_cache(TextLayoutCache()) as cache:
+		assert render(builder) == expected
+		misses = cache.misses
+		assert misses
+
+		assert render(builder) == expected
+		assert cache.misses == misses
+		assert cache.hits >= misses
+
+	assert 0.5 <= cache.hit_rate <= 1
+
+
+def test_text_layout_cache_key():
+	with text_layout_cache(TextLayoutCache()) as cache:
+		render(h_bar_chart)
+		misses = cache.misses
+
+		# Text with a different font size has to be laid out again.
+		with matplotlib.rc_context({"font.size": 20}):
+			render(h_bar_chart)
+
+		assert cache.misses > misses
+
+
+def test_text_layout_cache_eviction():
+	cache = TextLayoutCache(maxsize=5)
+	assert cache.hit_rate == 0.0
+
+	with text_layout_cache(cache):
+		render(h_bar_chart)
+
+	assert len(cache) == 5
+	assert cache.misses > 5
+
+	cache.clear()
+	assert len(cache) == 0
+	assert cache.hits == cache.misses == 0
+
+
+def test_text_layout_cache_nested():
+	original = Text._get_layout
+	outer, inner = TextLayoutCache(), TextLayoutCache()
+
+	with text_layout_cache(outer):
+		with text_layout_cache(inner):
+			render(h_bar_chart)
+
+		assert Text._get_layout is not original
+		assert len(inner) and not len(outer)
+
+	assert Text._get_layout is original
+
+	with text_layout_cache() as cache:
+		assert cache is default_text_cache()